@@ -1,11 +1,15 @@
 from http.server import HTTPServer, BaseHTTPRequestHandler
+import gzip
 import json
 
 class Handler(BaseHTTPRequestHandler):
     def _read_json(self):
         length = int(self.headers.get('content-length', 0))
         if length:
-            raw = self.rfile.read(length).decode('utf-8')
+            raw = self.rfile.read(length)
+            if self.headers.get('content-encoding', '').lower() == 'gzip':
+                raw = gzip.decompress(raw)
+            raw = raw.decode('utf-8')
             try:
                 return json.loads(raw)
             except json.JSONDecodeError:
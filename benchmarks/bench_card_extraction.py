@@ -0,0 +1,79 @@
+"""Benchmark: single page.evaluate card extraction vs per-field locator calls
+
+Usage:
+    python benchmarks/bench_card_extraction.py --cards 48 --repeat 5
+
+Requires Playwright with Chromium installed. Each site scraper is run
+against a synthetic listing page loaded with page.set_content, so no
+network access is needed.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "python-product-AIBot"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from scraper.scraper_factory import create_scraper
+from synthetic_pages import LISTING_URLS, listing_html
+
+
+async def _time_path(extract, repeat: int):
+    best = float('inf')
+    products = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        products = await extract()
+        best = min(best, time.perf_counter() - started)
+    return best, len(products)
+
+
+async def bench_site(browser, site: str, cards: int, repeat: int):
+    scraper = create_scraper(site_name=site)
+    base_url = LISTING_URLS[site]
+    page = await browser.new_page()
+    await page.set_content(listing_html(site, cards))
+    selector, _ = await scraper._wait_for_cards(page, cards)
+    fallback = getattr(scraper, '_extract_search_result_item', None) or scraper._extract_product
+
+    async def evaluate_path():
+        raw = await scraper.card_spec.extract(page, selector, cards)
+        return scraper._build_products(raw, base_url)
+
+    async def locator_path():
+        return await scraper._extract_cards_with_locators(page, selector, cards, base_url, fallback)
+
+    fast_time, fast_count = await _time_path(evaluate_path, repeat)
+    slow_time, slow_count = await _time_path(locator_path, repeat)
+    await page.close()
+    return {
+        'site': site,
+        'evaluate_cards_per_sec': fast_count / fast_time if fast_time else 0.0,
+        'locator_cards_per_sec': slow_count / slow_time if slow_time else 0.0,
+        'speedup': slow_time / fast_time if fast_time else 0.0,
+        'cards': (fast_count, slow_count),
+    }
+
+
+async def main(cards: int, repeat: int):
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        print(f"{'site':<12}{'evaluate c/s':>14}{'locator c/s':>14}{'speedup':>10}  cards")
+        for site in LISTING_URLS:
+            result = await bench_site(browser, site, cards, repeat)
+            print(f"{result['site']:<12}{result['evaluate_cards_per_sec']:>14.0f}"
+                  f"{result['locator_cards_per_sec']:>14.0f}{result['speedup']:>9.1f}x  {result['cards']}")
+        await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=48, help="Product cards per synthetic page")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per path (best is reported)")
+    args = parser.parse_args()
+    asyncio.run(main(args.cards, args.repeat))
@@ -0,0 +1,85 @@
+"""Benchmark: batch normalization (list and DataFrame paths) vs the per-product scalar path
+
+Usage:
+    python benchmarks/bench_normalize.py --rows 1000000
+
+Generates synthetic scraped products (mixed ratings, review counts, image
+lists and missing fields), then times normalize + prepare for database with
+normalize_product/prepare_for_database per row, with normalize_batch /
+prepare_batch on the same list, and with normalize_batch/prepare_batch on a
+DataFrame (skipped when pandas is not installed). Every path must produce
+the same database rows as the scalar one.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "python-product-AIBot"))
+
+from scraper.normalize import normalize_product, prepare_for_database
+from scraper.normalize_batch import normalize_batch, prepare_batch
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def build_products(total: int, rng: random.Random) -> List[Dict[str, Any]]:
+    sources = ("Amazon", "eBay", "Alibaba", "AliExpress")
+    products = []
+    for i in range(total):
+        product = {
+            "title": f"  Product {i} stainless steel mug ",
+            "price": f" ${rng.randint(1, 500)}.{rng.randint(0, 99):02d} ",
+            "source": sources[i % 4],
+            "images": [f"https://img.example.com/{i}/{n}.jpg" for n in range(i % 4)],
+            "rating": round(rng.uniform(0, 5), 1) if i % 5 else None,
+            "review_count": rng.randint(0, 20000) if i % 7 else None,
+            "url": f"https://shop.example.com/item/{i}",
+            "currency": "USD",
+        }
+        if i % 3 == 0:
+            product["description"] = f" Description of product {i} "
+        if i % 2 == 0:
+            product["availability"] = "In stock"
+        products.append(product)
+    return products
+
+
+def _timed(run):
+    started = time.perf_counter()
+    result = run()
+    return time.perf_counter() - started, result
+
+
+def main(total: int, seed: int):
+    products = build_products(total, random.Random(seed))
+
+    scalar_time, expected = _timed(
+        lambda: [prepare_for_database(p) for p in [normalize_product(p) for p in products]])
+    rows = [("scalar", scalar_time, True)]
+    batch_time, batch = _timed(lambda: prepare_batch(normalize_batch(products)))
+    rows.append(("batch list", batch_time, batch == expected))
+    if pd is not None:
+        frame = pd.DataFrame(products)
+        frame_time, framed = _timed(lambda: prepare_batch(normalize_batch(frame)))
+        rows.append(("batch frame", frame_time, framed == expected))
+
+    print(f"{'path':<14}{'seconds':>10}{'rows/s':>14}  identical")
+    for name, elapsed, same in rows:
+        print(f"{name:<14}{elapsed:>10.2f}{total / elapsed:>14,.0f}  {same}")
+    if pd is None:
+        print("pandas not installed: DataFrame path skipped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000, help="Synthetic products to normalize")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.rows, args.seed)
@@ -0,0 +1,93 @@
+"""Benchmark: ProductRecord vs the dict pipeline (normalize_product + prepare_for_database)
+
+Usage:
+    python benchmarks/bench_product_record.py --products 500000
+
+Builds synthetic scraped products (see bench_normalize), then measures:
+  - memory held by the normalized products, as dicts and as records (tracemalloc)
+  - throughput of raw -> normalized, raw -> database row and raw -> API payload
+Every record path must produce the same output as the dict path.
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "python-product-AIBot"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from bench_normalize import build_products
+from scraper.normalize import normalize_product, prepare_for_database
+from scraper.product_record import ProductRecord, records_from_raw
+
+
+def dict_api_payload(raw):
+    """The import API payload as alibabatest_scraper built it before ProductRecord"""
+    return {
+        "title": raw.get("title") or raw.get("name") or "",
+        "price": raw.get("price") or raw.get("price_text") or "",
+        "currency": raw.get("currency") or "",
+        "description": raw.get("description") or "",
+        "images": raw.get("images") or [],
+        "url": raw.get("url") or "",
+        "source": raw.get("source") or "alibaba",
+    }
+
+
+def _held_bytes(build):
+    """Bytes still allocated by build()'s result (input shared with the caller is not counted)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, result
+
+
+def _timed(run):
+    started = time.perf_counter()
+    result = run()
+    return time.perf_counter() - started, result
+
+
+def main(total: int, seed: int):
+    products = build_products(total, random.Random(seed))
+
+    dict_bytes, normalized = _held_bytes(lambda: [normalize_product(p) for p in products])
+    record_bytes, records = _held_bytes(lambda: records_from_raw(products))
+    same_normalized = [r.to_normalized() for r in records] == normalized
+    del normalized, records
+
+    stages = [
+        ("normalize", lambda: [normalize_product(p) for p in products],
+         lambda: records_from_raw(products), lambda a, b: [r.to_normalized() for r in b] == a),
+        ("database row", lambda: [prepare_for_database(normalize_product(p)) for p in products],
+         lambda: [ProductRecord.from_raw(p).to_db_row() for p in products], lambda a, b: a == b),
+        ("api payload", lambda: [dict_api_payload(p) for p in products],
+         lambda: [ProductRecord.from_raw(p, "alibaba").to_api() for p in products], None),
+    ]
+
+    print(f"{'memory':<14}{'MB':>10}{'bytes/product':>16}")
+    print(f"{'dicts':<14}{dict_bytes / 1e6:>10.1f}{dict_bytes / total:>16.0f}")
+    print(f"{'records':<14}{record_bytes / 1e6:>10.1f}{record_bytes / total:>16.0f}")
+    print(f"records use {record_bytes / dict_bytes:.0%} of the dict memory, identical: {same_normalized}")
+    print()
+    print(f"{'stage':<14}{'dicts/s':>12}{'records/s':>12}{'speedup':>9}  identical")
+    for name, dict_path, record_path, compare in stages:
+        dict_time, expected = _timed(dict_path)
+        record_time, actual = _timed(record_path)
+        same = compare(expected, actual) if compare else "n/a (records strip text)"
+        print(f"{name:<14}{total / dict_time:>12,.0f}{total / record_time:>12,.0f}"
+              f"{dict_time / record_time:>8.2f}x  {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=500000, help="Synthetic products to process")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.products, args.seed)
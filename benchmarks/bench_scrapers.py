@@ -0,0 +1,218 @@
+"""Benchmark: end-to-end extraction per site scraper against recorded fixtures
+
+Usage:
+    python benchmarks/bench_scrapers.py --cards 48 --repeat 10
+    python benchmarks/bench_scrapers.py --fixtures recorded/ --tier browser --json out.json
+    python benchmarks/bench_scrapers.py --baseline out.json --tolerance 0.2
+
+Each scraper's real scrape_from_url (browser tier, Playwright routing) and/or
+scrape_static (HTTP tier) runs against pages served from a fixture directory,
+so no network access is needed. Without --fixtures, synthetic listing pages
+are generated. Reports pages/sec, cards/sec, p50/p95 page latency and peak
+RSS per scraper; with --baseline the run fails when cards/sec drops by more
+than the tolerance. Record real fixtures with
+SCRAPER_FIXTURES=recorded/ SCRAPER_FIXTURES_MODE=record and a normal scrape.
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "python-product-AIBot"))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from synthetic_pages import LISTING_URLS, listing_html
+
+
+class RssSampler:
+    """Peak resident memory of this process and its children (Chromium) while running"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _current(self) -> int:
+        if psutil is None:
+            # Without psutil only this process's own high-water mark is known
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._current())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self._current()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._current())
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))]
+
+
+def summarize(latencies: List[float], cards: int) -> Dict:
+    """Turn per-page latencies (seconds) and the total card count into rates"""
+    total = sum(latencies)
+    ordered = sorted(latencies)
+    return {
+        'pages': len(latencies),
+        'cards': cards,
+        'pages_per_sec': len(latencies) / total if total else 0.0,
+        'cards_per_sec': cards / total if total else 0.0,
+        'p50_ms': _percentile(ordered, 0.50) * 1000,
+        'p95_ms': _percentile(ordered, 0.95) * 1000,
+    }
+
+
+def build_synthetic_fixtures(directory: str, cards: int) -> Dict[str, List[str]]:
+    """Write one synthetic listing per site, returning site -> URLs"""
+    from scraper.fixture_replay import FixtureStore
+
+    store = FixtureStore(directory)
+    for site, url in LISTING_URLS.items():
+        store.add(url, listing_html(site, cards), site=site)
+    return {site: [url] for site, url in LISTING_URLS.items()}
+
+
+def group_fixture_urls(directory: str) -> Dict[str, List[str]]:
+    """Group the listing URLs of a recorded fixture directory by site scraper"""
+    from scraper.fixture_replay import FixtureStore
+    from scraper.scraper_factory import create_scraper
+
+    groups: Dict[str, List[str]] = {}
+    for url in FixtureStore(directory).urls():
+        scraper = create_scraper(url=url)
+        if scraper._is_search_page(url):
+            groups.setdefault(scraper.site_name, []).append(url)
+    return groups
+
+
+async def bench_site(site: str, urls: List[str], tier: str, cards: int, repeat: int) -> Dict:
+    from scraper.fetch_tier import scrape_static
+    from scraper.fixture_replay import FixtureFetcher, get_fixture_store
+    from scraper.scraper_factory import create_scraper
+
+    scraper = create_scraper(url=urls[0])
+    fetcher = FixtureFetcher(get_fixture_store())
+
+    async def scrape(url):
+        if tier == 'http':
+            return await scrape_static(scraper, url, cards, fetcher)
+        return await scraper.scrape_from_url(url, cards)
+
+    # Warm-up: browser launch and first-page costs are not part of the steady state
+    for url in urls:
+        await scrape(url)
+
+    latencies, total_cards = [], 0
+    with RssSampler() as rss:
+        for _ in range(repeat):
+            for url in urls:
+                started = time.perf_counter()
+                products = await scrape(url)
+                latencies.append(time.perf_counter() - started)
+                total_cards += len(products)
+    result = summarize(latencies, total_cards)
+    result.update({'site': site, 'tier': tier, 'peak_rss_mb': rss.peak / (1024 * 1024)})
+    return result
+
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> List[str]:
+    """Return a message for every site/tier whose cards/sec fell below baseline * (1 - tolerance)"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['site'], r['tier']): r for r in json.load(f)}
+    regressions = []
+    for result in results:
+        before = baseline.get((result['site'], result['tier']))
+        if before and result['cards_per_sec'] < before['cards_per_sec'] * (1 - tolerance):
+            regressions.append(f"{result['site']} ({result['tier']}): {before['cards_per_sec']:.0f} -> "
+                               f"{result['cards_per_sec']:.0f} cards/s")
+    return regressions
+
+
+async def main(args) -> int:
+    from scraper.browser_pool import shutdown_browser_pool
+    from scraper.card_spec import BeautifulSoup
+
+    os.environ.pop('SCRAPER_PAGE_CACHE', None)
+    os.environ['SCRAPER_FIXTURES_MODE'] = 'replay'
+    os.environ['SCRAPER_POLITENESS_DELAY'] = '0'
+    os.environ['SCRAPER_RATE_LIMIT'] = '0'
+
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = args.fixtures or scratch
+        os.environ['SCRAPER_FIXTURES'] = directory
+        groups = group_fixture_urls(directory) if args.fixtures else build_synthetic_fixtures(directory, args.cards)
+        tiers = ['browser', 'http'] if args.tier == 'both' else [args.tier]
+        if 'http' in tiers and BeautifulSoup is None:
+            print("beautifulsoup4 is not installed; skipping the http tier")
+            tiers.remove('http')
+
+        results = []
+        print(f"{'site':<12}{'tier':<9}{'pages/s':>9}{'cards/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'rss MB':>9}")
+        try:
+            for site, urls in groups.items():
+                if args.sites and site not in args.sites:
+                    continue
+                for tier in tiers:
+                    result = await bench_site(site, urls, tier, args.cards, args.repeat)
+                    results.append(result)
+                    print(f"{site:<12}{tier:<9}{result['pages_per_sec']:>9.1f}{result['cards_per_sec']:>10.0f}"
+                          f"{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{result['peak_rss_mb']:>9.0f}")
+        finally:
+            await shutdown_browser_pool()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=48, help="Cards per synthetic page / max_results per scrape")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed passes over every fixture URL")
+    parser.add_argument("--fixtures", help="Recorded fixture directory (default: synthetic pages)")
+    parser.add_argument("--tier", choices=["browser", "http", "both"], default="both")
+    parser.add_argument("--sites", nargs="*", help="Only benchmark these site scrapers")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed cards/sec drop vs baseline")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,95 @@
+"""Synthetic listing pages that match each site scraper's card selectors"""
+from typing import Callable, Dict
+
+
+def _amazon_card(i: int) -> str:
+    return (
+        f'<div data-component-type="s-search-result" data-asin="B0{i:08d}">'
+        f'<img class="s-image" src="https://m.media-amazon.com/images/I/{i}.jpg">'
+        f'<h2><a href="/dp/B0{i:08d}"><span>Wireless Power Bank {i} 20000mAh</span></a></h2>'
+        f'<span class="a-price"><span class="a-offscreen">${10 + i % 50}.99</span></span>'
+        f'<i class="a-icon-star"><span class="a-icon-alt">4.{i % 10} out of 5 stars</span></i>'
+        f'<a href="#reviews"><span class="a-size-base">{1000 + i:,}</span></a>'
+        '</div>'
+    )
+
+
+def _ebay_card(i: int) -> str:
+    return (
+        '<li class="s-item">'
+        f'<div class="s-item__image"><img src="https://i.ebayimg.com/images/g/{i}/s-l225.jpg"></div>'
+        f'<h3 class="s-item__title"><a href="https://www.ebay.com/itm/{100000 + i}">Used Phone {i} 128GB</a></h3>'
+        f'<span class="s-item__price">${50 + i % 200}.00</span>'
+        '</li>'
+    )
+
+
+def _aliexpress_card(i: int) -> str:
+    return (
+        f'<div class="list-item" data-product-id="{1005000000 + i}">'
+        f'<a href="//www.aliexpress.com/item/{1005000000 + i}.html">'
+        f'<img src="https://ae01.alicdn.com/kf/{i}.jpg">'
+        f'<h3>Smart Watch {i} Fitness Tracker</h3>'
+        f'<div class="price-current">US ${i % 30 + 1}.{i % 100:02d}</div>'
+        f'<span class="rating">4.{i % 10}</span>'
+        '</a></div>'
+    )
+
+
+def _alibaba_card(i: int) -> str:
+    return (
+        '<div class="organic-gallery-offer-card">'
+        f'<a href="//www.alibaba.com/product-detail/power-bank_{1600000000 + i}.html">'
+        f'<img src="https://s.alicdn.com/@sc04/kf/{i}.jpg"></a>'
+        f'<h2 class="element-title-normal_content">Portable Charger {i} OEM</h2>'
+        f'<div class="element-offer-price-normal_price">US${1 + i % 5}.20-{4 + i % 5}.50</div>'
+        '</div>'
+    )
+
+
+def _generic_card(i: int) -> str:
+    return (
+        f'<div class="product-card">'
+        f'<a href="/products/item-{i}"><img src="/images/item-{i}.jpg"><h3>Ceramic Mug {i}</h3></a>'
+        f'<span class="price">${5 + i % 20}.95</span>'
+        '</div>'
+    )
+
+
+CARD_BUILDERS: Dict[str, Callable[[int], str]] = {
+    'Amazon': _amazon_card,
+    'eBay': _ebay_card,
+    'AliExpress': _aliexpress_card,
+    'Alibaba': _alibaba_card,
+    'Generic': _generic_card,
+}
+
+# Listing URL each synthetic page pretends to live at
+LISTING_URLS = {
+    'Amazon': 'https://www.amazon.com/s?k=power+bank',
+    'eBay': 'https://www.ebay.com/sch/i.html?_nkw=phone',
+    'AliExpress': 'https://www.aliexpress.com/wholesale?SearchText=watch',
+    'Alibaba': 'https://www.alibaba.com/trade/search?SearchText=power+bank',
+    'Generic': 'https://shop.example.com/collections/mugs',
+}
+
+
+def listing_html(site: str, cards: int = 48) -> str:
+    """
+    Build a listing page with the given number of product cards
+
+    Args:
+        site: Site name (key of CARD_BUILDERS)
+        cards: Number of product cards on the page
+
+    Returns:
+        Full HTML document
+    """
+    build = CARD_BUILDERS[site]
+    body = ''.join(build(i) for i in range(cards))
+    if site == 'eBay':
+        body = f'<ul class="srp-results">{body}</ul>'
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8">'
+        f'<title>{site} results</title></head><body>{body}</body></html>'
+    )
@@ -0,0 +1,496 @@
+"""Local asyncio job service for the start/insert-products/complete import API
+
+Drop-in replacement for api_stub.py that actually keeps jobs and products.
+
+Endpoints (under /api/scraper, same paths as the stub):
+    POST /start            {query, marketplace, maxResults} -> {jobId}
+    POST /insert-products  {jobId, products}                -> {ok, received}
+    POST /complete         {jobId}                          -> {ok}
+    POST /submit           {url | query+marketplace, maxResults, siteName?}
+                           -> {jobId}; the job is scraped by the worker pool
+    A POST sent with an Idempotency-Key header is applied once; repeating
+    the key (a client retry) returns the first response.
+    GET  /status           -> job counts per status
+    GET  /status/<jobId>   -> job record
+    GET  /products/<jobId> -> stored products
+    GET  /metrics          -> scrape phase timings and counters (Prometheus text)
+
+Jobs and products live in SQLite, so queued jobs survive a restart.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote_plus, urlsplit
+
+# Get the project root
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / "python-product-AIBot"))
+
+from scraper import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.getenv('JOB_SERVER_DB', str(ROOT / 'jobs.db'))
+DEFAULT_WORKERS = int(os.getenv('JOB_SERVER_WORKERS', '4'))
+API_PREFIX = '/api/scraper'
+MAX_BODY_BYTES = 50 * 1024 * 1024
+# Seconds a POST's Idempotency-Key and its response are remembered
+IDEMPOTENCY_TTL = 24 * 3600
+
+# Search URL per marketplace for jobs submitted with a query instead of a URL
+SEARCH_URLS = {
+    'amazon': 'https://www.amazon.com/s?k={}',
+    'ebay': 'https://www.ebay.com/sch/i.html?_nkw={}',
+    'aliexpress': 'https://www.aliexpress.com/wholesale?SearchText={}',
+    'alibaba': 'https://www.alibaba.com/trade/search?SearchText={}',
+}
+
+STATUS_STARTED = 'started'
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    query TEXT,
+    marketplace TEXT,
+    url TEXT,
+    site_name TEXT,
+    max_results INTEGER,
+    product_count INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+CREATE TABLE IF NOT EXISTS job_products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES jobs(id),
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_products_job ON job_products(job_id);
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created ON idempotency_keys(created_at);
+"""
+
+_JOB_COLUMNS = ('id', 'status', 'query', 'marketplace', 'url', 'site_name', 'max_results',
+                'product_count', 'error', 'created_at', 'started_at', 'finished_at')
+
+
+def search_url(query: str, marketplace: str) -> Optional[str]:
+    """Build the listing URL for a query on a marketplace, or None if unknown"""
+    template = SEARCH_URLS.get((marketplace or '').lower())
+    return template.format(quote_plus(query)) if template and query else None
+
+
+class HttpError(Exception):
+    """A request the server answers with an error status and then closes the connection"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class JobStore:
+    """SQLite-backed job and product table"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        """
+        Open (and create if needed) the job database
+
+        Args:
+            path: SQLite file path, or ':memory:'
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def _row(self, row) -> Optional[Dict]:
+        return {key: row[key] for key in _JOB_COLUMNS} if row is not None else None
+
+    def create_job(self, status: str, query: Optional[str] = None, marketplace: Optional[str] = None,
+                   url: Optional[str] = None, site_name: Optional[str] = None,
+                   max_results: Optional[int] = None) -> str:
+        """Insert a job and return its id"""
+        job_id = f"job-{uuid.uuid4().hex[:12]}"
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO jobs (id, status, query, marketplace, url, site_name, max_results, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (job_id, status, query, marketplace, url, site_name, max_results, time.time()),
+            )
+            self._conn.commit()
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._row(row)
+
+    def add_products(self, job_id: str, products: List[Dict]) -> int:
+        """Store products for a job, returning how many were stored"""
+        rows = [(job_id, json.dumps(product)) for product in products if isinstance(product, dict)]
+        with self._lock:
+            self._conn.executemany('INSERT INTO job_products (job_id, data) VALUES (?, ?)', rows)
+            self._conn.execute('UPDATE jobs SET product_count = product_count + ? WHERE id = ?',
+                               (len(rows), job_id))
+            self._conn.commit()
+        return len(rows)
+
+    def get_products(self, job_id: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute('SELECT data FROM job_products WHERE job_id = ? ORDER BY id',
+                                      (job_id,)).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def finish_job(self, job_id: str, status: str = STATUS_COMPLETED, error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute('UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?',
+                               (status, error, time.time(), job_id))
+            self._conn.commit()
+
+    def claim_next(self) -> Optional[Dict]:
+        """Atomically move the oldest queued job to running and return it"""
+        with self._lock:
+            row = self._conn.execute(
+                'UPDATE jobs SET status = ?, started_at = ? WHERE id = ('
+                'SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1) RETURNING *',
+                (STATUS_RUNNING, time.time(), STATUS_QUEUED),
+            ).fetchone()
+            self._conn.commit()
+        return self._row(row)
+
+    def requeue_running(self) -> int:
+        """Put jobs interrupted by a restart back in the queue"""
+        with self._lock:
+            cursor = self._conn.execute('UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?',
+                                        (STATUS_QUEUED, STATUS_RUNNING))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute('SELECT status, COUNT(*) AS n FROM jobs GROUP BY status').fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+    def get_response(self, key: str) -> Optional[Tuple[int, object]]:
+        """Response stored for an idempotency key, or None if the key is new or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, response FROM idempotency_keys WHERE key = ? AND created_at > ?',
+                (key, time.time() - IDEMPOTENCY_TTL),
+            ).fetchone()
+        return (row['status'], json.loads(row['response'])) if row is not None else None
+
+    def save_response(self, key: str, status: int, payload: object):
+        """Remember the response to an idempotency key, dropping expired keys"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('DELETE FROM idempotency_keys WHERE created_at <= ?', (now - IDEMPOTENCY_TTL,))
+            self._conn.execute('INSERT OR REPLACE INTO idempotency_keys (key, status, response, created_at) '
+                               'VALUES (?, ?, ?, ?)', (key, status, json.dumps(payload), now))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+async def _run_scrape(job: Dict) -> List[Dict]:
+    """Default job runner: tiered scrape in the server's event loop"""
+    from scraper.fetch_tier import scrape_tiered
+
+    products, _ = await scrape_tiered(job['url'], job['max_results'] or 10, site_name=job.get('site_name'))
+    return products
+
+
+class JobServer:
+    """Asyncio HTTP server with a pool of scrape workers pulling queued jobs"""
+
+    def __init__(self, store: JobStore, workers: int = DEFAULT_WORKERS, runner=_run_scrape):
+        """
+        Initialize the server
+
+        Args:
+            store: Job database
+            workers: Number of jobs scraped concurrently
+            runner: Coroutine function scraping one job dictionary into products
+        """
+        self.store = store
+        self.workers = max(1, workers)
+        self.runner = runner
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._server = None
+
+    async def start(self, host: str = '0.0.0.0', port: int = 3000):
+        """Start listening and launch the worker pool"""
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self.store.requeue_running)
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        self._wakeup.set()
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    # ----- worker pool -----
+
+    async def _worker(self):
+        while True:
+            job = await asyncio.to_thread(self.store.claim_next)
+            if job is None:
+                self._wakeup.clear()
+                # Re-check after clearing so a submit between claim and clear is not missed
+                job = await asyncio.to_thread(self.store.claim_next)
+                if job is None:
+                    await self._wakeup.wait()
+                    continue
+            # Let idle workers re-check the queue for more jobs
+            self._wakeup.set()
+            try:
+                products = await self.runner(job)
+                await asyncio.to_thread(self.store.add_products, job['id'], products or [])
+                await asyncio.to_thread(self.store.finish_job, job['id'])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await asyncio.to_thread(self.store.finish_job, job['id'], STATUS_FAILED,
+                                        f"{type(e).__name__}: {e}")
+
+    # ----- HTTP -----
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                try:
+                    status, payload = await self._dispatch_once(method, path, headers, body)
+                except Exception:
+                    logger.exception("Error handling %s %s", method, path)
+                    status, payload = 500, {'error': 'internal server error'}
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            # The body (or what is left of it) was not read, so the connection cannot be reused
+            self._write_response(writer, e.status, {'error': e.message}, keep_alive=False)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, OSError, EOFError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        parts = request_line.decode('latin-1').split()
+        if len(parts) < 2:
+            return None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            raise HttpError(400, 'invalid Content-Length') from None
+        if length < 0:
+            raise HttpError(400, 'invalid Content-Length')
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, f'request body larger than {MAX_BODY_BYTES} bytes')
+        body = await reader.readexactly(length) if length else b''
+        if body and headers.get('content-encoding', '').lower() == 'gzip':
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError, zlib.error):
+                raise HttpError(400, 'invalid gzip body') from None
+        return parts[0].upper(), parts[1], headers, body
+
+    def _write_response(self, writer, status: int, payload, keep_alive: bool):
+        if isinstance(payload, str):
+            data, content_type = payload.encode('utf-8'), metrics.PROMETHEUS_CONTENT_TYPE
+        else:
+            data, content_type = json.dumps(payload).encode('utf-8'), 'application/json'
+        reason = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+                  500: 'Internal Server Error'}.get(status, 'OK')
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + data)
+
+    async def _dispatch_once(self, method: str, path: str, headers: Dict[str, str],
+                             body: bytes) -> Tuple[int, object]:
+        """
+        Dispatch a request, answering a repeated POST Idempotency-Key with the first response
+
+        A client retrying after a read timeout or a 5xx gets the stored
+        result instead of having its write applied twice; a retry that
+        arrives while the first attempt is still running waits for it.
+        Server errors are not stored, so they can be retried.
+        """
+        key = headers.get('idempotency-key')
+        if method != 'POST' or not key:
+            return await self._dispatch(method, path, body)
+        key = f"{urlsplit(path).path.rstrip('/')} {key}"
+        running = self._in_flight.get(key)
+        if running is not None:
+            return await asyncio.shield(running)
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        result = (500, {'error': 'internal server error'})
+        try:
+            stored = await asyncio.to_thread(self.store.get_response, key)
+            if stored is not None:
+                result = stored
+                return result
+            result = await self._dispatch(method, path, body)
+            if result[0] < 500:
+                await asyncio.to_thread(self.store.save_response, key, *result)
+            return result
+        finally:
+            del self._in_flight[key]
+            future.set_result(result)
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, object]:
+        route = urlsplit(path).path
+        if route.startswith(API_PREFIX):
+            route = route[len(API_PREFIX):]
+        route = route.rstrip('/') or '/'
+
+        data = {}
+        if body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                return 400, {'error': 'invalid JSON'}
+            if not isinstance(data, dict):
+                return 400, {'error': 'expected a JSON object'}
+
+        if method == 'POST' and route == '/start':
+            job_id = await asyncio.to_thread(
+                self.store.create_job, STATUS_STARTED, data.get('query'), data.get('marketplace'),
+                None, None, data.get('maxResults'),
+            )
+            return 200, {'jobId': job_id}
+
+        if method == 'POST' and route == '/submit':
+            url = data.get('url') or search_url(data.get('query'), data.get('marketplace'))
+            if not url:
+                return 400, {'error': 'url, or query with a known marketplace, is required'}
+            job_id = await asyncio.to_thread(
+                self.store.create_job, STATUS_QUEUED, data.get('query'), data.get('marketplace'),
+                url, data.get('siteName'), data.get('maxResults') or 10,
+            )
+            self._wakeup.set()
+            return 202, {'jobId': job_id, 'status': STATUS_QUEUED}
+
+        if method == 'POST' and route in ('/insert-products', '/complete'):
+            job = await asyncio.to_thread(self.store.get_job, data.get('jobId') or '')
+            if job is None:
+                return 404, {'error': 'unknown jobId'}
+            if route == '/complete':
+                await asyncio.to_thread(self.store.finish_job, job['id'])
+                return 200, {'ok': True}
+            products = data.get('products') or []
+            received = await asyncio.to_thread(self.store.add_products, job['id'], products)
+            return 200, {'ok': True, 'received': received}
+
+        if method == 'GET' and route == '/metrics':
+            return 200, metrics.render()
+
+        if method == 'GET' and route == '/status':
+            return 200, {'jobs': await asyncio.to_thread(self.store.counts)}
+
+        if method == 'GET' and route.startswith(('/status/', '/products/')):
+            kind, _, job_id = route[1:].partition('/')
+            job = await asyncio.to_thread(self.store.get_job, job_id)
+            if job is None:
+                return 404, {'error': 'unknown jobId'}
+            if kind == 'status':
+                return 200, job
+            return 200, {'jobId': job_id, 'products': await asyncio.to_thread(self.store.get_products, job_id)}
+
+        return 404, {'error': 'unknown path'}
+
+
+async def serve(host: str = '0.0.0.0', port: int = 3000, db_path: str = DEFAULT_DB_PATH,
+                workers: int = DEFAULT_WORKERS):
+    """Run the job server until cancelled"""
+    from scraper.browser_pool import shutdown_browser_pool
+
+    # Jobs run in this process, so its registry is what /metrics reports
+    metrics.enable()
+    server = JobServer(JobStore(db_path), workers=workers)
+    await server.start(host, port)
+    print(f'Serving job API on http://{host}:{server.port}{API_PREFIX} ({workers} workers, db {db_path})')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        await shutdown_browser_pool()
+        server.store.close()
+
+
+if __name__ == '__main__':
+    from scraper.url_scraper_async import _new_event_loop
+
+    loop = _new_event_loop()
+    main = loop.create_task(serve(port=int(os.getenv('JOB_SERVER_PORT', '3000'))))
+    try:
+        loop.run_until_complete(main)
+    except KeyboardInterrupt:
+        print('Shutting down')
+        main.cancel()
+        loop.run_until_complete(asyncio.gather(main, return_exceptions=True))
+    finally:
+        loop.close()
@@ -1,7 +1,9 @@
+import sys
 import time
 import random
 import json
 import logging
+from pathlib import Path
 from typing import List, Dict, Optional
 
 import requests
@@ -21,6 +23,13 @@ except Exception:
     class PlaywrightTimeoutError(Exception):
         pass
 
+# Allow running this file directly by patching sys.path if needed
+try:
+    from scraper.product_record import ProductRecord
+except ModuleNotFoundError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from scraper.product_record import ProductRecord
+
 # ---------- Configuration ----------
 BASE = "https://localhost3000/dashboard/products"  # your seller-center endpoints
 HEADLESS = False   # Run visible browser to allow manual CAPTCHA solving
@@ -88,18 +97,10 @@ def detect_captcha(page_content: str) -> bool:
 # ---------- Normalization ----------
 def normalize_product(raw: Dict) -> Dict:
     """
-    Convert raw scraped product data to a normalized dict that your Seller Center expects.
-    Adjust fields as needed.
+    Convert raw scraped product data to the payload your Seller Center expects.
+    Field aliases (name, price_text, product_url) are resolved by ProductRecord.
     """
-    return {
-        "title": raw.get("title") or raw.get("name") or "",
-        "price": raw.get("price") or raw.get("price_text") or "",
-        "currency": raw.get("currency") or "",
-        "description": raw.get("description") or "",
-        "images": raw.get("images") or [],
-        "url": raw.get("url") or "",
-        "source": raw.get("source") or "alibaba",
-    }
+    return ProductRecord.from_raw(raw, default_source="alibaba").to_api()
 
 
 # ---------- Scraper core ----------
@@ -1,8 +1,12 @@
 """Base scraper abstract class for all e-commerce site scrapers"""
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Optional, Sequence, Tuple
+import asyncio
+import random
 import sys
 import os
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
 # CRITICAL: Set event loop policy BEFORE importing Playwright on Windows
 if sys.platform == 'win32':
@@ -26,10 +30,125 @@ except Exception:
     # tests to import BaseScraper and mock/playwright usage later.
     async_playwright = None
 
+from .browser_pool import LAUNCH_ARGS, get_browser_pool
+from .resource_profiles import ResourceProfile
+from .site_detector import get_site_info
+from .card_spec import CardSpec, count_static_matches, extract_static, parse_html
+from . import metrics, structured_data
+from .fixture_replay import get_fixture_router
+from .normalize import normalize_product
+from .rate_limiter import REASON_CAPTCHA, REASON_EMPTY, limiter_for
+from .streaming import emit_product, stream_products, wait_for_sink
+from .url_utils import canonical_url
+
+
+# Counts matches for every candidate card selector in one round trip
+_COUNT_CARDS_JS = """
+(selectors) => selectors.map((sel) => {
+    try { return document.querySelectorAll(sel).length; } catch (e) { return 0; }
+})
+"""
+
+
+def _env_delay(name: str) -> Optional[Tuple[float, float]]:
+    """Parse a 'min,max' seconds range from an environment variable"""
+    value = os.getenv(name)
+    if not value:
+        return None
+    try:
+        low, _, high = value.partition(',')
+        low_f = float(low)
+        high_f = float(high) if high else low_f
+        return (max(0.0, low_f), max(low_f, high_f))
+    except ValueError:
+        return None
+
+
+# Injected into every context to hide common automation fingerprints
+STEALTH_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en']
+    });
+    window.chrome = { runtime: {} };
+    Object.defineProperty(navigator, 'permissions', {
+        get: () => ({
+            query: () => Promise.resolve({ state: 'granted' })
+        })
+    });
+"""
+
 
 class BaseScraper(ABC):
     """Abstract base class for all e-commerce scrapers"""
     
+    # Requests aborted while scraping; site scrapers override with their own profile
+    resource_profile: ResourceProfile = ResourceProfile('Default')
+    
+    # Candidate CSS selectors for product cards on listing pages, in priority order
+    card_selectors: List[str] = []
+    # Declarative card fields for single round-trip extraction (None = locator path only)
+    card_spec: Optional[CardSpec] = None
+    # Embedded search state (window globals) read before any DOM scraping
+    state_globals: List[str] = []
+    # Builds an item URL from its id when the embedded payload has no link
+    item_url_template: Optional[str] = None
+    # Listing pages are server-rendered enough to try a plain HTTP fetch first
+    http_tier_ok: bool = False
+    # Cards without a title are dropped unless the site accepts price-only cards
+    require_title: bool = True
+    default_currency: Optional[str] = 'USD'
+    # Element that signals a product detail page has rendered
+    product_ready_selector: Optional[str] = None
+    
+    # Human-like pause (seconds) before each navigation; kept apart from load waiting
+    politeness_delay: Tuple[float, float] = (0.5, 1.5)
+    
+    # Readiness engine: poll the card count until it stops changing
+    readiness_timeout: float = 15.0
+    readiness_poll_interval: float = 0.25
+    readiness_stable_polls: int = 3
+    readiness_max_scrolls: int = 2
+    # Wait for a stable count even once max_results cards exist (for loose selectors)
+    readiness_require_stable: bool = False
+    navigation_timeout: int = 30000
+    
+    # Pagination: a "next" link selector and/or a page-number query parameter
+    next_page_selector: Optional[str] = None
+    page_param: Optional[str] = None
+    max_pages: int = 5
+    # Typical cards per listing page; the next page is prefetched when more are needed
+    results_per_page: int = 48
+    # Seconds a cached listing stays fresh (None = the page cache's default)
+    cache_ttl: Optional[float] = None
+    
+    @classmethod
+    def declared_capabilities(cls) -> frozenset:
+        """
+        Registry capabilities implied by the class attributes
+        
+        The scraper registry replaces a manifest's capabilities with these
+        once the class is imported, so the class is the source of truth.
+        
+        Returns:
+            Subset of scraper.registry.CAPABILITIES
+        """
+        capabilities = set()
+        if cls.http_tier_ok:
+            capabilities.add('http')
+        if cls.page_param or cls.next_page_selector:
+            capabilities.add('pagination')
+        if cls.state_globals:
+            capabilities.add('json_payload')
+        if cls._scrape_product_page is not BaseScraper._scrape_product_page:
+            capabilities.add('detail')
+        return frozenset(capabilities)
+    
     def __init__(self, site_name: str):
         """
         Initialize the scraper
@@ -39,8 +158,10 @@ class BaseScraper(ABC):
         """
         self.site_name = site_name
         self.user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        env_delay = _env_delay('SCRAPER_POLITENESS_DELAY')
+        if env_delay is not None:
+            self.politeness_delay = env_delay
     
-    @abstractmethod
     async def scrape_from_url(self, url: str, max_results: int = 10) -> List[Dict]:
         """
         Scrape products from a given URL
@@ -64,11 +185,554 @@ class BaseScraper(ABC):
                 'currency': str (optional)
             }
         """
+        async with self._browser_context() as context:
+            page = await self._new_page(context)
+            await self._navigate(page, url)
+            
+            if await self._is_blocked(page):
+                self._record_blocked(url)
+                return []
+            
+            if self._is_search_page(url):
+                return await self._scrape_listing_pages(context, page, url, max_results)
+            
+            # Single product page
+            await self._wait_for_product_page(page)
+            with metrics.phase('extract', self.site_name):
+                product = await self._scrape_product_page(page, url)
+            if not product:
+                return []
+            limiter_for(url).record_success()
+            emit_product(product)
+            return [product]
+    
+    async def iter_products(self, url: str, max_results: int = 10,
+                            normalize: bool = True) -> AsyncIterator[Dict]:
+        """
+        Scrape a URL, yielding products as soon as they are extracted
+        
+        Runs the same tiered scrape as scrape_tiered (cache, HTTP, browser).
+        Listing products arrive page by page as each page's cards are
+        extracted; breaking out of the loop cancels the scrape and closes the
+        browser context, and a slow consumer pauses the crawl.
+        
+        Args:
+            url: Product listing or product page URL
+            max_results: Maximum number of products to yield
+            normalize: Yield normalize_product() output instead of raw products
+            
+        Yields:
+            Product dictionaries
+        """
+        from .fetch_tier import scrape_tiered
+        
+        async def scrape() -> List[Dict]:
+            products, _ = await scrape_tiered(url, max_results, scraper=self)
+            return products
+        
+        async for product in stream_products(scrape()):
+            yield normalize_product(product) if normalize else product
+    
+    @abstractmethod
+    async def _scrape_search_results(self, page, max_results: int, base_url: str) -> List[Dict]:
+        """
+        Extract products from a loaded listing page
+        
+        Args:
+            page: Playwright page already navigated to base_url
+            max_results: Maximum number of products to extract
+            base_url: URL of the listing page
+            
+        Returns:
+            List of product dictionaries
+        """
         pass
     
+    async def _scrape_product_page(self, page, url: str) -> Optional[Dict]:
+        """Scrape a single product page (sites without detail support return None)"""
+        return None
+    
+    def _is_search_page(self, url: str) -> bool:
+        """Return True if the URL is a listing/search page rather than a product page"""
+        return True
+    
+    async def _is_blocked(self, page) -> bool:
+        """Return True if the page is a CAPTCHA or bot check"""
+        try:
+            page_title = (await page.title()).lower()
+        except Exception:
+            return False
+        return "captcha" in page_title or "robot" in page_title
+    
+    def _record_blocked(self, url: str):
+        """Count a bot wall and make the domain's rate limiter back off"""
+        metrics.count_captcha(get_site_info(url)['domain'], 'browser')
+        limiter_for(url).record_backoff(REASON_CAPTCHA)
+    
+    async def _polite_pause(self):
+        """Sleep for a random human-like interval from the politeness budget"""
+        low, high = self.politeness_delay
+        if high > 0:
+            await asyncio.sleep(random.uniform(low, high))
+    
+    async def _navigate(self, page, url: str):
+        """
+        Navigate to a URL without waiting for the network to go idle
+        
+        Only the domain's rate limiter turn and the politeness pause are
+        spent before the request; readiness is decided afterwards by
+        _wait_for_cards / _wait_for_product_page. A 429 / 503 response makes
+        the limiter back off.
+        
+        Returns:
+            Playwright response (or None)
+        """
+        limiter = limiter_for(url)
+        with metrics.phase('pause', self.site_name):
+            await limiter.wait_turn()
+            await self._polite_pause()
+        with metrics.phase('navigate', self.site_name):
+            response = await page.goto(url, wait_until='domcontentloaded', timeout=self.navigation_timeout)
+        limiter.record_status(getattr(response, 'status', None))
+        return response
+    
+    async def _open_listing_page(self, context, url: str):
+        """Open and navigate a new tab, returning None if it hits a bot wall"""
+        page = await self._new_page(context)
+        try:
+            await self._navigate(page, url)
+            if not await self._is_blocked(page):
+                return page
+            self._record_blocked(url)
+        except Exception:
+            pass
+        await page.close()
+        return None
+    
+    async def _scrape_listing_page(self, page, max_results: int, url: str) -> List[Dict]:
+        """Extract one listing page: embedded payloads first, then the DOM"""
+        products = await self._extract_structured(page, max_results, url)
+        if products:
+            return products
+        return await self._scrape_search_results(page, max_results, url)
+    
+    def _page_param_url(self, url: str, page_number: int) -> Optional[str]:
+        """Build the URL of a listing page by setting page_param in the query"""
+        if not self.page_param:
+            return None
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != self.page_param]
+        query.append((self.page_param, str(page_number)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+    
+    async def _next_page_url(self, page, url: str, page_number: int) -> Optional[str]:
+        """
+        Discover the URL of the listing page after page_number
+        
+        Args:
+            page: Playwright page showing listing page page_number
+            url: URL of that page
+            page_number: 1-based number of the current page
+            
+        Returns:
+            Absolute URL of the next page, or None if there is none
+        """
+        if self.next_page_selector:
+            try:
+                href = await page.evaluate(
+                    "(sel) => { const a = document.querySelector(sel); return a ? a.getAttribute('href') : null; }",
+                    self.next_page_selector,
+                )
+            except Exception:
+                href = None
+            if href and not href.startswith(('#', 'javascript:')):
+                return urljoin(url, href)
+        return self._page_param_url(url, page_number + 1)
+    
+    def _next_page_url_from_html(self, html: str, url: str, page_number: int) -> Optional[str]:
+        """Static counterpart of _next_page_url, used by the HTTP fetch tier"""
+        if self.next_page_selector:
+            try:
+                link = parse_html(html).select_one(self.next_page_selector)
+            except Exception:
+                link = None
+            href = link.get('href') if link is not None else None
+            if href and not href.startswith(('#', 'javascript:')):
+                return urljoin(url, href)
+        return self._page_param_url(url, page_number + 1)
+    
+    def _product_key(self, product: Dict, page_url: str):
+        """Identity used to dedupe products across listing pages"""
+        product_url = product.get('url')
+        if product_url and product_url != page_url:
+            return canonical_url(product_url)
+        return (product.get('title'), product.get('price'))
+    
+    def _merge_unique(self, products: List[Dict], seen: set, batch: List[Dict],
+                      page_url: str, max_results: int) -> int:
+        """Append unseen products from batch and stream them, returning how many were added"""
+        added = 0
+        for product in batch:
+            if len(products) >= max_results:
+                break
+            key = self._product_key(product, page_url)
+            if key in seen:
+                continue
+            seen.add(key)
+            products.append(product)
+            emit_product(product)
+            added += 1
+        return added
+    
+    async def _scrape_listing_pages(self, context, page, url: str, max_results: int) -> List[Dict]:
+        """
+        Scrape a listing and its following pages until max_results unique products
+        
+        While page N is being extracted, page N+1 is already loading in a
+        second tab when page N alone cannot satisfy max_results. Products are
+        deduplicated by URL across pages, and crawling stops at max_pages, at
+        a page without new products, or when no next page is found. Extra
+        tabs are closed together with the context.
+        
+        Args:
+            context: Browser context the first page belongs to
+            page: First listing page, already navigated to url
+            url: URL of the first listing page
+            max_results: Maximum number of unique products to return
+            
+        Returns:
+            List of product dictionaries
+        """
+        products: List[Dict] = []
+        seen = set()
+        page_url, page_number = url, 1
+        while True:
+            remaining = max_results - len(products)
+            next_url, prefetch = None, None
+            if page_number < self.max_pages and remaining > self.results_per_page:
+                next_url = await self._next_page_url(page, page_url, page_number)
+                if next_url:
+                    prefetch = asyncio.ensure_future(self._open_listing_page(context, next_url))
+            
+            try:
+                batch = await self._scrape_listing_page(page, remaining, page_url)
+            except BaseException:
+                if prefetch is not None:
+                    prefetch.cancel()
+                raise
+            if batch:
+                limiter_for(page_url).record_success()
+            else:
+                limiter_for(page_url).record_backoff(REASON_EMPTY)
+            added = self._merge_unique(products, seen, batch, page_url, max_results)
+            await wait_for_sink()
+            
+            if len(products) >= max_results or page_number >= self.max_pages or added == 0:
+                if prefetch is not None:
+                    prefetch.cancel()
+                break
+            
+            if prefetch is not None:
+                next_page = await prefetch
+            else:
+                next_url = await self._next_page_url(page, page_url, page_number)
+                next_page = await self._open_listing_page(context, next_url) if next_url else None
+            if next_page is None:
+                break
+            
+            if page_number > 1:
+                await page.close()
+            page, page_url, page_number = next_page, next_url, page_number + 1
+        
+        return products
+    
+    def _pick_card_selector(self, selectors: Sequence[str], counts: Sequence[int]) -> Tuple[Optional[str], int]:
+        """Choose the first selector that matches any cards"""
+        for selector, count in zip(selectors, counts):
+            if count > 0:
+                return selector, count
+        return None, 0
+    
+    @metrics.timed('ready')
+    async def _wait_for_cards(self, page, max_results: int,
+                              selectors: Optional[Sequence[str]] = None) -> Tuple[Optional[str], int]:
+        """
+        Wait until the listing's product cards have finished rendering
+        
+        Returns as soon as max_results cards are present (unless
+        readiness_require_stable is set), or once the matched selector and
+        card count have stopped changing for a few polls. When the count stalls
+        below max_results the page is scrolled to trigger lazy loading.
+        
+        Args:
+            page: Playwright page
+            max_results: Number of cards that is enough to start extracting
+            selectors: Candidate card selectors (defaults to card_selectors)
+            
+        Returns:
+            Tuple of (matched selector or None, card count)
+        """
+        selectors = list(selectors if selectors is not None else self.card_selectors)
+        if not selectors:
+            return None, 0
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.readiness_timeout
+        selector, count = None, 0
+        last_seen, stable_polls, scrolls = None, 0, 0
+        while True:
+            try:
+                counts = await page.evaluate(_COUNT_CARDS_JS, selectors)
+            except Exception:
+                counts = [0] * len(selectors)
+            selector, count = self._pick_card_selector(selectors, counts)
+            if count >= max_results and not self.readiness_require_stable:
+                break
+            
+            if (selector, count) == last_seen:
+                stable_polls += 1
+            else:
+                stable_polls, last_seen = 0, (selector, count)
+            
+            if stable_polls >= self.readiness_stable_polls:
+                if count < max_results and scrolls < self.readiness_max_scrolls:
+                    await page.evaluate("window.scrollBy(0, window.innerHeight * 2)")
+                    scrolls += 1
+                    stable_polls = 0
+                elif count > 0:
+                    break
+            
+            if loop.time() >= deadline:
+                break
+            await asyncio.sleep(self.readiness_poll_interval)
+        
+        return selector, count
+    
+    @metrics.timed('extract')
+    async def _extract_structured(self, page, max_results: int, base_url: str) -> List[Dict]:
+        """
+        Extract products from the page's embedded JSON payloads
+        
+        Reads JSON-LD blocks and the site's state_globals in one round trip,
+        so no cards have to be waited for or scrolled into view.
+        
+        Args:
+            page: Playwright page
+            max_results: Maximum number of products to extract
+            base_url: URL of the listing page
+            
+        Returns:
+            List of product dictionaries (empty if the page embeds no payload)
+        """
+        try:
+            raw_rows = await structured_data.extract_from_page(
+                page, self.state_globals, self.item_url_template
+            )
+        except Exception:
+            return []
+        return self._build_products(raw_rows, base_url)[:max_results]
+    
+    @metrics.timed('extract')
+    async def _extract_cards(self, page, selector: Optional[str], max_results: int,
+                             base_url: str, extract_item) -> List[Dict]:
+        """
+        Extract product cards, preferring one page.evaluate over per-field locators
+        
+        The card_spec fast path reads every field of every card in a single
+        browser round trip. If the site has no spec, or the fast path yields
+        nothing, each card is extracted with the site's locator-based method.
+        
+        Args:
+            page: Playwright page
+            selector: Card container selector from _wait_for_cards
+            max_results: Maximum number of products to extract
+            base_url: URL of the listing page
+            extract_item: Locator fallback, called as extract_item(item, base_url)
+            
+        Returns:
+            List of product dictionaries
+        """
+        if not selector:
+            return []
+        
+        if self.card_spec is not None:
+            try:
+                raw_cards = await self.card_spec.extract(page, selector, max_results)
+                products = self._build_products(raw_cards, base_url)
+                if products:
+                    return products
+            except Exception:
+                pass
+        
+        return await self._extract_cards_with_locators(page, selector, max_results, base_url, extract_item)
+    
+    async def _extract_cards_with_locators(self, page, selector: str, max_results: int,
+                                           base_url: str, extract_item) -> List[Dict]:
+        """Extract cards one locator call at a time (legacy path)"""
+        products = []
+        items = await page.locator(selector).all()
+        for item in items[:max_results]:
+            try:
+                product = await extract_item(item, base_url)
+                if product:
+                    products.append(product)
+            except Exception:
+                continue
+        return products
+    
+    def extract_from_html(self, html: str, base_url: str, max_results: int = 10) -> List[Dict]:
+        """
+        Extract listing products from static HTML with the site's card_spec
+        
+        Used by the HTTP fetch tier; embedded JSON payloads are preferred,
+        then the same selectors and product building as the browser fast path.
+        
+        Args:
+            html: Listing page HTML
+            base_url: URL the HTML was fetched from
+            max_results: Maximum number of products to extract
+            
+        Returns:
+            List of product dictionaries (empty if no cards matched)
+        """
+        raw_rows = structured_data.extract_from_html(html, self.state_globals, self.item_url_template)
+        products = self._build_products(raw_rows, base_url)[:max_results]
+        if products or self.card_spec is None or not self.card_selectors:
+            return products
+        soup = parse_html(html)
+        selector, _ = self._pick_card_selector(self.card_selectors,
+                                               count_static_matches(soup, self.card_selectors))
+        if not selector:
+            return []
+        return self._build_products(extract_static(self.card_spec, soup, selector, max_results), base_url)
+    
+    def _source(self, base_url: str) -> str:
+        """Source name recorded on extracted products"""
+        return self.site_name
+    
+    def _empty_product(self, page_url: str) -> Dict:
+        """
+        Return a product dictionary with every standard field unset
+        
+        The url stays empty until the card's own link is found: a card
+        without one must not borrow page_url, or every link-less card of a
+        listing would share one product identity in storage.
+        """
+        return {
+            'title': '',
+            'price': '',
+            'description': '',
+            'images': [],
+            'rating': None,
+            'review_count': None,
+            'availability': '',
+            'url': '',
+            'source': self._source(page_url),
+            'currency': self.default_currency
+        }
+    
+    def _build_products(self, raw_cards: List[Dict], base_url: str) -> List[Dict]:
+        """Convert raw card_spec rows into product dictionaries"""
+        products = []
+        for raw in raw_cards:
+            product = self._build_product(raw, base_url)
+            if product:
+                products.append(product)
+        return products
+    
+    def _build_product(self, raw: Dict, base_url: str) -> Optional[Dict]:
+        """
+        Convert one raw card_spec row into a standard product dictionary
+        
+        Args:
+            raw: Field values read from the card (strings, or lists for images)
+            base_url: URL of the listing page, used to resolve relative links
+            
+        Returns:
+            Product dictionary, or None if the card has no usable data
+        """
+        product = self._empty_product(base_url)
+        product['title'] = (raw.get('title') or '').strip()
+        product['price'] = self._normalize_price(raw.get('price') or '') or ''
+        product['rating'] = self._normalize_rating(raw.get('rating') or '')
+        product['review_count'] = self._normalize_review_count(raw.get('review_count') or '')
+        product['description'] = (raw.get('description') or '').strip()[:500]
+        product['availability'] = raw.get('availability') or ''
+        if raw.get('currency'):
+            product['currency'] = raw['currency']
+        
+        images = raw.get('images') or []
+        if isinstance(images, str):
+            images = [images]
+        for img_url in images:
+            if img_url and not img_url.startswith('data:'):
+                absolute = urljoin(base_url, img_url)
+                if absolute.startswith('http'):
+                    product['images'].append(absolute)
+        
+        href = raw.get('url')
+        if href and not href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
+            product['url'] = urljoin(base_url, href)
+        
+        if product['title'] or (not self.require_title and product['price']):
+            return product
+        return None
+    
+    @metrics.timed('ready')
+    async def _wait_for_product_page(self, page):
+        """Wait for the product detail page's key element, if the site defines one"""
+        if not self.product_ready_selector:
+            return
+        try:
+            await page.wait_for_selector(self.product_ready_selector,
+                                         timeout=int(self.readiness_timeout * 1000))
+        except Exception:
+            pass
+    
+    def _context_options(self) -> Dict:
+        """Browser context settings shared by pooled and standalone browsers"""
+        return {
+            'viewport': {'width': 1920, 'height': 1080},
+            'user_agent': self.user_agent,
+            'locale': 'en-US',
+            'timezone_id': 'America/New_York',
+            'permissions': ['geolocation'],
+            'geolocation': {'latitude': 40.7128, 'longitude': -74.0060},
+            'color_scheme': 'light',
+        }
+    
+    @asynccontextmanager
+    async def _browser_context(self):
+        """
+        Borrow a fresh stealth browser context from the shared browser pool
+        
+        The context is isolated per job and closed on exit, while the
+        underlying Chromium stays warm for the next scrape.
+        
+        Yields:
+            Browser context with stealth configuration
+        """
+        opening = metrics.timer('context', self.site_name)
+        closing = None
+        pool = await get_browser_pool()
+        try:
+            async with pool.context(**self._context_options()) as context:
+                await context.add_init_script(STEALTH_INIT_SCRIPT)
+                opening.stop()
+                try:
+                    yield context
+                finally:
+                    closing = metrics.timer('close', self.site_name)
+        finally:
+            if closing is not None:
+                closing.stop()
+    
     async def _create_browser_context(self, playwright):
         """
-        Create a browser context with stealth settings
+        Launch a dedicated browser and create a context with stealth settings
+        
+        Prefer _browser_context(), which reuses pooled browsers; this is kept
+        for callers that manage their own Playwright instance.
         
         Args:
             playwright: Playwright instance
@@ -78,45 +742,35 @@ class BaseScraper(ABC):
         """
         browser = await playwright.chromium.launch(
             headless=True,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-            ]
+            args=LAUNCH_ARGS,
         )
         
-        context = await browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent=self.user_agent,
-            locale='en-US',
-            timezone_id='America/New_York',
-            permissions=['geolocation'],
-            geolocation={'latitude': 40.7128, 'longitude': -74.0060},
-            color_scheme='light',
-        )
+        context = await browser.new_context(**self._context_options())
         
         # Add stealth scripts
-        await context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en']
-            });
-            window.chrome = { runtime: {} };
-            Object.defineProperty(navigator, 'permissions', {
-                get: () => ({
-                    query: () => Promise.resolve({ state: 'granted' })
-                })
-            });
-        """)
+        await context.add_init_script(STEALTH_INIT_SCRIPT)
         
         return browser, context
     
+    async def _new_page(self, context):
+        """
+        Open a page with realistic headers and the site's resource profile
+        
+        Args:
+            context: Browser context
+            
+        Returns:
+            Playwright page ready for navigation
+        """
+        page = await context.new_page()
+        await self._set_headers(page)
+        if self.resource_profile is not None:
+            await self.resource_profile.attach(page)
+        router = get_fixture_router()
+        if router is not None:
+            await router.attach(page)
+        return page
+    
     async def _set_headers(self, page):
         """Set realistic HTTP headers"""
         await page.set_extra_http_headers({
@@ -0,0 +1,305 @@
+"""Process-wide pool of warm Chromium browsers shared by all site scrapers"""
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Dict, List, Optional
+import importlib
+
+from . import metrics
+
+if TYPE_CHECKING:
+    from playwright.async_api import async_playwright  # type: ignore
+
+try:
+    _pw_mod = importlib.import_module("playwright.async_api")
+    async_playwright = _pw_mod.async_playwright
+except Exception:
+    # Playwright may not be installed in test environments; tests can
+    # monkeypatch `async_playwright` on this module.
+    async_playwright = None
+
+logger = logging.getLogger(__name__)
+
+# Chromium flags used for every pooled browser
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+]
+
+DEFAULT_POOL_SIZE = int(os.getenv('SCRAPER_BROWSER_POOL_SIZE', '2'))
+DEFAULT_MAX_PAGES_PER_BROWSER = int(os.getenv('SCRAPER_MAX_PAGES_PER_BROWSER', '100'))
+
+
+class _PooledBrowser:
+    """A launched browser together with its usage counters"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages_served = 0
+        self.contexts_served = 0
+        self.active_contexts = 0
+        self.retired = False
+
+    def is_healthy(self) -> bool:
+        """Return True if the browser process is still connected"""
+        try:
+            return bool(self.browser.is_connected())
+        except Exception:
+            return False
+
+    def record_page(self, _page=None):
+        self.pages_served += 1
+
+
+class BrowserPool:
+    """
+    Keeps N Chromium instances alive and hands out isolated contexts
+
+    Each job gets a brand-new browser context (own cookies, storage and
+    cache), but the expensive browser launch is paid once per pool slot.
+    Browsers that crash are replaced on the next acquire, and a browser is
+    recycled once it has served ``max_pages_per_browser`` pages.
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE,
+                 max_pages_per_browser: int = DEFAULT_MAX_PAGES_PER_BROWSER,
+                 headless: bool = True,
+                 launch_args: Optional[List[str]] = None):
+        """
+        Initialize the pool (browsers are launched lazily by start())
+
+        Args:
+            size: Number of warm browsers to keep alive
+            max_pages_per_browser: Pages a browser may open before it is recycled
+            headless: Launch browsers in headless mode
+            launch_args: Extra Chromium command line flags
+        """
+        self.size = max(1, size)
+        self.max_pages_per_browser = max(1, max_pages_per_browser)
+        self.headless = headless
+        self.launch_args = list(launch_args) if launch_args is not None else list(LAUNCH_ARGS)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.browsers_launched = 0
+        self.browsers_recycled = 0
+        self._playwright = None
+        self._slots: List[_PooledBrowser] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._closed = False
+
+    @property
+    def started(self) -> bool:
+        return self._playwright is not None
+
+    async def start(self):
+        """Start Playwright and launch all pool browsers"""
+        self._ensure_lock()
+        async with self._lock:
+            await self._start_locked()
+
+    async def _start_locked(self):
+        if self._closed:
+            raise RuntimeError("BrowserPool has been closed")
+        if self._playwright is None:
+            if async_playwright is None:
+                raise ImportError("playwright is required for BrowserPool")
+            self._playwright = await async_playwright().start()
+        missing = self.size - len(self._slots)
+        if missing > 0:
+            launched = await asyncio.gather(*(self._launch() for _ in range(missing)))
+            self._slots.extend(launched)
+
+    async def _launch(self) -> _PooledBrowser:
+        with metrics.phase('launch', 'pool'):
+            browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=self.launch_args,
+            )
+        self.browsers_launched += 1
+        return _PooledBrowser(browser)
+
+    async def _close_browser(self, slot: _PooledBrowser):
+        try:
+            await slot.browser.close()
+        except Exception:
+            pass
+
+    def _needs_recycle(self, slot: _PooledBrowser) -> bool:
+        return not slot.is_healthy() or slot.pages_served >= self.max_pages_per_browser
+
+    async def _recycle_locked(self) -> List[_PooledBrowser]:
+        """Swap out unhealthy or exhausted browsers; return idle ones to close"""
+        to_close = []
+        for index, slot in enumerate(self._slots):
+            if self._needs_recycle(slot):
+                self._slots[index] = await self._launch()
+                slot.retired = True
+                self.browsers_recycled += 1
+                if slot.active_contexts == 0:
+                    to_close.append(slot)
+        return to_close
+
+    def _ensure_lock(self):
+        if self._lock is None:
+            self.loop = asyncio.get_running_loop()
+            self._lock = asyncio.Lock()
+
+    async def _acquire_slot(self) -> _PooledBrowser:
+        self._ensure_lock()
+        async with self._lock:
+            await self._start_locked()
+            to_close = await self._recycle_locked()
+            chosen = min(self._slots, key=lambda s: s.active_contexts)
+            chosen.active_contexts += 1
+            chosen.contexts_served += 1
+        for slot in to_close:
+            await self._close_browser(slot)
+        return chosen
+
+    async def _release(self, slot: _PooledBrowser, context):
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        slot.active_contexts -= 1
+        if slot.retired and slot.active_contexts == 0:
+            await self._close_browser(slot)
+
+    @asynccontextmanager
+    async def context(self, **context_options):
+        """
+        Yield a fresh, isolated browser context from a warm browser
+
+        Args:
+            **context_options: Keyword arguments for ``browser.new_context``
+
+        Yields:
+            Playwright BrowserContext, closed automatically on exit
+        """
+        slot = await self._acquire_slot()
+        context = None
+        try:
+            context = await slot.browser.new_context(**context_options)
+            context.on('page', slot.record_page)
+            yield context
+        finally:
+            await self._release(slot, context)
+
+    async def health_check(self) -> Dict:
+        """
+        Replace disconnected or exhausted browsers and report pool state
+
+        Returns:
+            Pool statistics (see stats())
+        """
+        if self.started and not self._closed:
+            async with self._lock:
+                to_close = await self._recycle_locked()
+            for slot in to_close:
+                await self._close_browser(slot)
+        return self.stats()
+
+    def stats(self) -> Dict:
+        """Return pool counters for monitoring"""
+        return {
+            'size': self.size,
+            'browsers': len(self._slots),
+            'healthy': sum(1 for s in self._slots if s.is_healthy()),
+            'active_contexts': sum(s.active_contexts for s in self._slots),
+            'pages_served': sum(s.pages_served for s in self._slots),
+            'browsers_launched': self.browsers_launched,
+            'browsers_recycled': self.browsers_recycled,
+        }
+
+    async def close(self):
+        """Close every browser and stop Playwright"""
+        self._closed = True
+        slots, self._slots = self._slots, []
+        for slot in slots:
+            await self._close_browser(slot)
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def terminate(self) -> bool:
+        """
+        Kill the Playwright driver without awaiting anything
+
+        For a pool whose event loop is gone, so close() can no longer run.
+        The pooled Chromium processes exit once the driver's pipe closes.
+
+        Returns:
+            True if nothing is left running, False if the driver process
+            could not be reached
+        """
+        self._closed = True
+        self._slots = []
+        playwright, self._playwright = self._playwright, None
+        if playwright is None:
+            return True
+        process = _driver_process(playwright)
+        if process is None:
+            return False
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            except Exception:
+                return False
+        return True
+
+
+def _driver_process(playwright):
+    """The asyncio subprocess running the Playwright driver, or None"""
+    connection = getattr(getattr(playwright, '_impl_obj', None), '_connection', None)
+    transport = getattr(connection, '_transport', None)
+    return getattr(transport, '_proc', None)
+
+
+def _retire_pool(pool: BrowserPool):
+    """Shut down a pool bound to another event loop without blocking this one"""
+    old_loop = pool.loop
+    if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+        asyncio.run_coroutine_threadsafe(pool.close(), old_loop)
+    elif not pool.terminate():
+        logger.warning("Could not shut down the browser pool of a finished event loop; "
+                       "its browsers may still be running")
+
+
+_pool: Optional[BrowserPool] = None
+
+
+async def get_browser_pool() -> BrowserPool:
+    """
+    Return the process-wide browser pool, creating it on first use
+
+    Playwright objects are bound to the event loop that created them, so a
+    pool bound to another event loop is shut down and replaced: closed on
+    its own loop if that loop is still running, otherwise by killing its
+    Playwright driver.
+    """
+    global _pool
+    loop = asyncio.get_running_loop()
+    if _pool is not None and (_pool._closed or (_pool.loop is not None and _pool.loop is not loop)):
+        stale, _pool = _pool, None
+        if not stale._closed:
+            _retire_pool(stale)
+    if _pool is None:
+        _pool = BrowserPool()
+        _pool.loop = loop
+    return _pool
+
+
+async def shutdown_browser_pool():
+    """Close the process-wide browser pool (call before the event loop ends)"""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
@@ -0,0 +1,216 @@
+"""Declarative product-card field specs, extracted in a single page.evaluate"""
+from typing import Dict, List, Sequence
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    # Static (HTTP tier) extraction needs beautifulsoup4; browser extraction does not
+    BeautifulSoup = None
+
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+
+class FieldSpec:
+    """How to read one product field from a card element"""
+
+    def __init__(self, selectors: Sequence[str], attrs: Sequence[str] = ('text',),
+                 multiple: bool = False, limit: int = 1):
+        """
+        Initialize a field spec
+
+        Args:
+            selectors: CSS selectors relative to the card, tried in order.
+                An empty string means the card element itself.
+            attrs: Values to read, tried in order until one is non-empty:
+                'text' (innerText), 'textContent', or any attribute name
+            multiple: Collect values from every match instead of the first
+            limit: Maximum number of values when multiple is True
+        """
+        self.selectors = list(selectors)
+        self.attrs = list(attrs)
+        self.multiple = multiple
+        self.limit = limit
+
+    def to_payload(self) -> Dict:
+        return {
+            'selectors': self.selectors,
+            'attrs': self.attrs,
+            'multiple': self.multiple,
+            'limit': self.limit,
+        }
+
+
+class CardSpec:
+    """Field specs for every product card on a listing page"""
+
+    def __init__(self, fields: Dict[str, FieldSpec]):
+        """
+        Initialize a card spec
+
+        Args:
+            fields: Mapping of raw field name (title, price, images, rating,
+                review_count, url, ...) to its FieldSpec
+        """
+        self.fields = dict(fields)
+        self._payload = {name: spec.to_payload() for name, spec in self.fields.items()}
+
+    def evaluate_arg(self, container_selector: str, max_cards: int) -> Dict:
+        """Build the single argument passed to EXTRACT_CARDS_JS"""
+        return {'selector': container_selector, 'fields': self._payload, 'max': max_cards}
+
+    async def extract(self, page, container_selector: str, max_cards: int) -> List[Dict]:
+        """
+        Extract all cards with one browser round trip
+
+        Args:
+            page: Playwright page
+            container_selector: Selector matching one element per product card
+            max_cards: Maximum number of cards to read
+
+        Returns:
+            List of raw field dictionaries, one per card
+        """
+        return await page.evaluate(EXTRACT_CARDS_JS, self.evaluate_arg(container_selector, max_cards))
+
+
+# Reads every field of every card in the page and returns them as a JSON array
+EXTRACT_CARDS_JS = """
+({selector, fields, max}) => {
+    const read = (el, attrs) => {
+        for (const attr of attrs) {
+            let value = null;
+            if (attr === 'text') value = el.innerText;
+            else if (attr === 'textContent') value = el.textContent;
+            else value = el.getAttribute(attr);
+            if (value && value.trim()) return value.trim();
+        }
+        return null;
+    };
+    const query = (card, sel, all) => {
+        if (!sel) return all ? [card] : card;
+        try {
+            return all ? Array.from(card.querySelectorAll(sel)) : card.querySelector(sel);
+        } catch (e) {
+            return all ? [] : null;
+        }
+    };
+    let cards;
+    try {
+        cards = Array.from(document.querySelectorAll(selector)).slice(0, max);
+    } catch (e) {
+        return [];
+    }
+    return cards.map((card) => {
+        const row = {};
+        for (const [name, field] of Object.entries(fields)) {
+            if (field.multiple) {
+                const values = [];
+                for (const sel of field.selectors) {
+                    for (const el of query(card, sel, true)) {
+                        const value = read(el, field.attrs);
+                        if (value) values.push(value);
+                        if (values.length >= field.limit) break;
+                    }
+                    if (values.length) break;
+                }
+                row[name] = values;
+            } else {
+                let value = null;
+                for (const sel of field.selectors) {
+                    const el = query(card, sel, false);
+                    if (el) value = read(el, field.attrs);
+                    if (value) break;
+                }
+                row[name] = value;
+            }
+        }
+        return row;
+    });
+}
+"""
+
+
+def parse_html(html: str):
+    """Parse HTML with the fastest available BeautifulSoup parser"""
+    if BeautifulSoup is None:
+        raise ImportError("beautifulsoup4 is required for static HTML extraction")
+    return BeautifulSoup(html, _HTML_PARSER)
+
+
+def _read_static(el, attrs: Sequence[str]):
+    for attr in attrs:
+        if attr in ('text', 'textContent'):
+            value = ' '.join(el.get_text(' ').split())
+        else:
+            value = el.get(attr)
+            if isinstance(value, list):
+                value = ' '.join(value)
+        if value and value.strip():
+            return value.strip()
+    return None
+
+
+def _select_static(card, selector: str, many: bool):
+    if not selector:
+        return [card] if many else card
+    try:
+        return card.select(selector) if many else card.select_one(selector)
+    except Exception:
+        return [] if many else None
+
+
+def count_static_matches(soup, selectors: Sequence[str]) -> List[int]:
+    """Count matches for each selector in a parsed (BeautifulSoup) document"""
+    counts = []
+    for selector in selectors:
+        try:
+            counts.append(len(soup.select(selector)))
+        except Exception:
+            counts.append(0)
+    return counts
+
+
+def extract_static(spec: CardSpec, soup, container_selector: str, max_cards: int) -> List[Dict]:
+    """
+    Apply a card spec to static HTML, mirroring EXTRACT_CARDS_JS
+
+    Args:
+        spec: Card spec of the site
+        soup: Parsed BeautifulSoup document
+        container_selector: Selector matching one element per product card
+        max_cards: Maximum number of cards to read
+
+    Returns:
+        List of raw field dictionaries, one per card
+    """
+    rows = []
+    for card in _select_static(soup, container_selector, True)[:max_cards]:
+        row = {}
+        for name, field in spec.fields.items():
+            if field.multiple:
+                values = []
+                for selector in field.selectors:
+                    for el in _select_static(card, selector, True):
+                        value = _read_static(el, field.attrs)
+                        if value:
+                            values.append(value)
+                        if len(values) >= field.limit:
+                            break
+                    if values:
+                        break
+                row[name] = values
+            else:
+                value = None
+                for selector in field.selectors:
+                    el = _select_static(card, selector, False)
+                    if el is not None:
+                        value = _read_static(el, field.attrs)
+                    if value:
+                        break
+                row[name] = value
+        rows.append(row)
+    return rows
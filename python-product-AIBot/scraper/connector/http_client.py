@@ -0,0 +1,285 @@
+"""Shared HTTP client for backend APIs: pooled, retrying, gzip-compressed"""
+import asyncio
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Mapping, Optional
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    from urllib3.exceptions import NewConnectionError
+except ImportError:
+    NewConnectionError = None
+
+# Status codes worth retrying: the request may succeed on a later attempt
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Methods a server must treat the same when repeated, so any failure may be retried
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+# Header that makes a POST safe to repeat on backends that deduplicate by key
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+DEFAULT_POOL_SIZE = int(os.getenv('SCRAPER_API_POOL_SIZE', '10'))
+DEFAULT_RETRIES = int(os.getenv('SCRAPER_API_RETRIES', '3'))
+# Bodies smaller than this are sent uncompressed; gzip would not pay off
+DEFAULT_GZIP_MIN_BYTES = int(os.getenv('SCRAPER_API_GZIP_MIN_BYTES', '1024'))
+
+
+def gzip_enabled() -> bool:
+    """Set SCRAPER_API_GZIP=0 for backends that reject compressed request bodies"""
+    return os.getenv('SCRAPER_API_GZIP', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+class ClientMetrics:
+    """Per-call latency and outcome counters"""
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialize metrics
+
+        Args:
+            window: Number of most recent latencies kept for percentiles
+        """
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+        self.last_call: Optional[Dict] = None
+
+    def record(self, method: str, url: str, status: Optional[int], attempts: int,
+               latency: float, bytes_sent: int, bytes_saved: int):
+        with self._lock:
+            self.calls += 1
+            self.retries += attempts - 1
+            if status is None or status >= 400:
+                self.errors += 1
+            self.bytes_sent += bytes_sent
+            self.bytes_saved += bytes_saved
+            self._latencies.append(latency)
+            self.last_call = {'method': method, 'url': url, 'status': status,
+                              'attempts': attempts, 'latency': latency}
+
+    def _percentile(self, ordered, pct: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))]
+
+    def stats(self) -> Dict:
+        """Return call counts, bytes and latency percentiles (seconds)"""
+        with self._lock:
+            ordered = sorted(self._latencies)
+            return {
+                'calls': self.calls,
+                'errors': self.errors,
+                'retries': self.retries,
+                'bytes_sent': self.bytes_sent,
+                'bytes_saved': self.bytes_saved,
+                'latency_avg': sum(ordered) / len(ordered) if ordered else 0.0,
+                'latency_p50': self._percentile(ordered, 0.50),
+                'latency_p95': self._percentile(ordered, 0.95),
+                'last_call': dict(self.last_call) if self.last_call else None,
+            }
+
+
+class HttpClient:
+    """Keep-alive JSON client with gzip request bodies and jittered retries"""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES,
+                 backoff: float = 0.5, max_backoff: float = 8.0,
+                 gzip_min_bytes: Optional[int] = DEFAULT_GZIP_MIN_BYTES,
+                 headers: Optional[Mapping[str, str]] = None, session=None):
+        """
+        Initialize the client (the session is created on first use)
+
+        Args:
+            pool_size: Maximum keep-alive connections per host
+            retries: Extra attempts after a connection error or retryable status
+            backoff: Base delay in seconds; attempt n waits up to backoff * 2**n
+            max_backoff: Upper bound for a single delay
+            gzip_min_bytes: Compress bodies at least this large (None disables gzip)
+            headers: Headers sent with every request
+            session: Optional pre-built requests.Session (mainly for tests)
+        """
+        self.pool_size = pool_size
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.gzip_min_bytes = gzip_min_bytes if gzip_enabled() else None
+        self.headers = dict(headers or {})
+        self.metrics = ClientMetrics()
+        self._session = session
+        self._session_lock = threading.Lock()
+
+    def _get_session(self):
+        with self._session_lock:
+            if self._session is None:
+                if requests is None:
+                    raise ImportError("requests is required for HttpClient")
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                # Retries are handled here so they can be jittered and measured
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                                      max_retries=0)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(self.headers)
+                self._session = session
+            return self._session
+
+    def _encode(self, payload: Any):
+        """Serialize a JSON body, gzip-compressing it when large enough"""
+        body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        raw_size = len(body)
+        if self.gzip_min_bytes is not None and raw_size >= self.gzip_min_bytes:
+            body = gzip.compress(body, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+        return body, headers, raw_size - len(body)
+
+    def _delay(self, attempt: int, response=None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when given"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After') if response.headers else None
+            if retry_after:
+                try:
+                    return min(self.max_backoff, float(retry_after))
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def _is_retryable_error(self, error: Exception) -> bool:
+        if requests is None:
+            return isinstance(error, (ConnectionError, TimeoutError))
+        return isinstance(error, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError))
+
+    def _never_connected(self, error: Exception) -> bool:
+        """True if the error happened before a connection existed, so nothing reached the server"""
+        if isinstance(error, ConnectionRefusedError):
+            return True
+        if requests is not None and isinstance(error, requests.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return NewConnectionError is not None and isinstance(reason, NewConnectionError)
+
+    def request(self, method: str, url: str, json_body: Any = None, timeout: float = 10,
+                headers: Optional[Mapping[str, str]] = None, params: Optional[Mapping[str, Any]] = None):
+        """
+        Send a request, retrying connection errors and 429/5xx responses
+
+        A POST or PATCH may already have been applied when a read times out
+        or a 5xx comes back, so without an Idempotency-Key header it is only
+        retried when the connection could not be opened or the server
+        answered 429.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            json_body: Payload serialized as JSON (None for no body)
+            timeout: Per-attempt timeout in seconds
+            headers: Extra headers for this call
+            params: Query string parameters
+
+        Returns:
+            requests.Response of the last attempt
+        """
+        session = self._get_session()
+        body, body_headers, saved = (None, {}, 0) if json_body is None else self._encode(json_body)
+        all_headers = dict(body_headers)
+        all_headers.update(headers or {})
+        replay_safe = method.upper() in IDEMPOTENT_METHODS or IDEMPOTENCY_HEADER in all_headers
+
+        started = time.perf_counter()
+        attempt, response, status = 0, None, None
+        try:
+            while True:
+                attempt += 1
+                try:
+                    response = session.request(method, url, data=body, headers=all_headers,
+                                               params=params, timeout=timeout)
+                    status = response.status_code
+                except Exception as e:
+                    if attempt > self.retries or not self._is_retryable_error(e):
+                        raise
+                    if not replay_safe and not self._never_connected(e):
+                        raise
+                    time.sleep(self._delay(attempt - 1))
+                    continue
+                if status not in RETRY_STATUSES or attempt > self.retries:
+                    return response
+                if not replay_safe and status != 429:
+                    return response
+                time.sleep(self._delay(attempt - 1, response))
+        finally:
+            self.metrics.record(method, url, status, attempt, time.perf_counter() - started,
+                                len(body) if body else 0, saved)
+
+    def post_json(self, url: str, payload: Any, timeout: float = 10,
+                  headers: Optional[Mapping[str, str]] = None):
+        """
+        POST a JSON payload and return the decoded JSON response
+
+        Raises:
+            requests.HTTPError: If the final response is an error status
+
+        Returns:
+            Decoded JSON, or None for an empty / non-JSON response
+        """
+        response = self.request('POST', url, payload, timeout=timeout, headers=headers)
+        response.raise_for_status()
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class AsyncHttpClient:
+    """Asyncio front-end for HttpClient; calls run in worker threads over the same pool"""
+
+    def __init__(self, client: Optional[HttpClient] = None, max_concurrency: Optional[int] = None):
+        """
+        Initialize the async client
+
+        Args:
+            client: Sync client whose session and metrics are shared
+            max_concurrency: Maximum calls in flight (defaults to the pool size)
+        """
+        self.client = client or HttpClient()
+        self.max_concurrency = max_concurrency or self.client.pool_size
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def metrics(self) -> ClientMetrics:
+        return self.client.metrics
+
+    def _limit(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def request(self, method: str, url: str, json_body: Any = None, timeout: float = 10,
+                      headers: Optional[Mapping[str, str]] = None, params: Optional[Mapping[str, Any]] = None):
+        """Async version of HttpClient.request"""
+        async with self._limit():
+            return await asyncio.to_thread(self.client.request, method, url, json_body, timeout, headers, params)
+
+    async def post_json(self, url: str, payload: Any, timeout: float = 10,
+                        headers: Optional[Mapping[str, str]] = None):
+        """Async version of HttpClient.post_json"""
+        async with self._limit():
+            return await asyncio.to_thread(self.client.post_json, url, payload, timeout, headers)
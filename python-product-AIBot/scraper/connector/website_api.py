@@ -1,24 +1,41 @@
 import os
-import requests
-from typing import Iterable, Mapping, Any
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Mapping, Any, Optional
+
+from .. import metrics
+from .http_client import IDEMPOTENCY_HEADER, HttpClient
 
 # Make the API base configurable via env var for testing and deployment.
 BASE = os.getenv("SCRAPER_API_BASE", "https://localhost:3000/api/scraper")
 
+# Products per insert-products request, and how many chunks are sent at once
+INSERT_CHUNK_SIZE = int(os.getenv("SCRAPER_API_CHUNK_SIZE", "200"))
+INSERT_CONCURRENCY = int(os.getenv("SCRAPER_API_CONCURRENCY", "4"))
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Return the shared keep-alive client used for every backend call."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
 
 def _post(path: str, json: Mapping[str, Any], timeout: int = 10):
+    """POST to the backend with a fresh Idempotency-Key, so the client may retry it.
+
+    The key is shared by every attempt of this call; the backend applies the
+    first attempt and answers repeats with its response (see job_server.py).
+    """
     url = f"{BASE.rstrip('/')}/{path.lstrip('/')}"
-    try:
-        r = requests.post(url, json=json, timeout=timeout)
-    except TypeError:
-        # Fallback for tests or stubs that don't accept `timeout` kwarg
-        r = requests.post(url, json=json)
-    r.raise_for_status()
-    try:
-        return r.json()
-    except ValueError:
-        # Non-JSON response
-        return None
+    headers = {IDEMPOTENCY_HEADER: uuid.uuid4().hex}
+    return get_client().post_json(url, json, timeout=timeout, headers=headers)
 
 
 def start_import_job(query: str, marketplace: str, max_results: int, timeout: int = 10) -> str:
@@ -32,11 +49,38 @@ def start_import_job(query: str, marketplace: str, max_results: int, timeout: in
     return data["jobId"]
 
 
-def insert_imported_products(job_id: str, products: Iterable[Mapping[str, Any]], timeout: int = 10) -> None:
-    """Send scraped products to the backend for the given job."""
-    _post("insert-products", {"jobId": job_id, "products": list(products)}, timeout=timeout)
+def _chunks(products: List[Mapping[str, Any]], size: int) -> List[List[Mapping[str, Any]]]:
+    size = max(1, size)
+    return [products[i:i + size] for i in range(0, len(products), size)]
+
+
+def insert_imported_products(job_id: str, products: Iterable[Mapping[str, Any]], timeout: int = 10,
+                             chunk_size: int = INSERT_CHUNK_SIZE,
+                             concurrency: int = INSERT_CONCURRENCY) -> None:
+    """Send scraped products to the backend for the given job.
+
+    Large lists are split into chunks of ``chunk_size`` products, sent
+    ``concurrency`` at a time over the shared connection pool. Raises the
+    first chunk error after all chunks have been attempted.
+    """
+    with metrics.phase('insert', 'backend'):
+        _send_chunks(job_id, _chunks(list(products), chunk_size) or [[]], timeout, concurrency)
+
+
+def _send_chunks(job_id: str, chunks: List[List[Mapping[str, Any]]], timeout: int, concurrency: int) -> None:
+    if len(chunks) == 1 or concurrency <= 1:
+        for chunk in chunks:
+            _post("insert-products", {"jobId": job_id, "products": chunk}, timeout=timeout)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+        futures = [executor.submit(_post, "insert-products", {"jobId": job_id, "products": chunk}, timeout)
+                   for chunk in chunks]
+        errors = [f.exception() for f in futures if f.exception() is not None]
+    if errors:
+        raise errors[0]
 
 
 def complete_import_job(job_id: str, timeout: int = 10) -> None:
     """Mark the import job complete on the backend."""
-    _post("complete", {"jobId": job_id}, timeout=timeout)
\ No newline at end of file
+    _post("complete", {"jobId": job_id}, timeout=timeout)
@@ -0,0 +1,111 @@
+"""Concurrent product-detail enrichment over a bounded pool of tabs"""
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+from .rate_limiter import REASON_CAPTCHA, limiter_for
+from .site_detector import get_site_info
+
+DEFAULT_ENRICH_TABS = int(os.getenv('SCRAPER_ENRICH_TABS', '4'))
+DEFAULT_ENRICH_PER_DOMAIN = int(os.getenv('SCRAPER_ENRICH_PER_DOMAIN', '2'))
+DEFAULT_ENRICH_DEADLINE = float(os.getenv('SCRAPER_ENRICH_DEADLINE', '60'))
+
+# Detail images kept per product after merging with the listing thumbnail
+MAX_IMAGES = 5
+
+
+def merge_detail(product: Dict, detail: Optional[Dict]) -> Dict:
+    """
+    Merge detail-page fields into a listing record
+
+    Listing values win for title, price and URL; detail values fill in
+    description, availability, rating and review count, and detail images
+    are added after the listing thumbnail.
+
+    Args:
+        product: Product dictionary from a listing page (updated in place)
+        detail: Product dictionary from its detail page, or None
+
+    Returns:
+        The updated product dictionary
+    """
+    if not detail:
+        return product
+    for key in ('title', 'price'):
+        if not product.get(key) and detail.get(key):
+            product[key] = detail[key]
+    if len(detail.get('description') or '') > len(product.get('description') or ''):
+        product['description'] = detail['description']
+    for key in ('availability', 'rating', 'review_count'):
+        if detail.get(key) not in (None, ''):
+            product[key] = detail[key]
+    images = list(product.get('images') or [])
+    for img_url in detail.get('images') or []:
+        if img_url not in images:
+            images.append(img_url)
+    product['images'] = images[:MAX_IMAGES]
+    return product
+
+
+async def _scrape_detail(scraper, context, url: str) -> Optional[Dict]:
+    page = await scraper._new_page(context)
+    try:
+        await scraper._navigate(page, url)
+        if await scraper._is_blocked(page):
+            limiter_for(url).record_backoff(REASON_CAPTCHA)
+            return None
+        await scraper._wait_for_product_page(page)
+        return await scraper._scrape_product_page(page, url)
+    finally:
+        await page.close()
+
+
+async def enrich_products(products: List[Dict], scraper, max_tabs: int = DEFAULT_ENRICH_TABS,
+                          per_domain: int = DEFAULT_ENRICH_PER_DOMAIN,
+                          deadline: float = DEFAULT_ENRICH_DEADLINE) -> List[Dict]:
+    """
+    Fetch the detail page of every listing product concurrently and merge it in
+
+    All tabs share one pooled browser context. At most ``max_tabs`` detail
+    pages are open at once and at most ``per_domain`` against any one host
+    (fewer while the host's rate limiter is backing off).
+    Whatever has not finished by the deadline is cancelled and those
+    products are returned as scraped from the listing.
+
+    Args:
+        products: Products from a search-results scrape (updated in place)
+        scraper: Site scraper providing _scrape_product_page
+        max_tabs: Maximum number of detail tabs open at the same time
+        per_domain: Maximum number of concurrent detail pages per host
+        deadline: Total time budget in seconds for the whole enrichment
+
+    Returns:
+        The same product list, with detail fields merged where available
+    """
+    targets = [p for p in products if p.get('url') and not scraper._is_search_page(p['url'])]
+    if not targets:
+        return products
+
+    tab_limit = asyncio.Semaphore(max(1, max_tabs))
+    domain_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async with scraper._browser_context() as context:
+        async def enrich_one(product: Dict):
+            domain = get_site_info(product['url'])['domain'] or ''
+            domain_limit = domain_limits.setdefault(domain, asyncio.Semaphore(max(1, per_domain)))
+            async with domain_limit, limiter_for(product['url']).slot():
+                async with tab_limit:
+                    try:
+                        detail = await _scrape_detail(scraper, context, product['url'])
+                    except Exception:
+                        return
+                    merge_detail(product, detail)
+
+        tasks = [asyncio.ensure_future(enrich_one(product)) for product in targets]
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return products
@@ -0,0 +1,340 @@
+"""HTTP-first fetch tier with browser fallback for listing pages"""
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+from . import metrics
+from .card_spec import BeautifulSoup
+from .enrich import enrich_products
+from .fixture_replay import MODE_RECORD, FixtureFetcher, fixture_mode, get_fixture_store
+from .page_cache import PageCache, get_page_cache
+from .rate_limiter import REASON_CAPTCHA, limiter_for
+from .scraper_factory import create_scraper
+from .site_detector import get_site_info
+from .streaming import emit_product, wait_for_sink
+
+TIER_HTTP = 'http'
+TIER_BROWSER = 'browser'
+TIER_CACHE = 'cache'
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'DNT': '1',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Strong signals that a response is a CAPTCHA / bot check rather than a listing
+_BOT_WALL_RE = re.compile(
+    r'captcha|robot check|are you a human|verify you are human|pardon our interruption'
+    r'|access denied|unusual traffic|_____tmd_____/punish|cf-challenge|px-captcha',
+    re.IGNORECASE,
+)
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+
+def http_tier_available() -> bool:
+    """Return True if requests and beautifulsoup4 are installed and the tier is enabled"""
+    if requests is None or BeautifulSoup is None:
+        return False
+    return os.getenv('SCRAPER_HTTP_TIER', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def looks_like_bot_wall(status: int, html: str) -> bool:
+    """
+    Heuristically detect CAPTCHA / bot-check responses
+
+    Args:
+        status: HTTP status code
+        html: Response body
+
+    Returns:
+        True if the page should be retried in a real browser
+    """
+    if status in (403, 429, 503):
+        return True
+    if not html or len(html) < 512:
+        return True
+    title_match = _TITLE_RE.search(html[:20000])
+    if title_match and _BOT_WALL_RE.search(title_match.group(1)):
+        return True
+    # Bot walls are small pages; real listings are large and may mention "captcha" in scripts
+    return len(html) < 20000 and bool(_BOT_WALL_RE.search(html))
+
+
+class HttpFetcher:
+    """Pooled keep-alive HTTP client for static listing pages"""
+
+    def __init__(self, pool_size: int = 20, timeout: float = 15.0):
+        """
+        Initialize the fetcher (the session is created on first use)
+
+        Args:
+            pool_size: Maximum keep-alive connections per host
+            timeout: Request timeout in seconds
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None:
+            if requests is None:
+                raise ImportError("requests is required for the HTTP fetch tier")
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(DEFAULT_HEADERS)
+            self._session = session
+        return self._session
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, str, Dict[str, str], str]:
+        """
+        Fetch a URL synchronously
+
+        Returns:
+            Tuple of (status code, body text, response headers, final URL)
+        """
+        resp = self._get_session().get(url, headers=headers, timeout=self.timeout)
+        return resp.status_code, resp.text, dict(resp.headers), resp.url
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, str, Dict[str, str], str]:
+        """Fetch a URL without blocking the event loop"""
+        return await asyncio.to_thread(self.get, url, headers)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+class TierMemory:
+    """Remembers which tier last served each domain"""
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 24 * 3600):
+        """
+        Initialize tier memory
+
+        Args:
+            path: Optional JSON file to persist decisions across processes
+            ttl: Seconds before a 'browser' decision is retried over HTTP
+        """
+        self.path = path
+        self.ttl = ttl
+        self._tiers: Dict[str, Dict] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._tiers = json.load(f)
+            except (OSError, ValueError):
+                self._tiers = {}
+
+    def preferred(self, domain: str) -> Optional[str]:
+        """Return the tier that last worked for a domain, or None if unknown/expired"""
+        entry = self._tiers.get(domain)
+        if not entry or time.time() - entry.get('at', 0) > self.ttl:
+            return None
+        return entry.get('tier')
+
+    def record(self, domain: str, tier: str):
+        """Remember the tier that served a domain"""
+        entry = self._tiers.get(domain)
+        if entry and entry.get('tier') == tier and time.time() - entry.get('at', 0) < self.ttl / 2:
+            return
+        self._tiers[domain] = {'tier': tier, 'at': time.time()}
+        if self.path:
+            try:
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump(self._tiers, f)
+            except OSError:
+                pass
+
+    def snapshot(self) -> Dict[str, str]:
+        """Return the current domain -> tier mapping"""
+        return {domain: entry['tier'] for domain, entry in self._tiers.items()}
+
+
+_fetcher: Optional[HttpFetcher] = None
+_memory: Optional[TierMemory] = None
+
+
+def get_http_fetcher() -> HttpFetcher:
+    """Return the process-wide HTTP fetcher (fixture-backed when SCRAPER_FIXTURES is set)"""
+    global _fetcher
+    if _fetcher is None:
+        store = get_fixture_store()
+        if store is None:
+            _fetcher = HttpFetcher()
+        else:
+            upstream = HttpFetcher() if fixture_mode() == MODE_RECORD else None
+            _fetcher = FixtureFetcher(store, upstream)
+    return _fetcher
+
+
+def get_tier_memory() -> TierMemory:
+    """Return the process-wide tier memory (persisted if SCRAPER_TIER_MEMORY is set)"""
+    global _memory
+    if _memory is None:
+        _memory = TierMemory(os.getenv('SCRAPER_TIER_MEMORY'))
+    return _memory
+
+
+def _header(headers: Optional[Dict[str, str]], name: str) -> Optional[str]:
+    """Case-insensitive response header lookup"""
+    name = name.lower()
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+async def scrape_static(scraper, url: str, max_results: int,
+                        fetcher: Optional[HttpFetcher] = None,
+                        headers: Optional[Dict[str, str]] = None,
+                        responses: Optional[List[Tuple[str, int, str, Dict[str, str]]]] = None) -> List[Dict]:
+    """
+    Try to scrape a listing page (and its following pages) over plain HTTP
+
+    Args:
+        scraper: Site scraper whose extraction rules are applied to the HTML
+        url: Listing page URL
+        max_results: Maximum number of products to extract
+        fetcher: HTTP fetcher (defaults to the shared one)
+        headers: Extra headers for the first page (e.g. conditional request headers)
+        responses: If given, (final URL, status, HTML, headers) of each fetched
+            page is appended to it
+
+    Returns:
+        List of unique products, empty if the first page is a bot wall or has no cards
+    """
+    fetcher = fetcher or get_http_fetcher()
+    products: List[Dict] = []
+    seen = set()
+    page_url = url
+    for page_number in range(1, scraper.max_pages + 1):
+        limiter = limiter_for(page_url)
+        await limiter.wait_turn()
+        try:
+            with metrics.phase('navigate', scraper.site_name):
+                status, html, response_headers, final_url = await fetcher.fetch(
+                    page_url, headers if page_number == 1 else None)
+        except Exception:
+            break
+        if responses is not None:
+            responses.append((final_url or page_url, status, html, response_headers))
+        if looks_like_bot_wall(status, html):
+            if status != 304:
+                metrics.count_captcha(get_site_info(page_url)['domain'], TIER_HTTP)
+                if not limiter.record_status(status):
+                    limiter.record_backoff(REASON_CAPTCHA)
+            break
+        final_url = final_url or page_url
+        try:
+            with metrics.phase('extract', scraper.site_name):
+                batch = scraper.extract_from_html(html, final_url, max_results - len(products))
+        except Exception:
+            break
+        if batch:
+            # An empty static page usually needs JavaScript, which says nothing about throttling
+            limiter.record_success()
+        added = scraper._merge_unique(products, seen, batch, final_url, max_results)
+        await wait_for_sink()
+        if not added or len(products) >= max_results:
+            break
+        page_url = scraper._next_page_url_from_html(html, final_url, page_number)
+        if not page_url:
+            break
+    return products
+
+
+async def scrape_tiered(url: str, max_results: int = 10, site_name: Optional[str] = None,
+                        scraper=None, fetcher: Optional[HttpFetcher] = None,
+                        memory: Optional[TierMemory] = None,
+                        enrich: bool = False,
+                        cache: Optional[PageCache] = None) -> Tuple[List[Dict], str]:
+    """
+    Scrape a URL over HTTP first, escalating to the browser when needed
+
+    A fresh page-cache entry answers the request without any fetch; a stale
+    one is revalidated with If-None-Match / If-Modified-Since on the HTTP
+    tier. The HTTP tier is only tried for listing pages of sites that allow
+    it, and is skipped for domains where it recently failed. A static result
+    that is empty or looks like a bot wall escalates to Playwright.
+
+    Args:
+        url: Product listing page URL
+        max_results: Maximum number of products to extract
+        site_name: Optional site name to override auto-detection
+        scraper: Optional scraper instance (defaults to create_scraper)
+        fetcher: Optional HTTP fetcher
+        memory: Optional tier memory
+        enrich: Fetch each listing product's detail page and merge it in
+        cache: Optional page cache (defaults to get_page_cache(), None when disabled)
+
+    Returns:
+        Tuple of (products, tier that served them: 'cache', 'http' or 'browser')
+    """
+    scraper = scraper or create_scraper(url=url, site_name=site_name)
+    memory = memory or get_tier_memory()
+    cache = cache if cache is not None else get_page_cache()
+    domain = get_site_info(url)['domain'] or ''
+    ttl = getattr(scraper, 'cache_ttl', None)
+
+    tried_http = False
+    tier = TIER_BROWSER
+    products: List[Dict] = []
+    entry = None
+    if cache is not None:
+        products, entry = cache.lookup(url, scraper.site_name, max_results)
+        if products is not None:
+            tier = TIER_CACHE
+        else:
+            products = []
+
+    responses: List[Tuple[str, int, str, Dict[str, str]]] = []
+    if (not products and http_tier_available() and getattr(scraper, 'http_tier_ok', False)
+            and scraper._is_search_page(url)
+            and memory.preferred(domain) != TIER_BROWSER):
+        tried_http = True
+        conditional = entry.validators() if entry is not None and entry.covers(max_results) else {}
+        products = await scrape_static(scraper, url, max_results, fetcher,
+                                       headers=conditional or None, responses=responses)
+        if products:
+            memory.record(domain, TIER_HTTP)
+            tier = TIER_HTTP
+        elif conditional and responses and responses[0][1] == 304:
+            cache.refresh(url, scraper.site_name, ttl)
+            products, tier = entry.products[:max_results], TIER_CACHE
+
+    if not products:
+        products = await scraper.scrape_from_url(url, max_results)
+        if tried_http and products:
+            memory.record(domain, TIER_BROWSER)
+
+    if tier == TIER_CACHE:
+        # Sinks (write-behind, worker streaming) still see every product
+        for product in products:
+            emit_product(product)
+    elif cache is not None and products:
+        first = responses[0] if tier == TIER_HTTP else None
+        cache.put(url, scraper.site_name, products, html=first[2] if first else None,
+                  max_results=max_results,
+                  etag=_header(first[3], 'ETag') if first else None,
+                  last_modified=_header(first[3], 'Last-Modified') if first else None,
+                  ttl=ttl)
+
+    metrics.count_scrape(domain, tier, len(products))
+    if enrich and products and scraper._is_search_page(url):
+        products = await enrich_products(products, scraper)
+    return products, tier
@@ -0,0 +1,206 @@
+"""Per-product content fingerprints, so re-scrapes only write products that changed"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .product_record import ProductRecord
+from .url_utils import canonical_url
+
+# Fields whose change makes a product worth writing again
+FINGERPRINT_FIELDS = ('title', 'price', 'currency', 'availability', 'images')
+
+# Keys per SELECT ... IN (...) when looking up a batch
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    key TEXT PRIMARY KEY,
+    digest BLOB NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_changed REAL NOT NULL
+);
+"""
+
+
+def product_key(product: Dict) -> Optional[str]:
+    """Canonical product URL identifying a product across scrapes (None without a URL)"""
+    url = (product.get('url') or '').strip()
+    return canonical_url(url) if url else None
+
+
+def product_fingerprint(product: Dict) -> bytes:
+    """
+    Stable hash of a product's title, price, currency, availability and images
+
+    Scraped and normalized products hash the same, since the product is
+    normalized first.
+
+    Args:
+        product: Scraped or normalized product dictionary
+
+    Returns:
+        16-byte BLAKE2b digest
+    """
+    record = ProductRecord.from_raw(product)
+    payload = json.dumps([getattr(record, field) for field in FINGERPRINT_FIELDS],
+                         ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).digest()
+
+
+class ChangeSet:
+    """Outcome of comparing a batch against the index: what to write and what to skip"""
+
+    def __init__(self):
+        self.changed: List[Dict] = []
+        self.new = 0
+        self.updated = 0
+        self.unchanged = 0
+        # (key, digest) of every keyed product, applied by FingerprintIndex.commit
+        self._entries: List[Tuple[str, bytes]] = []
+
+    def __len__(self) -> int:
+        return len(self.changed)
+
+    def stats(self) -> Dict:
+        return {'changed': len(self.changed), 'new': self.new, 'updated': self.updated,
+                'unchanged': self.unchanged}
+
+    def __repr__(self) -> str:
+        return f"ChangeSet(new={self.new}, updated={self.updated}, unchanged={self.unchanged})"
+
+
+class FingerprintIndex:
+    """SQLite index of the last written fingerprint per canonical product URL"""
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Initialize the index
+
+        Args:
+            path: SQLite database file (':memory:' for a per-process index)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, bytes]:
+        known = {}
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start:start + _LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            known.update(self._db.execute(
+                f"SELECT key, digest FROM fingerprints WHERE key IN ({placeholders})", chunk).fetchall())
+        return known
+
+    def diff(self, products: Iterable[Dict]) -> ChangeSet:
+        """
+        Split products into new or changed ones (to write) and unchanged ones (to skip)
+
+        Nothing is recorded until commit(), so a failed write is retried on
+        the next scrape. Products without a URL cannot be tracked and are
+        always treated as new. Neither can products that share a URL within
+        the batch but differ in content: the URL identifies none of them, so
+        all are passed through as new. Exact repeats count as unchanged.
+
+        Args:
+            products: Scraped or normalized products
+
+        Returns:
+            ChangeSet whose .changed lists the products to store
+        """
+        changes = ChangeSet()
+        groups: Dict[str, List[Tuple[Dict, bytes]]] = {}
+        for product in products:
+            key = product_key(product)
+            if key is None:
+                changes.changed.append(product)
+                changes.new += 1
+                continue
+            groups.setdefault(key, []).append((product, product_fingerprint(product)))
+
+        latest: Dict[str, Tuple[Dict, bytes]] = {}
+        for key, entries in groups.items():
+            if len({digest for _, digest in entries}) > 1:
+                changes.changed.extend(product for product, _ in entries)
+                changes.new += len(entries)
+                continue
+            changes.unchanged += len(entries) - 1
+            latest[key] = entries[-1]
+
+        with self._lock:
+            known = self._lookup(list(latest))
+        for key, (product, digest) in latest.items():
+            previous = known.get(key)
+            if previous == digest:
+                changes.unchanged += 1
+                changes._entries.append((key, digest))
+                continue
+            if previous is None:
+                changes.new += 1
+            else:
+                changes.updated += 1
+            changes.changed.append(product)
+            changes._entries.append((key, digest))
+        return changes
+
+    def commit(self, changes: ChangeSet):
+        """Record a ChangeSet's fingerprints once its changed products were written"""
+        if not changes._entries:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT INTO fingerprints (key, digest, first_seen, last_seen, last_changed)"
+                    " VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET digest = excluded.digest, last_seen = excluded.last_seen,"
+                    " last_changed = CASE WHEN fingerprints.digest = excluded.digest"
+                    " THEN fingerprints.last_changed ELSE excluded.last_changed END",
+                    [(key, digest, now, now, now) for key, digest in changes._entries])
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def forget(self, url: str):
+        """Drop a product so its next scrape is written again"""
+        with self._lock:
+            self._db.execute("DELETE FROM fingerprints WHERE key = ?", (canonical_url(url),))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM fingerprints")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_index: Optional[FingerprintIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_fingerprint_index() -> Optional[FingerprintIndex]:
+    """Return the process-wide index, or None unless SCRAPER_FINGERPRINTS names a file"""
+    global _index
+    path = os.getenv('SCRAPER_FINGERPRINTS')
+    if not path:
+        return None
+    with _index_lock:
+        if _index is None or _index.path != path:
+            _index = FingerprintIndex(path)
+        return _index
@@ -0,0 +1,220 @@
+"""Recorded-fixture mode: serve saved pages to the real scrapers without network access
+
+Set SCRAPER_FIXTURES to a fixture directory to replay it: browser pages are
+answered through Playwright routing and the HTTP tier reads the same files.
+With SCRAPER_FIXTURES_MODE=record, pages that are not in the directory yet
+are fetched live and saved.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .url_utils import canonical_url
+
+MODE_REPLAY = 'replay'
+MODE_RECORD = 'record'
+
+# Request types worth recording; images and fonts are never needed for extraction
+RECORDED_TYPES = frozenset({'document', 'xhr', 'fetch'})
+
+_INDEX = 'index.json'
+
+
+class Fixture:
+    """One saved response"""
+
+    def __init__(self, url: str, body: str, status: int = 200,
+                 content_type: str = 'text/html; charset=utf-8'):
+        self.url = url
+        self.body = body
+        self.status = status
+        self.content_type = content_type
+
+
+class FixtureStore:
+    """Directory of saved responses, indexed by canonical URL"""
+
+    def __init__(self, directory: str):
+        """
+        Open (or create) a fixture directory
+
+        Args:
+            directory: Folder holding index.json and one file per response
+        """
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+        index_path = self.directory / _INDEX
+        if index_path.exists():
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def urls(self) -> List[str]:
+        """Original URLs of every saved response"""
+        return [entry['url'] for entry in self._index.values()]
+
+    def add(self, url: str, body: str, status: int = 200,
+            content_type: str = 'text/html; charset=utf-8', site: Optional[str] = None) -> Path:
+        """
+        Save a response
+
+        Args:
+            url: URL the response was served for
+            body: Response text
+            status: HTTP status code
+            content_type: Content-Type header
+            site: Optional site name used as the sub-folder (defaults to the host)
+
+        Returns:
+            Path of the saved body
+        """
+        key = canonical_url(url)
+        folder = site or urlsplit(key).hostname or 'misc'
+        extension = '.json' if 'json' in content_type else '.html'
+        relative = Path(folder) / (hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] + extension)
+        with self._lock:
+            path = self.directory / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(body, encoding='utf-8')
+            self._index[key] = {'url': url, 'file': relative.as_posix(), 'status': status,
+                                'content_type': content_type}
+            with open(self.directory / _INDEX, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f, indent=1, sort_keys=True)
+        return path
+
+    def get(self, url: str) -> Optional[Fixture]:
+        """Return the saved response for a URL, or None"""
+        entry = self._index.get(canonical_url(url))
+        if entry is None:
+            return None
+        body = (self.directory / entry['file']).read_text(encoding='utf-8')
+        return Fixture(entry['url'], body, entry.get('status', 200),
+                       entry.get('content_type', 'text/html; charset=utf-8'))
+
+
+class FixtureRouter:
+    """Playwright route handler that replays (and optionally records) fixtures"""
+
+    def __init__(self, store: FixtureStore, mode: str = MODE_REPLAY):
+        """
+        Initialize the router
+
+        Args:
+            store: Fixture store to serve from
+            mode: 'replay' aborts every request without a fixture; 'record'
+                fetches missing documents live and saves them
+        """
+        self.store = store
+        self.mode = mode
+        self.served = 0
+        self.recorded = 0
+        self.missing: List[str] = []
+
+    async def attach(self, page):
+        """
+        Install the router on a page
+
+        Routes registered last run first, so this takes precedence over the
+        resource profile; requests it does not answer fall back to it.
+        """
+        await page.route('**/*', self._handle_route)
+
+    async def _handle_route(self, route):
+        request = route.request
+        fixture = self.store.get(request.url)
+        if fixture is not None:
+            self.served += 1
+            await route.fulfill(status=fixture.status, body=fixture.body,
+                                content_type=fixture.content_type)
+            return
+        if self.mode == MODE_RECORD:
+            if request.resource_type in RECORDED_TYPES:
+                response = await route.fetch()
+                self.store.add(request.url, await response.text(), response.status,
+                               response.headers.get('content-type', 'text/html; charset=utf-8'))
+                self.recorded += 1
+                await route.fulfill(response=response)
+            else:
+                await route.fallback()
+            return
+        if request.resource_type == 'document':
+            self.missing.append(request.url)
+        await route.abort('blockedbyclient')
+
+    def stats(self) -> Dict:
+        return {'served': self.served, 'recorded': self.recorded, 'missing': list(self.missing)}
+
+
+class FixtureFetcher:
+    """Drop-in for fetch_tier.HttpFetcher that serves fixtures"""
+
+    def __init__(self, store: FixtureStore, upstream=None):
+        """
+        Initialize the fetcher
+
+        Args:
+            store: Fixture store to serve from
+            upstream: Real fetcher used (and recorded) on a miss; None answers misses with 404
+        """
+        self.store = store
+        self.upstream = upstream
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, str, Dict[str, str], str]:
+        fixture = self.store.get(url)
+        if fixture is not None:
+            return fixture.status, fixture.body, {'Content-Type': fixture.content_type}, url
+        if self.upstream is None:
+            return 404, '', {}, url
+        status, body, response_headers, final_url = self.upstream.get(url, headers)
+        if status == 200:
+            self.store.add(url, body, status,
+                           response_headers.get('Content-Type', 'text/html; charset=utf-8'))
+        return status, body, response_headers, final_url
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, str, Dict[str, str], str]:
+        """Serve a fixture (reads are local, so only record mode leaves the event loop)"""
+        if self.upstream is None:
+            return self.get(url, headers)
+        return await asyncio.to_thread(self.get, url, headers)
+
+    def close(self):
+        if self.upstream is not None:
+            self.upstream.close()
+
+
+def fixture_mode() -> str:
+    return os.getenv('SCRAPER_FIXTURES_MODE', MODE_REPLAY).lower()
+
+
+_store: Optional[FixtureStore] = None
+_router: Optional[FixtureRouter] = None
+
+
+def get_fixture_store() -> Optional[FixtureStore]:
+    """Return the store named by SCRAPER_FIXTURES, or None when fixture mode is off"""
+    global _store
+    directory = os.getenv('SCRAPER_FIXTURES')
+    if not directory:
+        return None
+    if _store is None or _store.directory != Path(directory):
+        _store = FixtureStore(directory)
+    return _store
+
+
+def get_fixture_router() -> Optional[FixtureRouter]:
+    """Return the process-wide router for the active fixture store, if any"""
+    global _router
+    store = get_fixture_store()
+    if store is None:
+        return None
+    if _router is None or _router.store is not store or _router.mode != fixture_mode():
+        _router = FixtureRouter(store, fixture_mode())
+    return _router
@@ -0,0 +1,293 @@
+"""Per-phase scrape timings and counters, exported as Prometheus text and optional OpenTelemetry spans
+
+Disabled unless SCRAPER_METRICS=1 (or enable() is called); while disabled
+every hook returns a shared no-op object, so instrumented code pays one
+flag check. SCRAPER_OTEL=1 additionally emits a span per phase when the
+opentelemetry API is installed.
+"""
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+# Phases recorded by the scrapers and the persistence path
+PHASES = ('launch', 'context', 'pause', 'navigate', 'ready', 'extract', 'close', 'insert')
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_TRUE = ('1', 'true', 'yes', 'on')
+
+
+class _Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class MetricsRegistry:
+    """Thread-safe phase histograms, labelled counters and gauge collectors"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases: Dict[Tuple[str, str], _Histogram] = {}
+        self._counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {}
+        # Callables yielding (name, labels, value) gauge samples at render time
+        self._collectors: List[Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]] = []
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]):
+        """Add a source of live gauge values (e.g. rate limiter state), read on every render"""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def observe(self, phase: str, site: str, seconds: float):
+        with self._lock:
+            histogram = self._phases.get((phase, site))
+            if histogram is None:
+                histogram = self._phases[(phase, site)] = _Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def snapshot(self) -> Dict:
+        """Return {'phases': {(phase, site): {count, sum}}, 'counters': {name: {labels: value}}}"""
+        with self._lock:
+            return {
+                'phases': {key: {'count': h.count, 'sum': h.total} for key, h in self._phases.items()},
+                'counters': {name: dict(series) for name, series in self._counters.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._phases.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = [
+            '# HELP scraper_phase_seconds Time spent in each scrape phase',
+            '# TYPE scraper_phase_seconds histogram',
+        ]
+        with self._lock:
+            for (phase, site), histogram in sorted(self._phases.items()):
+                labels = f'phase="{_escape(phase)}",site="{_escape(site)}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    cumulative += count
+                    lines.append(f'scraper_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'scraper_phase_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'scraper_phase_seconds_sum{{{labels}}} {histogram.total}')
+                lines.append(f'scraper_phase_seconds_count{{{labels}}} {histogram.count}')
+            for name, series in sorted(self._counters.items()):
+                lines.append(f'# TYPE {name} counter')
+                for key, value in sorted(series.items()):
+                    labels = ','.join(f'{k}="{_escape(v)}"' for k, v in key)
+                    lines.append(f'{name}{{{labels}}} {value:g}')
+            collectors = list(self._collectors)
+        gauges: Dict[str, List[str]] = {}
+        for collector in collectors:
+            for name, sample_labels, value in collector():
+                labels = ','.join(f'{k}="{_escape(v)}"' for k, v in sorted(sample_labels.items()))
+                gauges.setdefault(name, []).append(f'{name}{{{labels}}} {value:g}')
+        for name, samples in sorted(gauges.items()):
+            lines.append(f'# TYPE {name} gauge')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+
+_enabled = os.getenv('SCRAPER_METRICS', '0').lower() in _TRUE
+_tracer = None
+
+
+def enable(otel: Optional[bool] = None):
+    """Start recording (otel defaults to SCRAPER_OTEL)"""
+    global _enabled, _tracer
+    _enabled = True
+    if otel is None:
+        otel = os.getenv('SCRAPER_OTEL', '0').lower() in _TRUE
+    _tracer = otel_trace.get_tracer('aibot.scraper') if otel and otel_trace is not None else None
+
+
+def disable():
+    global _enabled, _tracer
+    _enabled = False
+    _tracer = None
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def stop(self):
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+class PhaseTimer:
+    """Times one phase; stop() (or leaving the with-block) records it once"""
+
+    __slots__ = ('phase', 'site', 'started', 'span')
+
+    def __init__(self, phase: str, site: Optional[str]):
+        self.phase = phase
+        self.site = site or 'unknown'
+        self.span = _tracer.start_span(f'scrape.{phase}', attributes={'scraper.site': self.site}) \
+            if _tracer is not None else None
+        self.started = time.perf_counter()
+
+    def stop(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        elapsed = time.perf_counter() - self.started
+        self.started = None
+        registry.observe(self.phase, self.site, elapsed)
+        if self.span is not None:
+            self.span.end()
+        return elapsed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def timer(phase: str, site: Optional[str] = None):
+    """Start timing a phase; call .stop() on the result when it ends"""
+    if not _enabled:
+        return _NOOP
+    return PhaseTimer(phase, site)
+
+
+def phase(phase_name: str, site: Optional[str] = None):
+    """Context manager timing the enclosed block as one phase"""
+    return timer(phase_name, site)
+
+
+def timed(phase_name: str):
+    """Decorator timing an async scraper method as a phase, labelled with self.site_name"""
+    def decorate(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if not _enabled:
+                return await method(self, *args, **kwargs)
+            with PhaseTimer(phase_name, getattr(self, 'site_name', None)):
+                return await method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count_captcha(domain: str, tier: str):
+    """Record a CAPTCHA / bot wall for a domain"""
+    if _enabled:
+        registry.inc('scraper_captcha_total', domain=domain or 'unknown', tier=tier)
+
+
+def count_scrape(domain: str, tier: str, products: int):
+    """Record a finished scrape, and whether it came back empty"""
+    if not _enabled:
+        return
+    domain = domain or 'unknown'
+    registry.inc('scraper_scrapes_total', domain=domain, tier=tier)
+    registry.inc('scraper_products_total', products, domain=domain, tier=tier)
+    if products == 0:
+        registry.inc('scraper_empty_results_total', domain=domain)
+
+
+def count_backoff(domain: str, reason: str):
+    """Record a rate limiter backoff (captcha, throttled or empty) for a domain"""
+    if _enabled:
+        registry.inc('scraper_backoff_total', domain=domain or 'unknown', reason=reason)
+
+
+def render() -> str:
+    """Prometheus text for the process-wide registry"""
+    return registry.render()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        data = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port: int, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics from a daemon thread (also enables recording)
+
+    Args:
+        port: Port to listen on (0 picks a free one; see server.server_port)
+        host: Interface to bind
+
+    Returns:
+        The running server
+    """
+    enable()
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+
+def start_http_server_from_env() -> Optional[ThreadingHTTPServer]:
+    """Start the /metrics server if SCRAPER_METRICS_PORT is set"""
+    port = os.getenv('SCRAPER_METRICS_PORT')
+    if not port:
+        return None
+    return start_http_server(int(port))
+
+
+if _enabled:
+    enable()
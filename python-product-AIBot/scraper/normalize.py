@@ -1,33 +1,45 @@
 """Normalize product data to standardized format"""
 from typing import Dict, Any, Optional, List
 
+from .price_parser import parse_price
+
 
 def normalize_product(raw: Dict[str, Any]) -> Dict[str, Any]:
     """
     Normalize raw product data to standardized format
     
+    A field set to None counts as missing (scrapers leave e.g. currency
+    None when the site does not show one).
+    
     Args:
         raw: Raw product dictionary from scraper
         
     Returns:
         Normalized product dictionary with all standard fields
     """
+    source = raw.get("source")
     normalized = {
-        "title": raw.get("title", "").strip(),
-        "price": raw.get("price", "").strip(),
-        "source": raw.get("source", "Alibaba"),
-        "description": raw.get("description", "").strip(),
+        "title": _text(raw, "title"),
+        "price": _text(raw, "price"),
+        "source": "Alibaba" if source is None else source,
+        "description": _text(raw, "description"),
         "images": _normalize_images(raw.get("images", [])),
         "rating": _normalize_rating(raw.get("rating")),
         "review_count": _normalize_review_count(raw.get("review_count")),
-        "availability": raw.get("availability", "").strip(),
-        "url": raw.get("url", "").strip(),
-        "currency": raw.get("currency", "").strip()
+        "availability": _text(raw, "availability"),
+        "url": _text(raw, "url"),
+        "currency": _text(raw, "currency")
     }
     
     return normalized
 
 
+def _text(raw: Dict[str, Any], field: str) -> str:
+    """Stripped text field, '' when missing or None"""
+    value = raw.get(field)
+    return value.strip() if value is not None else ""
+
+
 def _normalize_images(images: Any) -> List[str]:
     """Normalize images to list of URLs or base64 data URIs"""
     if not images:
@@ -70,6 +82,9 @@ def _normalize_rating(rating: Any) -> Optional[float]:
     
     try:
         rating_float = float(rating)
+        if rating_float != rating_float:
+            # NaN (e.g. an empty spreadsheet cell) means no rating
+            return None
         # Ensure rating is between 0 and 5
         return max(0.0, min(5.0, rating_float))
     except (ValueError, TypeError):
@@ -91,6 +106,10 @@ def prepare_for_database(normalized_product: Dict[str, Any]) -> Dict[str, Any]:
     """
     Prepare normalized product for database insertion
     
+    The display price is kept as text and also parsed into the numeric
+    price_min / price_max / price_unit columns; its currency fills in a
+    missing currency.
+    
     Args:
         normalized_product: Normalized product dictionary
         
@@ -109,6 +128,11 @@ def prepare_for_database(normalized_product: Dict[str, Any]) -> Dict[str, Any]:
         "product_url": normalized_product.get("url") or None,
         "currency": normalized_product.get("currency") or None
     }
+    parsed = parse_price(db_product["price"])
+    if parsed is not None:
+        db_product.update(parsed.as_columns())
+        if db_product["currency"] is None:
+            db_product["currency"] = parsed.currency
     
     # Remove None values to avoid database issues
     return {k: v for k, v in db_product.items() if v is not None}
\ No newline at end of file
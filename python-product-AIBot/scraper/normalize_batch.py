@@ -0,0 +1,236 @@
+"""Column-wise normalization of large product batches (pandas / Arrow), matching normalize.py row for row"""
+import gc
+from contextlib import contextmanager
+from itertools import repeat
+from typing import Any, Dict, List, Sequence, Union
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = None
+    pd = None
+
+from .normalize import (_normalize_images, _normalize_rating, _normalize_review_count, normalize_product,
+                        prepare_for_database)
+from .price_parser import parse_prices
+
+# Output columns of normalize_product, in order
+NORMALIZED_FIELDS = ('title', 'price', 'source', 'description', 'images', 'rating', 'review_count',
+                     'availability', 'url', 'currency')
+
+# Text fields that are stripped and default to ''
+TEXT_FIELDS = ('title', 'price', 'description', 'availability', 'url', 'currency')
+
+# Database column <- normalized field, and whether an empty value is dropped (see prepare_for_database)
+DB_COLUMNS = (
+    ('name', 'title', False),
+    ('price', 'price', False),
+    ('source', 'source', False),
+    ('description', 'description', True),
+    ('images', 'images', False),
+    ('rating', 'rating', False),
+    ('review_count', 'review_count', False),
+    ('availability', 'availability', True),
+    ('product_url', 'url', True),
+    ('currency', 'currency', True),
+)
+
+_NUMERIC_KINDS = ('floating', 'integer', 'mixed-integer-float', 'empty')
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Suspend the cyclic garbage collector while building many containers
+
+    Every few hundred new dicts/lists trigger a collection that walks all
+    live objects, which for a large batch costs more than the build itself.
+    The rows built here hold no reference cycles.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _is_frame_like(products: Any) -> bool:
+    """pandas DataFrame, or an Arrow table / anything else exposing to_pandas()"""
+    return hasattr(products, 'to_pandas') or (pd is not None and isinstance(products, pd.DataFrame))
+
+
+def _as_frame(products: Any):
+    if pd is None:
+        raise ImportError("pandas is required to normalize DataFrame or Arrow batches")
+    if isinstance(products, pd.DataFrame):
+        return products
+    if hasattr(products, 'to_pandas'):
+        return products.to_pandas()
+    return pd.DataFrame.from_records(list(products))
+
+
+def _column(frame, name: str, default):
+    """Column as object Series with nulls replaced by default (a missing column is all default)"""
+    if name not in frame.columns:
+        return pd.Series([default] * len(frame), index=frame.index, dtype=object)
+    column = frame[name].astype(object)
+    return column.where(column.notna(), default)
+
+
+def _map(column, func):
+    """Apply func per cell keeping object dtype (Series.map would turn None results into NaN)"""
+    return pd.Series([func(value) for value in column.tolist()], index=column.index, dtype=object)
+
+
+def _strip(column):
+    if pd.api.types.infer_dtype(column, skipna=False) in ('string', 'empty'):
+        return column.str.strip()
+    # Non-text cells: fail the same way normalize_product does
+    return _map(column, lambda value: value.strip())
+
+
+def _ratings(frame):
+    if 'rating' not in frame.columns:
+        return pd.Series([None] * len(frame), index=frame.index, dtype=object)
+    column = frame['rating']
+    if pd.api.types.infer_dtype(column, skipna=True) in _NUMERIC_KINDS and column.dtype != bool:
+        values = column.astype(float)
+        return values.clip(0.0, 5.0).astype(object).where(values.notna(), None)
+    return _map(column, _normalize_rating)
+
+
+def _review_counts(frame):
+    if 'review_count' not in frame.columns:
+        return pd.Series([None] * len(frame), index=frame.index, dtype=object)
+    column = frame['review_count']
+    if pd.api.types.infer_dtype(column, skipna=True) in _NUMERIC_KINDS and column.dtype != bool:
+        values = column.astype(float)
+        finite = values.abs() != float('inf')
+        valid = values.notna() & finite
+        # int() truncates toward zero
+        counts = values.where(valid, 0).astype('int64').astype(object)
+        return counts.where(valid, None)
+    return _map(column, _normalize_review_count)
+
+
+def _normalize_frame(frame):
+    """Column-wise normalize_product over a DataFrame (null cells count as missing fields)"""
+    columns = {}
+    for field in TEXT_FIELDS:
+        columns[field] = _strip(_column(frame, field, ''))
+    columns['source'] = _column(frame, 'source', 'Alibaba')
+    columns['images'] = _map(_column(frame, 'images', None), _normalize_images)
+    columns['rating'] = _ratings(frame)
+    columns['review_count'] = _review_counts(frame)
+    return pd.DataFrame({field: columns[field] for field in NORMALIZED_FIELDS}, index=frame.index)
+
+
+def _records(frame) -> List[Dict[str, Any]]:
+    """Rows as plain dicts with Python scalars (no numpy types)"""
+    names = list(frame.columns)
+    return _dicts(names, [frame[name].tolist() for name in names])
+
+
+def _dicts(keys: List[str], columns: List[List[Any]]) -> List[Dict[str, Any]]:
+    """Zip parallel column lists into row dicts without a Python-level loop body"""
+    return list(map(dict, map(zip, repeat(keys), zip(*columns))))
+
+
+def normalize_batch(products: Union[Sequence[Dict[str, Any]], Any]):
+    """
+    Normalize many products at once
+
+    DataFrames and Arrow tables are normalized column by column and a
+    DataFrame comes back; its null cells are treated like missing keys.
+    Lists of dicts are returned as lists of dicts, identical to calling
+    normalize_product on each (that path does not need pandas). Either way
+    the garbage collector is paused for the duration of the batch.
+
+    Args:
+        products: List of raw product dicts, a pandas DataFrame or an Arrow table
+
+    Returns:
+        DataFrame with NORMALIZED_FIELDS columns, or a list of normalized dicts
+    """
+    with _gc_paused():
+        if _is_frame_like(products):
+            return _normalize_frame(_as_frame(products))
+        return [normalize_product(product) for product in products]
+
+
+def prepare_batch(normalized: Union[Sequence[Dict[str, Any]], Any]) -> List[Dict[str, Any]]:
+    """
+    Turn normalized products into database rows, identical to prepare_for_database per row
+
+    Args:
+        normalized: Output of normalize_batch (a DataFrame or a list of dicts)
+
+    Returns:
+        List of row dicts without None values, ready for Supabase
+    """
+    with _gc_paused():
+        if _is_frame_like(normalized):
+            return _prepare_frame(_as_frame(normalized))
+        return [prepare_for_database(product) for product in normalized]
+
+
+def _prepare_frame(frame) -> List[Dict[str, Any]]:
+    names, cells = [], []
+    for column, field, drop_empty in DB_COLUMNS:
+        default = 'Unknown' if field == 'source' else ''
+        if field == 'images':
+            values = _map(_column(frame, field, None), lambda images: images or [])
+        elif field in ('rating', 'review_count'):
+            values = _column(frame, field, None)
+        else:
+            values = _column(frame, field, default)
+            if drop_empty:
+                values = values.where(values.astype(bool), None)
+        names.append(column)
+        cells.append(values.to_numpy(dtype=object))
+    _add_price_columns(names, cells)
+    return _rows_without_nulls(names, cells, len(frame))
+
+
+def _add_price_columns(names: List[str], cells: List[Any]):
+    """Append price_min/price_max/price_unit and fill missing currencies, as prepare_for_database does"""
+    parsed = parse_prices(cells[names.index('price')].tolist())
+    currency_at = names.index('currency')
+    currency = cells[currency_at].copy()
+    for position in np.flatnonzero(np.equal(currency, None)).tolist():
+        if parsed[position] is not None:
+            currency[position] = parsed[position].currency
+    cells[currency_at] = currency
+    known = [price is not None for price in parsed]
+    for column, attr in (('price_min', 'amount_min'), ('price_max', 'amount_max'), ('price_unit', 'unit')):
+        names.append(column)
+        cells.append(np.array([getattr(price, attr) if ok else None for price, ok in zip(parsed, known)],
+                              dtype=object))
+
+
+def _rows_without_nulls(names: List[str], cells: List[Any], length: int) -> List[Dict[str, Any]]:
+    """
+    Build row dicts that omit None cells
+
+    Rows are grouped by which columns are None, so each group is built with
+    a fixed key list via dict(zip()) instead of filtering every cell.
+    """
+    pattern = np.zeros(length, dtype=np.int64)
+    for bit, values in enumerate(cells):
+        pattern |= np.equal(values, None).astype(np.int64) << bit
+    rows: List[Dict[str, Any]] = [None] * length
+    for code in np.unique(pattern).tolist():
+        kept = [i for i in range(len(names)) if not code >> i & 1]
+        keys = [names[i] for i in kept]
+        positions = np.flatnonzero(pattern == code)
+        whole = len(positions) == length
+        columns = [cells[i] if whole else cells[i][positions] for i in kept]
+        built = _dicts(keys, [column.tolist() for column in columns])
+        if whole:
+            return built
+        for position, row in zip(positions.tolist(), built):
+            rows[position] = row
+    return rows
@@ -0,0 +1,239 @@
+"""On-disk page cache shared by the HTTP and browser tiers"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from .url_utils import canonical_url
+
+DEFAULT_TTL = float(os.getenv('SCRAPER_CACHE_TTL', '1800'))
+DEFAULT_MAX_BYTES = int(os.getenv('SCRAPER_CACHE_MAX_MB', '256')) * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    site TEXT NOT NULL,
+    html BLOB,
+    products BLOB,
+    max_results INTEGER NOT NULL DEFAULT 0,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages(accessed_at);
+"""
+
+
+def _compress(text: Optional[str]) -> Optional[bytes]:
+    return zlib.compress(text.encode('utf-8'), 6) if text is not None else None
+
+
+def _decompress(blob: Optional[bytes]) -> Optional[str]:
+    return zlib.decompress(blob).decode('utf-8') if blob is not None else None
+
+
+class CacheEntry:
+    """A cached page: its products, optional HTML and revalidation headers"""
+
+    def __init__(self, key: str, url: str, site: str, html: Optional[str], products: Optional[List[Dict]],
+                 max_results: int, etag: Optional[str], last_modified: Optional[str],
+                 stored_at: float, expires_at: float):
+        self.key = key
+        self.url = url
+        self.site = site
+        self.html = html
+        self.products = products
+        self.max_results = max_results
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def covers(self, max_results: int) -> bool:
+        """True if the stored products answer a request for max_results"""
+        if self.products is None:
+            return False
+        # A short result for a large request means the listing had no more
+        return self.max_results >= max_results or len(self.products) < self.max_results
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """SQLite page cache keyed by site profile and canonical URL, with TTLs and an LRU size cap"""
+
+    def __init__(self, path: str = ':memory:', default_ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database file (':memory:' for a per-process cache)
+            default_ttl: Seconds an entry stays fresh when no TTL is given
+            max_bytes: Compressed size above which least recently used entries are evicted
+        """
+        self.path = path
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    @staticmethod
+    def key(url: str, site: str) -> str:
+        return f"{site}|{canonical_url(url)}"
+
+    def get(self, url: str, site: str) -> Optional[CacheEntry]:
+        """
+        Look up a page, fresh or stale
+
+        Returns:
+            CacheEntry (check .fresh before trusting it) or None
+        """
+        key = self.key(url, site)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT key, url, site, html, products, max_results, etag, last_modified, stored_at, expires_at"
+                " FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        products = _decompress(row[4])
+        return CacheEntry(row[0], row[1], row[2], _decompress(row[3]),
+                          json.loads(products) if products is not None else None,
+                          row[5], row[6], row[7], row[8], row[9])
+
+    def lookup(self, url: str, site: str, max_results: int) -> Tuple[Optional[List[Dict]], Optional[CacheEntry]]:
+        """
+        Look up products for a scrape request
+
+        Returns:
+            Tuple of (products if a fresh entry covers max_results else None,
+            the entry itself, possibly stale, for conditional revalidation)
+        """
+        entry = self.get(url, site)
+        if entry is not None and entry.fresh and entry.covers(max_results):
+            self.hits += 1
+            return entry.products[:max_results], entry
+        self.misses += 1
+        return None, entry
+
+    def put(self, url: str, site: str, products: Optional[List[Dict]] = None, html: Optional[str] = None,
+            max_results: int = 0, etag: Optional[str] = None, last_modified: Optional[str] = None,
+            ttl: Optional[float] = None):
+        """
+        Store a page
+
+        Args:
+            url: Page URL (canonicalized for the key)
+            site: Site profile name
+            products: Products extracted from the page
+            html: Raw HTML, if it was fetched over HTTP
+            max_results: The max_results the products were extracted for
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            ttl: Seconds the entry stays fresh (defaults to default_ttl)
+        """
+        now = time.time()
+        html_blob = _compress(html)
+        products_blob = _compress(json.dumps(products, default=str)) if products is not None else None
+        size = len(html_blob or b'') + len(products_blob or b'')
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (key, url, site, html, products, max_results, etag,"
+                " last_modified, stored_at, expires_at, accessed_at, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.key(url, site), url, site, html_blob, products_blob, max_results, etag,
+                 last_modified, now, expires_at, now, size))
+            self._evict()
+
+    def refresh(self, url: str, site: str, ttl: Optional[float] = None):
+        """Extend an entry's freshness after a 304 Not Modified"""
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._db.execute("UPDATE pages SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                             (expires_at, now, self.key(url, site)))
+            self.revalidated += 1
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits max_bytes (lock held)"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM pages ORDER BY accessed_at ASC").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM pages WHERE key = ?", doomed)
+        self.evicted += len(doomed)
+
+    def invalidate(self, url: str, site: str):
+        with self._lock:
+            self._db.execute("DELETE FROM pages WHERE key = ?", (self.key(url, site),))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM pages")
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and the cache's entry count and size"""
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidated': self.revalidated,
+            'evicted': self.evicted,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_cache: Optional[PageCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """Return the process-wide page cache, or None unless SCRAPER_PAGE_CACHE names a file"""
+    global _cache
+    path = os.getenv('SCRAPER_PAGE_CACHE')
+    if not path:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache.path != path:
+            _cache = PageCache(path)
+        return _cache
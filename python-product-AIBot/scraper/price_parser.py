@@ -0,0 +1,263 @@
+"""Parse display prices ("US$1.20-3.50 / piece", "1.234,56 €") into numeric ranges"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# Distinct price strings remembered by parse_price (listings repeat a lot of them)
+PARSE_CACHE_SIZE = 65536
+
+# Currency markers -> ISO 4217 code (keys are upper-cased with spaces removed).
+# A bare '$' is taken to be US dollars and a bare '¥' Japanese yen.
+CURRENCY_SYMBOLS = {
+    '$': 'USD', 'US$': 'USD', 'USD$': 'USD',
+    'C$': 'CAD', 'CA$': 'CAD', 'CAD$': 'CAD',
+    'A$': 'AUD', 'AU$': 'AUD',
+    'NZ$': 'NZD', 'HK$': 'HKD', 'S$': 'SGD', 'SG$': 'SGD', 'MX$': 'MXN', 'R$': 'BRL',
+    '€': 'EUR', '£': 'GBP', '₹': 'INR', '₩': 'KRW', '₽': 'RUB',
+    '¥': 'JPY', '￥': 'JPY', 'CN¥': 'CNY', 'CN￥': 'CNY', 'RMB': 'CNY', '元': 'CNY',
+}
+
+CURRENCY_CODES = ('USD', 'EUR', 'GBP', 'JPY', 'CNY', 'CAD', 'AUD', 'NZD', 'HKD', 'SGD', 'INR', 'BRL',
+                  'MXN', 'KRW', 'RUB', 'CHF', 'SEK', 'NOK', 'DKK', 'PLN', 'TRY', 'AED')
+
+# Units after "/" or "per" -> canonical singular form (others are kept lower-cased)
+UNITS = {
+    'pc': 'piece', 'pcs': 'piece', 'piece': 'piece', 'pieces': 'piece', 'ea': 'piece', 'each': 'piece',
+    'unit': 'unit', 'units': 'unit', 'set': 'set', 'sets': 'set', 'pair': 'pair', 'pairs': 'pair',
+    'box': 'box', 'boxes': 'box', 'carton': 'carton', 'cartons': 'carton', 'bag': 'bag', 'bags': 'bag',
+    'roll': 'roll', 'rolls': 'roll', 'dozen': 'dozen', 'pack': 'pack', 'packs': 'pack',
+    'kg': 'kg', 'kilogram': 'kg', 'g': 'g', 'gram': 'g', 'lb': 'lb', 'lbs': 'lb',
+    'ton': 'ton', 'tons': 'ton', 'm': 'meter', 'meter': 'meter', 'meters': 'meter', 'metre': 'meter',
+    'sqm': 'square meter', 'liter': 'liter', 'litre': 'liter', 'l': 'liter',
+}
+
+_CURRENCY = (r'(?:(?<![A-Za-z])(?:US|USD|CAD?|AU|NZ|HK|SG?|MX|R|C|A)?\s?\$'
+             r'|(?:CN\s?)?[¥￥]|[€£₹₩₽元]'
+             r'|(?<![A-Za-z])(?:RMB|' + '|'.join(CURRENCY_CODES) + r')(?![A-Za-z]))')
+
+# Grouped thousands ("1,234.56", "1.234,56") or a plain decimal ("1234.5", "12,5")
+_PLAIN_NUMBER = r'(?:\d{1,3}(?:[.,]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?)'
+
+# Also space-grouped thousands ("1 234,56"); only read next to a currency marker, since
+# elsewhere a space separates numbers ("iPhone 15 128GB"), and never right before a word
+_SPACED_NUMBER = r'(?:\d{1,3}(?:[.,\u00a0\u202f ]\d{3})+(?:[.,]\d+)?(?![A-Za-z])|' + _PLAIN_NUMBER + r')'
+
+_NOT_PERCENT = r'(?![\d.,]*\s*%)'
+
+# A number, space-grouped only after a currency prefix or before a currency suffix
+_NUMBER = (r'(?<![\d.,])(?(prefix)' + _SPACED_NUMBER + r'|(?:' + _SPACED_NUMBER + r'(?=\s*' + _CURRENCY + r')|'
+           + _PLAIN_NUMBER + r'))' + _NOT_PERCENT)
+
+_PRICE_RE = re.compile(
+    r'(?:(?P<prefix>' + _CURRENCY + r')\s*)?'
+    r'(?P<low>' + _NUMBER + r')'
+    r'(?:\s*(?:-|–|—|~|to)\s*(?:' + _CURRENCY + r'\s*)?(?P<high>' + _NUMBER + r'))?'
+    r'(?:\s*(?P<suffix>' + _CURRENCY + r'))?'
+    r'(?:\s*(?:/|\bper\b)\s*(?P<unit>[A-Za-z]+)\b\.?)?',
+    re.IGNORECASE,
+)
+
+# What may surround a price that has no currency marker: nothing, or a label such as "Price:"
+_BARE_BEFORE_RE = re.compile(r'\s*(?:(?:unit\s+)?(?:price|cost|amount)\s*[:：]?\s*)?', re.IGNORECASE)
+_BARE_AFTER_RE = re.compile(r'[\s.,;)]*')
+
+# A labelled price in free text ("Price: 12.50", "Unit cost 3")
+_LABELLED_RE = re.compile(r'\s*(?:unit\s+)?(?:price|cost|amount)\b', re.IGNORECASE)
+
+# An order quantity ("100", "2 000", "1,500")
+_QUANTITY = r'(?:\d{1,3}(?:[.,   ]\d{3})+|\d+(?:[.,]\d+)?)'
+
+# Minimum-order clauses ("MOQ: 100 pieces", "Min. order: 2 sets", "500 pcs (MOQ)") whose
+# quantities would otherwise be read as prices
+_NOISE_RE = re.compile(
+    r'(?:\bMOQ\b|\bmin(?:imum)?\.?\s*order(?:\s*quantity)?|\bmin\.?\s*qty)\s*[:：]?\s*' + _QUANTITY + r'\s*(?:[A-Za-z]+\.?)?'
+    r'|' + _QUANTITY + r'\s*(?:[A-Za-z]+\.?\s*)?\(\s*(?:MOQ|min(?:imum)?\.?\s*order)\s*\)',
+    re.IGNORECASE,
+)
+
+_SPACES = str.maketrans('', '', '   ')
+
+_DIGIT_RE = re.compile(r'\d')
+
+# Longest currency marker (with spacing) that can precede a number, e.g. "US $ "
+_PREFIX_WINDOW = 12
+
+
+class ParsedPrice:
+    """Numeric reading of a price string; amount_min == amount_max for a single price"""
+
+    __slots__ = ('amount_min', 'amount_max', 'currency', 'unit', 'text')
+
+    def __init__(self, amount_min: float, amount_max: float, currency: Optional[str] = None,
+                 unit: Optional[str] = None, text: str = ''):
+        self.amount_min = amount_min
+        self.amount_max = amount_max
+        self.currency = currency
+        self.unit = unit
+        self.text = text
+
+    @property
+    def is_range(self) -> bool:
+        return self.amount_max != self.amount_min
+
+    def as_columns(self) -> Dict:
+        """Numeric database columns (see supabase_migration_price_columns.sql)"""
+        return {'price_min': self.amount_min, 'price_max': self.amount_max, 'price_unit': self.unit}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ParsedPrice):
+            return NotImplemented
+        return (self.amount_min, self.amount_max, self.currency, self.unit) == \
+            (other.amount_min, other.amount_max, other.currency, other.unit)
+
+    def __hash__(self) -> int:
+        return hash((self.amount_min, self.amount_max, self.currency, self.unit))
+
+    def __repr__(self) -> str:
+        return (f"ParsedPrice({self.amount_min!r}, {self.amount_max!r}, "
+                f"currency={self.currency!r}, unit={self.unit!r})")
+
+
+def _to_amount(number: str) -> float:
+    """
+    Read a number written with either decimal convention
+
+    The last '.' or ',' is the decimal point when both appear. A single
+    separator followed by exactly three digits groups thousands ("1,234",
+    "1.234") unless the integer part is 0; otherwise it is the decimal point.
+    """
+    number = number.translate(_SPACES)
+    dot, comma = number.rfind('.'), number.rfind(',')
+    if dot >= 0 and comma >= 0:
+        decimal = '.' if dot > comma else ','
+        grouping = ',' if decimal == '.' else '.'
+        return float(number.replace(grouping, '').replace(decimal, '.'))
+    separator = '.' if dot >= 0 else ',' if comma >= 0 else None
+    if separator is None:
+        return float(number)
+    whole, _, fraction = number.rpartition(separator)
+    if number.count(separator) > 1 or (len(fraction) == 3 and whole != '0'):
+        return float(number.replace(separator, ''))
+    return float(f"{whole.replace(separator, '')}.{fraction}")
+
+
+def _currency_code(marker: Optional[str]) -> Optional[str]:
+    if not marker:
+        return None
+    marker = marker.translate(_SPACES).upper()
+    return CURRENCY_SYMBOLS.get(marker) or (marker if marker in CURRENCY_CODES else None)
+
+
+def _best_match(text: str):
+    """
+    First match that carries a currency, else the first bare number
+
+    Matching starts a few characters before each digit instead of at every
+    position of the text, which keeps long lines of prose cheap.
+    """
+    first = None
+    pos = 0
+    while True:
+        digit = _DIGIT_RE.search(text, pos)
+        if digit is None:
+            return first
+        match = _PRICE_RE.search(text, max(pos, digit.start() - _PREFIX_WINDOW))
+        if match is None:
+            return first
+        if match.group('prefix') or match.group('suffix'):
+            return match
+        if first is None:
+            first = match
+        pos = match.end()
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_price(text: Optional[str]) -> Optional[ParsedPrice]:
+    """
+    Parse a display price into a numeric range, currency and unit
+
+    Minimum-order quantities are ignored and a price with a currency marker
+    wins over bare numbers, so "MOQ 100 pcs, US$1.20-3.50 / piece" reads as
+    1.2-3.5 USD per piece. A number without a currency only counts when it
+    is all the text holds (optionally after a "Price:" label), so "15" is a
+    price but "ships in 3 days" is not. Results are memoized, so treat them
+    as read-only.
+
+    Args:
+        text: Price text as scraped, e.g. "1.234,56 €" or "$12.99"
+
+    Returns:
+        ParsedPrice, or None when the text holds no price
+    """
+    if not text:
+        return None
+    lowered = text.lower()
+    if 'moq' in lowered or 'min' in lowered:
+        text = _NOISE_RE.sub(' ', text)
+    match = _best_match(text)
+    if match is None:
+        return None
+    if not (match.group('prefix') or match.group('suffix')) and not (
+            _BARE_BEFORE_RE.fullmatch(text, 0, match.start())
+            and _BARE_AFTER_RE.fullmatch(text, match.end())):
+        # A bare number inside other words ("ships in 3 days", "3.5 out of 5 stars") is not a price
+        return None
+    low = _to_amount(match.group('low'))
+    high = _to_amount(match.group('high')) if match.group('high') else low
+    unit = match.group('unit')
+    if unit:
+        unit = unit.lower()
+        unit = UNITS.get(unit, unit)
+    return ParsedPrice(min(low, high), max(low, high),
+                       _currency_code(match.group('prefix') or match.group('suffix')),
+                       unit, match.group(0).strip())
+
+
+def parse_prices(texts: Iterable[Optional[str]]) -> List[Optional[ParsedPrice]]:
+    """
+    Parse many price strings, each distinct string once
+
+    Args:
+        texts: Price strings (None and '' give None)
+
+    Returns:
+        One ParsedPrice or None per input, in order
+    """
+    parsed: Dict[Optional[str], Optional[ParsedPrice]] = {}
+    results = []
+    for text in texts:
+        if text not in parsed:
+            parsed[text] = parse_price(text)
+        results.append(parsed[text])
+    return results
+
+
+def price_columns(text: Optional[str]) -> Dict:
+    """
+    Numeric price columns for a price string, all None when it holds no price
+
+    Use this when updating a stored row's price so stale numbers are cleared.
+    """
+    parsed = parse_price(text)
+    if parsed is None:
+        return {'price_min': None, 'price_max': None, 'price_unit': None}
+    return parsed.as_columns()
+
+
+def find_price(text: str) -> Optional[str]:
+    """
+    Return the part of a line of text that is a price, e.g. "USD 12.50" from "Cost: USD 12.50 each"
+
+    Free text is full of numbers that are not prices, so a price needs a
+    currency marker here, or a label ("Price: 12.50").
+
+    Args:
+        text: Free text (a line of a PDF, a table cell)
+
+    Returns:
+        The matched price text, or None
+    """
+    parsed = parse_price(text)
+    if parsed is None or not (parsed.currency or _LABELLED_RE.match(text)):
+        return None
+    return parsed.text
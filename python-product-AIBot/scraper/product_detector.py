@@ -3,6 +3,8 @@ import re
 from typing import List, Dict, Optional, Tuple
 import logging
 
+from .price_parser import find_price
+
 try:
     import pytesseract
     from PIL import Image
@@ -26,20 +28,6 @@ class ProductDetector:
     
     def __init__(self):
         """Initialize product detector with enhanced patterns"""
-        # Enhanced price patterns
-        self.price_patterns = [
-            r'\$[\d,]+\.?\d*',  # $123.45 or $1,234.56
-            r'USD\s*[\d,]+\.?\d*',  # USD 123.45
-            r'EUR\s*[\d,]+\.?\d*',  # EUR 123.45
-            r'GBP\s*[\d,]+\.?\d*',  # GBP 123.45
-            r'CNY\s*[\d,]+\.?\d*',  # CNY 123.45
-            r'[\d,]+\.?\d*\s*(USD|EUR|GBP|JPY|CNY|RMB)',  # 123.45 USD
-            r'Price[:\s]+[\d,]+\.?\d*',  # Price: 123.45
-            r'Cost[:\s]+[\d,]+\.?\d*',  # Cost: 123.45
-            r'Amount[:\s]+[\d,]+\.?\d*',  # Amount: 123.45
-            r'[\d,]+\.?\d*',  # Just numbers (fallback, but more careful)
-        ]
-        
         # Enhanced product name indicators
         self.product_indicators = [
             r'Product[:\s]+(.+?)(?:\n|$|Price|Cost|Amount)',
@@ -371,18 +359,8 @@ class ProductDetector:
         return None
     
     def _extract_price(self, text: str) -> Optional[str]:
-        """Extract price from text with improved accuracy"""
-        # Try patterns in order of specificity
-        for pattern in self.price_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                # Return first match, cleaned up
-                price = str(matches[0]).strip()
-                # Validate it's actually a price (has digits)
-                if re.search(r'\d', price):
-                    return price
-        
-        return None
+        """Extract price from text (currency-marked prices win over bare numbers)"""
+        return find_price(text)
     
     def _normalize_price(self, price: str) -> str:
         """Normalize price string"""
@@ -0,0 +1,183 @@
+"""Slotted product record: one typed shape for a product from scrape to database row and API payload"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from .normalize import _normalize_images, _normalize_rating, _normalize_review_count
+from .price_parser import parse_price
+
+# Alternative keys accepted by ProductRecord.from_raw -> field (used when the field itself is absent)
+FIELD_ALIASES = {
+    'name': 'title',
+    'product_url': 'url',
+    'link': 'url',
+    'price_text': 'price',
+}
+
+_TEXT_FIELDS = ('title', 'price', 'description', 'availability', 'url', 'currency')
+
+
+def _text_type_error(raw: Mapping[str, Any]) -> TypeError:
+    """Describe the first text field holding a non-string (called only after .strip() failed)"""
+    for field in _TEXT_FIELDS:
+        value = raw.get(field)
+        if value is None:
+            value = next((raw.get(alias) for alias, target in FIELD_ALIASES.items()
+                          if target == field and raw.get(alias) is not None), None)
+        if value is not None and not isinstance(value, str):
+            return TypeError(f"Product field {field!r} must be text, got {type(value).__name__}")
+    return TypeError("Product text fields must be strings")
+
+
+class ProductRecord:
+    """
+    A normalized product
+
+    Fields match normalize_product(): text fields are stripped strings ('' when
+    missing), images a list of URLs/data URIs, rating a float in 0-5 or None,
+    review_count an int or None. A record takes under half the memory of
+    the equivalent dict and is built straight from the scraped dict, so the
+    database row and API payload need no intermediate normalized dict.
+    Records are meant to be treated as read-only once built.
+    """
+
+    __slots__ = ('title', 'price', 'source', 'description', 'images', 'rating', 'review_count',
+                 'availability', 'url', 'currency')
+
+    def __init__(self, title: str = '', price: str = '', source: str = 'Alibaba', description: str = '',
+                 images: Optional[List[str]] = None, rating: Optional[float] = None,
+                 review_count: Optional[int] = None, availability: str = '', url: str = '',
+                 currency: str = ''):
+        self.title = title
+        self.price = price
+        self.source = source
+        self.description = description
+        self.images = images if images is not None else []
+        self.rating = rating
+        self.review_count = review_count
+        self.availability = availability
+        self.url = url
+        self.currency = currency
+
+    @classmethod
+    def from_raw(cls, raw: Mapping[str, Any], default_source: str = 'Alibaba') -> 'ProductRecord':
+        """
+        Validate and normalize a scraped product (or a database row, through FIELD_ALIASES)
+
+        Produces the same values as normalize_product.
+
+        Args:
+            raw: Product dictionary from a scraper, a PDF or the products table
+            default_source: Source used when the product has none
+
+        Returns:
+            ProductRecord
+
+        Raises:
+            TypeError: If a text field holds something other than a string
+        """
+        get = raw.get
+        title = get('title')
+        if title is None:
+            title = get('name')
+        price = get('price')
+        if price is None:
+            price = get('price_text')
+        url = get('url')
+        if url is None:
+            url = get('product_url')
+            if url is None:
+                url = get('link')
+        description = get('description')
+        availability = get('availability')
+        currency = get('currency')
+        source = get('source')
+
+        record = cls.__new__(cls)
+        try:
+            record.title = title.strip() if title is not None else ''
+            record.price = price.strip() if price is not None else ''
+            record.description = description.strip() if description is not None else ''
+            record.availability = availability.strip() if availability is not None else ''
+            record.url = url.strip() if url is not None else ''
+            record.currency = currency.strip() if currency is not None else ''
+        except AttributeError:
+            raise _text_type_error(raw) from None
+        record.source = default_source if source is None else source
+        record.images = _normalize_images(get('images'))
+        record.rating = _normalize_rating(get('rating'))
+        record.review_count = _normalize_review_count(get('review_count'))
+        return record
+
+    def to_normalized(self) -> Dict[str, Any]:
+        """The normalize_product() dict for this product"""
+        return {
+            'title': self.title,
+            'price': self.price,
+            'source': self.source,
+            'description': self.description,
+            'images': self.images,
+            'rating': self.rating,
+            'review_count': self.review_count,
+            'availability': self.availability,
+            'url': self.url,
+            'currency': self.currency,
+        }
+
+    def to_db_row(self) -> Dict[str, Any]:
+        """
+        The products-table row, equal to prepare_for_database(normalize_product(raw))
+
+        Empty optional fields are left out and the images list is shared with
+        the record rather than copied.
+        """
+        row = {'name': self.title, 'price': self.price, 'source': self.source}
+        if self.description:
+            row['description'] = self.description
+        row['images'] = self.images
+        if self.rating is not None:
+            row['rating'] = self.rating
+        if self.review_count is not None:
+            row['review_count'] = self.review_count
+        if self.availability:
+            row['availability'] = self.availability
+        if self.url:
+            row['product_url'] = self.url
+        currency = self.currency
+        parsed = parse_price(self.price)
+        if not currency and parsed is not None:
+            currency = parsed.currency
+        if currency:
+            row['currency'] = currency
+        if parsed is not None:
+            row['price_min'] = parsed.amount_min
+            row['price_max'] = parsed.amount_max
+            if parsed.unit is not None:
+                row['price_unit'] = parsed.unit
+        return row
+
+    def to_api(self) -> Dict[str, Any]:
+        """Payload for the import API's insert-products endpoint (see connector.website_api)"""
+        return {
+            'title': self.title,
+            'price': self.price,
+            'currency': self.currency,
+            'description': self.description,
+            'images': self.images,
+            'url': self.url,
+            'source': self.source,
+        }
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ProductRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ProductRecord(title={self.title!r}, price={self.price!r}, source={self.source!r}, url={self.url!r})"
+
+
+def records_from_raw(products: Iterable[Mapping[str, Any]], default_source: str = 'Alibaba') -> List[ProductRecord]:
+    """ProductRecord.from_raw over many products"""
+    from_raw = ProductRecord.from_raw
+    return [from_raw(product, default_source) for product in products]
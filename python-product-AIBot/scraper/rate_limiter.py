@@ -0,0 +1,314 @@
+"""Adaptive per-domain rate limiting: token buckets with AIMD concurrency and block-driven backoff"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+from . import metrics
+from .site_detector import get_site_info
+
+_TRUE = ('1', 'true', 'yes', 'on')
+
+# Requests per second each domain starts at, and the range it adapts within
+DEFAULT_RATE = float(os.getenv('SCRAPER_RATE', '1.0'))
+DEFAULT_MIN_RATE = float(os.getenv('SCRAPER_RATE_MIN', '0.1'))
+DEFAULT_MAX_RATE = float(os.getenv('SCRAPER_RATE_MAX', '8.0'))
+DEFAULT_BURST = float(os.getenv('SCRAPER_RATE_BURST', '3'))
+# Concurrent scrapes each domain starts at, and the most it may grow to
+DEFAULT_CONCURRENCY = float(os.getenv('SCRAPER_DOMAIN_CONCURRENCY', '2'))
+DEFAULT_MAX_CONCURRENCY = float(os.getenv('SCRAPER_DOMAIN_CONCURRENCY_MAX', '8'))
+# Pause after a CAPTCHA / 429 / 503, doubled for every further block in a row
+DEFAULT_COOLDOWN = float(os.getenv('SCRAPER_BLOCK_COOLDOWN', '5'))
+DEFAULT_MAX_COOLDOWN = float(os.getenv('SCRAPER_BLOCK_COOLDOWN_MAX', '120'))
+
+# Additive increase per successful page
+RATE_STEP = 0.1
+# Multiplicative decrease for a bot wall, and the milder one for an empty listing
+BLOCK_FACTOR = 0.5
+EMPTY_FACTOR = 0.75
+
+# Responses that mean "slow down" rather than "not found"
+THROTTLE_STATUSES = frozenset({429, 503})
+
+REASON_CAPTCHA = 'captcha'
+REASON_THROTTLED = 'throttled'
+REASON_EMPTY = 'empty'
+
+# Limiters whose slot the current task holds; tasks it spawns inherit the set
+_held_slots: ContextVar[frozenset] = ContextVar('held_slots', default=frozenset())
+
+
+class DomainLimiter:
+    """
+    Token bucket plus an AIMD concurrency limit for one domain
+
+    wait_turn() paces requests at the current rate; slot() bounds how many
+    scrapes run against the domain at once. Successful pages raise both
+    additively; bot walls and throttling responses halve them and pause the
+    domain for an exponentially growing cooldown, and empty listings shrink
+    them more gently. Safe to share between threads and event loops.
+    """
+
+    def __init__(self, domain: str, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST,
+                 min_rate: float = DEFAULT_MIN_RATE, max_rate: float = DEFAULT_MAX_RATE,
+                 concurrency: float = DEFAULT_CONCURRENCY, max_concurrency: float = DEFAULT_MAX_CONCURRENCY,
+                 cooldown: float = DEFAULT_COOLDOWN, max_cooldown: float = DEFAULT_MAX_COOLDOWN):
+        """
+        Initialize the limiter
+
+        Args:
+            domain: Domain the limiter paces (used as the metrics label)
+            rate: Starting requests per second
+            burst: Requests that may be sent back to back after an idle period
+            min_rate: Lowest rate backoff may reach
+            max_rate: Highest rate successes may reach
+            concurrency: Starting number of concurrent scrapes
+            max_concurrency: Highest concurrency successes may reach
+            cooldown: Seconds the domain is paused after its first block in a row
+            max_cooldown: Upper bound for the doubling cooldown
+        """
+        self.domain = domain
+        self.min_rate = max(0.001, min_rate)
+        self.max_rate = max(self.min_rate, max_rate)
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+        self.burst = max(1.0, burst)
+        self.max_concurrency = max(1.0, max_concurrency)
+        self.limit = min(self.max_concurrency, max(1.0, concurrency))
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.tokens = self.burst
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.strikes = 0
+        self.successes = 0
+        self.backoffs = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiters: deque = deque()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Take a token if one is available, otherwise return the seconds to wait (lock not held)"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    async def wait_turn(self):
+        """Wait until the domain may receive another request"""
+        while True:
+            delay = self._reserve()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def _wake(self):
+        """Resolve waiters for every free slot (lock held)"""
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            loop, future = self._waiters.popleft()
+            loop.call_soon_threadsafe(_resolve, future)
+            free -= 1
+
+    async def _acquire_slot(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                future = loop.create_future()
+                waiter = (loop, future)
+                self._waiters.append(waiter)
+            try:
+                await future
+            except BaseException:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    else:
+                        # Woken and cancelled at once: pass the wake-up on
+                        self._wake()
+                raise
+
+    def _release_slot(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold one of the domain's concurrency slots for the enclosed scrape
+
+        A nested slot() on the same domain (detail-page enrichment inside a
+        listing scrape, including tasks it spawns) runs under the slot
+        already held instead of waiting for a second one.
+        """
+        held = _held_slots.get()
+        if self in held:
+            yield self
+            return
+        await self._acquire_slot()
+        token = _held_slots.set(held | {self})
+        try:
+            yield self
+        finally:
+            _held_slots.reset(token)
+            self._release_slot()
+
+    def record_success(self):
+        """A page came back with products: grow rate and concurrency additively"""
+        with self._lock:
+            self.successes += 1
+            self.strikes = 0
+            self.rate = min(self.max_rate, self.rate + RATE_STEP)
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._wake()
+
+    def record_backoff(self, reason: str):
+        """
+        A page was blocked, throttled or empty: shrink rate and concurrency
+
+        Args:
+            reason: REASON_CAPTCHA or REASON_THROTTLED (which also pause the
+                domain for the cooldown), or REASON_EMPTY
+        """
+        factor = EMPTY_FACTOR if reason == REASON_EMPTY else BLOCK_FACTOR
+        with self._lock:
+            self.backoffs += 1
+            self.rate = max(self.min_rate, self.rate * factor)
+            self.limit = max(1.0, self.limit * factor)
+            if reason != REASON_EMPTY:
+                self.strikes += 1
+                pause = min(self.max_cooldown, self.cooldown * 2 ** (self.strikes - 1))
+                self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+                self.tokens = 0.0
+        metrics.count_backoff(self.domain, reason)
+
+    def record_status(self, status: Optional[int]) -> bool:
+        """Back off on a 429 / 503 response, returning True if it was one"""
+        if status in THROTTLE_STATUSES:
+            self.record_backoff(REASON_THROTTLED)
+            return True
+        return False
+
+    def state(self) -> Dict:
+        """Current rate, concurrency and backoff state"""
+        with self._lock:
+            return {
+                'domain': self.domain,
+                'rate': round(self.rate, 3),
+                'concurrency': round(self.limit, 3),
+                'in_flight': self.in_flight,
+                'cooldown': round(max(0.0, self.blocked_until - time.monotonic()), 3),
+                'successes': self.successes,
+                'backoffs': self.backoffs,
+            }
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class _Unlimited:
+    """Stand-in limiter used when rate limiting is switched off"""
+
+    domain = ''
+
+    async def wait_turn(self):
+        return None
+
+    @asynccontextmanager
+    async def slot(self):
+        yield self
+
+    def record_success(self):
+        pass
+
+    def record_backoff(self, reason: str):
+        pass
+
+    def record_status(self, status: Optional[int]) -> bool:
+        return False
+
+
+UNLIMITED = _Unlimited()
+
+
+class RateLimiter:
+    """Per-domain limiters created on first use with shared defaults"""
+
+    def __init__(self, **defaults):
+        """
+        Initialize the registry
+
+        Args:
+            **defaults: DomainLimiter keyword arguments applied to every domain
+        """
+        self.defaults = defaults
+        self._lock = threading.Lock()
+        self._domains: Dict[str, DomainLimiter] = {}
+
+    def for_domain(self, domain: str) -> DomainLimiter:
+        domain = domain or 'unknown'
+        with self._lock:
+            limiter = self._domains.get(domain)
+            if limiter is None:
+                limiter = self._domains[domain] = DomainLimiter(domain, **self.defaults)
+            return limiter
+
+    def for_url(self, url: str) -> DomainLimiter:
+        return self.for_domain(get_site_info(url)['domain'] or '')
+
+    def states(self) -> Dict[str, Dict]:
+        with self._lock:
+            limiters = list(self._domains.values())
+        return {limiter.domain: limiter.state() for limiter in limiters}
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        """Gauge samples for the metrics registry"""
+        for domain, state in self.states().items():
+            labels = {'domain': domain}
+            yield 'scraper_domain_rate', labels, state['rate']
+            yield 'scraper_domain_concurrency', labels, state['concurrency']
+            yield 'scraper_domain_in_flight', labels, state['in_flight']
+            yield 'scraper_domain_cooldown_seconds', labels, state['cooldown']
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def rate_limiting_enabled() -> bool:
+    return os.getenv('SCRAPER_RATE_LIMIT', '1').lower() in _TRUE
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter registry (its state is exported as metrics gauges)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+            metrics.registry.register_collector(_limiter.samples)
+        return _limiter
+
+
+def limiter_for(url: str):
+    """Return the limiter for a URL's domain, or a no-op one when SCRAPER_RATE_LIMIT=0"""
+    if not rate_limiting_enabled():
+        return UNLIMITED
+    return get_rate_limiter().for_url(url)
@@ -0,0 +1,216 @@
+"""Scraper registry: site manifests, lazy plugin loading and shared scraper instances"""
+import importlib
+import logging
+import threading
+from importlib.metadata import entry_points
+from typing import Dict, Iterable, List, Optional
+
+from .site_detector import detect_site_from_url, register_domain
+from .sites import BUILTIN_SCRAPERS
+
+logger = logging.getLogger(__name__)
+
+# Entry point group third-party packages use to contribute scrapers; each
+# entry point resolves to a ScraperSpec, a manifest dict or a list of them
+ENTRY_POINT_GROUP = 'aibot.scrapers'
+
+GENERIC_SITE = 'Generic'
+
+CAPABILITIES = frozenset({'http', 'pagination', 'json_payload', 'detail'})
+
+
+class ScraperSpec:
+    """Manifest of one site scraper: what it serves and can do, and where its class lives"""
+
+    def __init__(self, name: str, target: str, domains: Iterable[str] = (),
+                 capabilities: Iterable[str] = (), resource_profile: Optional[str] = None):
+        """
+        Initialize the spec (nothing is imported until load())
+
+        Args:
+            name: Site name, e.g. 'Amazon'
+            target: "module:Class"; a module starting with '.' is relative to this package
+            domains: Registrable domains served by the scraper
+            capabilities: Subset of CAPABILITIES
+            resource_profile: Name of the scraper's ResourceProfile
+
+        Raises:
+            ValueError: If target is malformed or a capability is unknown
+        """
+        module, _, attr = target.partition(':')
+        if not module or not attr:
+            raise ValueError(f"Scraper target must be 'module:Class', got {target!r}")
+        unknown = set(capabilities) - CAPABILITIES
+        if unknown:
+            raise ValueError(f"Unknown scraper capabilities for {name}: {sorted(unknown)}")
+        self.name = name
+        self.target = target
+        self.domains = tuple(d.lower() for d in domains)
+        self.capabilities = frozenset(capabilities)
+        self.resource_profile = resource_profile or name
+        self._class = None
+
+    @classmethod
+    def from_manifest(cls, entry: Dict) -> 'ScraperSpec':
+        return cls(entry['name'], entry['target'], entry.get('domains', ()),
+                   entry.get('capabilities', ()), entry.get('resource_profile'))
+
+    @property
+    def loaded(self) -> bool:
+        return self._class is not None
+
+    def load(self):
+        """
+        Import the scraper module and return its class
+
+        From then on the spec's capabilities are the ones the class itself
+        declares; a manifest that disagrees is logged so it can be fixed.
+        """
+        if self._class is None:
+            module, _, attr = self.target.partition(':')
+            package = __package__ if module.startswith('.') else None
+            cls = getattr(importlib.import_module(module, package), attr)
+            declared = getattr(cls, 'declared_capabilities', None)
+            if declared is not None:
+                capabilities = frozenset(declared())
+                if capabilities != self.capabilities:
+                    logger.warning("Manifest capabilities of %s %s differ from its class %s; using the class",
+                                   self.name, sorted(self.capabilities), sorted(capabilities))
+                    self.capabilities = capabilities
+            self._class = cls
+        return self._class
+
+    def supports(self, capability: str) -> bool:
+        return capability in self.capabilities
+
+    def __repr__(self) -> str:
+        return f"ScraperSpec({self.name!r}, {self.target!r})"
+
+
+def _specs_from(value) -> List[ScraperSpec]:
+    """Normalize what an entry point resolved to into specs"""
+    if isinstance(value, ScraperSpec):
+        return [value]
+    if isinstance(value, dict):
+        return [ScraperSpec.from_manifest(value)]
+    return [spec for item in value for spec in _specs_from(item)]
+
+
+class ScraperRegistry:
+    """
+    Site name -> scraper spec and shared instance
+
+    Specs are plain manifests, so registering a site costs nothing; its
+    module is imported when the first scraper for it is requested. One
+    instance per site is created and reused, which is safe because
+    scrapers keep all per-scrape state in locals (browser contexts come
+    from the shared pool), so concurrent jobs can share it.
+    """
+
+    def __init__(self, specs: Iterable[ScraperSpec] = ()):
+        self._lock = threading.Lock()
+        self._specs: Dict[str, ScraperSpec] = {}
+        self._instances: Dict[str, object] = {}
+        for spec in specs:
+            self.register(spec)
+
+    @staticmethod
+    def _key(site_name: str) -> str:
+        return site_name.casefold()
+
+    def register(self, spec: ScraperSpec, replace: bool = False):
+        """
+        Add a site scraper and teach site detection its domains
+
+        Raises:
+            ValueError: If the site is already registered and replace is False
+        """
+        key = self._key(spec.name)
+        with self._lock:
+            if key in self._specs and not replace:
+                raise ValueError(f"A scraper for {spec.name} is already registered")
+            self._specs[key] = spec
+            self._instances.pop(key, None)
+        for domain in spec.domains:
+            register_domain(domain, spec.name)
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> int:
+        """
+        Register the scrapers installed packages advertise under an entry point group
+
+        Only the entry point objects (manifests) are imported here, not the
+        scraper modules they name. A broken plugin is logged and skipped.
+
+        Returns:
+            Number of specs registered
+        """
+        added = 0
+        for entry_point in entry_points(group=group):
+            try:
+                for spec in _specs_from(entry_point.load()):
+                    self.register(spec, replace=True)
+                    added += 1
+            except Exception as e:
+                logger.warning("Skipping scraper plugin %s: %s", entry_point.name, e)
+        return added
+
+    def spec(self, site_name: str) -> Optional[ScraperSpec]:
+        return self._specs.get(self._key(site_name))
+
+    def specs(self) -> List[ScraperSpec]:
+        return list(self._specs.values())
+
+    def site_names(self) -> List[str]:
+        return sorted(spec.name for spec in self._specs.values())
+
+    def with_capability(self, capability: str) -> List[str]:
+        """Names of the sites whose scraper declares a capability (no imports)"""
+        return sorted(spec.name for spec in self._specs.values() if spec.supports(capability))
+
+    def get(self, site_name: str):
+        """
+        Return the shared scraper instance for a site
+
+        Raises:
+            KeyError: If no scraper is registered for the site
+            ImportError: If the scraper module cannot be imported
+        """
+        key = self._key(site_name)
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+        spec = self._specs[key]
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                instance = self._instances[key] = spec.load()()
+            return instance
+
+    def for_url(self, url: str):
+        """Shared scraper for a URL's site, the generic scraper for unknown sites"""
+        site_name = detect_site_from_url(url)
+        if site_name is None or self._key(site_name) not in self._specs:
+            site_name = GENERIC_SITE
+        return self.get(site_name)
+
+    def clear_instances(self):
+        """Drop cached instances (e.g. after changing SCRAPER_* settings read at construction)"""
+        with self._lock:
+            self._instances.clear()
+
+
+_registry: Optional[ScraperRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ScraperRegistry:
+    """Return the process-wide registry: the built-in manifest plus installed plugins"""
+    global _registry
+    if _registry is not None:
+        return _registry
+    with _registry_lock:
+        if _registry is None:
+            registry = ScraperRegistry(ScraperSpec.from_manifest(entry) for entry in BUILTIN_SCRAPERS)
+            registry.load_entry_points()
+            _registry = registry
+        return _registry
@@ -0,0 +1,161 @@
+"""Request-interception profiles that abort resources scrapers do not need"""
+import os
+from typing import Dict, Iterable
+from urllib.parse import urlparse
+
+
+# Third-party ad, analytics and tracking hosts (subdomains are matched too)
+AD_TRACKER_HOSTS = (
+    'doubleclick.net',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googletagservices.com',
+    'amazon-adsystem.com',
+    'adnxs.com',
+    'adsrvr.org',
+    'criteo.com',
+    'criteo.net',
+    'taboola.com',
+    'outbrain.com',
+    'scorecardresearch.com',
+    'quantserve.com',
+    'moatads.com',
+    'demdex.net',
+    'omtrdc.net',
+    'facebook.net',
+    'bat.bing.com',
+    'hotjar.com',
+    'nr-data.net',
+    'clarity.ms',
+)
+
+# Resource types that never carry product data in the DOM
+DEFAULT_BLOCKED_TYPES = ('image', 'media', 'font')
+
+# Rough average transfer size per resource type, used to estimate savings
+TYPICAL_BYTES = {
+    'image': 45_000,
+    'media': 400_000,
+    'font': 35_000,
+    'stylesheet': 25_000,
+    'script': 40_000,
+    'xhr': 4_000,
+    'fetch': 4_000,
+    'other': 4_000,
+}
+
+# Nominal download speed (bytes/second) used to turn bytes saved into time saved
+NOMINAL_BANDWIDTH = 2_500_000
+
+
+def resource_blocking_enabled() -> bool:
+    """Global kill switch: set SCRAPER_BLOCK_RESOURCES=0 to load every resource"""
+    return os.getenv('SCRAPER_BLOCK_RESOURCES', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+class ResourceProfile:
+    """Per-site rules for aborting unneeded requests via page.route"""
+
+    def __init__(self, name: str, blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+                 blocked_hosts: Iterable[str] = AD_TRACKER_HOSTS, enabled: bool = True):
+        """
+        Initialize a resource profile
+
+        Args:
+            name: Profile name (usually the site name)
+            blocked_types: Playwright resource types to abort (e.g. 'image', 'font')
+            blocked_hosts: Hosts whose requests are always aborted, subdomains included
+            enabled: Set to False to let every request through
+        """
+        self.name = name
+        self.blocked_types = frozenset(blocked_types)
+        self.blocked_hosts = frozenset(h.lower() for h in blocked_hosts)
+        self.enabled = enabled
+        self.requests_seen = 0
+        self.requests_blocked = 0
+        self.bytes_saved = 0
+        self.blocked_by_type: Dict[str, int] = {}
+
+    def _is_blocked_host(self, url: str) -> bool:
+        try:
+            host = (urlparse(url).hostname or '').lower()
+        except ValueError:
+            return False
+        labels = host.split('.')
+        for i in range(len(labels) - 1):
+            if '.'.join(labels[i:]) in self.blocked_hosts:
+                return True
+        return False
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """
+        Decide whether a request should be aborted
+
+        Args:
+            resource_type: Playwright request.resource_type
+            url: Request URL
+
+        Returns:
+            True if the request is not needed for extraction
+        """
+        if url.startswith('data:'):
+            return False
+        return resource_type in self.blocked_types or self._is_blocked_host(url)
+
+    def record_blocked(self, resource_type: str):
+        """Update the savings counters for one aborted request"""
+        self.requests_blocked += 1
+        self.bytes_saved += TYPICAL_BYTES.get(resource_type, TYPICAL_BYTES['other'])
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    @property
+    def time_saved(self) -> float:
+        """Estimated download time saved, in seconds"""
+        return self.bytes_saved / NOMINAL_BANDWIDTH
+
+    def stats(self) -> Dict:
+        """Return the profile counters (byte and time savings are estimates)"""
+        return {
+            'profile': self.name,
+            'enabled': self.enabled,
+            'requests_seen': self.requests_seen,
+            'requests_blocked': self.requests_blocked,
+            'bytes_saved': self.bytes_saved,
+            'time_saved': round(self.time_saved, 3),
+            'blocked_by_type': dict(self.blocked_by_type),
+        }
+
+    def reset_stats(self):
+        self.requests_seen = 0
+        self.requests_blocked = 0
+        self.bytes_saved = 0
+        self.blocked_by_type = {}
+
+    async def _handle_route(self, route):
+        request = route.request
+        self.requests_seen += 1
+        if self.should_block(request.resource_type, request.url):
+            self.record_blocked(request.resource_type)
+            await route.abort('blockedbyclient')
+        else:
+            await route.continue_()
+
+    async def attach(self, page) -> bool:
+        """
+        Install this profile on a page
+
+        Blocked images are never downloaded, but their ``src`` attributes
+        stay in the DOM, so image URLs can still be extracted.
+
+        Args:
+            page: Playwright page
+
+        Returns:
+            True if interception was installed
+        """
+        if not self.enabled or not resource_blocking_enabled():
+            return False
+        await page.route('**/*', self._handle_route)
+        return True
@@ -2,12 +2,17 @@
 from typing import Optional
 from .site_detector import detect_site_from_url, get_all_supported_sites
 from .base_scraper import BaseScraper
+from .registry import GENERIC_SITE, get_registry
 
 
 def create_scraper(url: Optional[str] = None, site_name: Optional[str] = None) -> BaseScraper:
     """
     Create appropriate scraper based on URL or site name
     
+    Dispatch is a registry lookup (see registry.py); the site's module is
+    imported on first use and its instance is shared by later calls, so
+    callers must not mutate the returned scraper.
+    
     Args:
         url: Product listing page URL (used for auto-detection)
         site_name: Explicit site name (overrides URL detection)
@@ -23,45 +28,22 @@ def create_scraper(url: Optional[str] = None, site_name: Optional[str] = None) -
     if site_name:
         detected_site = site_name
     elif url:
-        detected_site = detect_site_from_url(url)
-        if not detected_site:
-            # Use generic scraper for unknown sites
-            detected_site = 'Generic'
+        # Unknown sites use the generic scraper
+        detected_site = detect_site_from_url(url) or GENERIC_SITE
     else:
         raise ValueError("Either 'url' or 'site_name' must be provided")
     
-    # Import and create appropriate scraper
+    registry = get_registry()
+    if registry.spec(detected_site) is None:
+        # Known site without a dedicated scraper (e.g. Walmart)
+        detected_site = GENERIC_SITE
+    
     try:
-        if detected_site == 'Amazon':
-            from .sites.amazon_scraper import AmazonScraper
-            return AmazonScraper()
-        
-        elif detected_site == 'eBay':
-            from .sites.ebay_scraper import eBayScraper
-            return eBayScraper()
-        
-        elif detected_site == 'Alibaba':
-            from .sites.alibaba_scraper import AlibabaScraper
-            return AlibabaScraper()
-        
-        elif detected_site == 'AliExpress':
-            from .sites.aliexpress_scraper import AliExpressScraper
-            return AliExpressScraper()
-        
-        elif detected_site == 'Generic':
-            from .sites.generic_scraper import GenericScraper
-            return GenericScraper()
-        
-        else:
-            # Fallback to generic scraper
-            from .sites.generic_scraper import GenericScraper
-            return GenericScraper()
-            
+        return registry.get(detected_site)
     except ImportError as e:
         # If specific scraper not available, use generic
         try:
-            from .sites.generic_scraper import GenericScraper
-            return GenericScraper()
+            return registry.get(GENERIC_SITE)
         except ImportError:
             raise ImportError(f"Could not import scraper for {detected_site}: {e}")
 
@@ -77,4 +59,3 @@ def get_scraper_for_site(site_name: str) -> BaseScraper:
         BaseScraper instance
     """
     return create_scraper(site_name=site_name)
-
@@ -1,49 +1,148 @@
 """URL parsing and site detection logic"""
-from urllib.parse import urlparse
-from typing import Optional, Dict, List
+import re
+from functools import lru_cache
+from urllib.parse import urlparse, urlsplit
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple
 
+from .sites import BUILTIN_SCRAPERS
 
-# Mapping of domains to site names
+
+# Mapping of domains to site names: sites with a dedicated scraper declare
+# their domains in the scraper manifest (sites/__init__.py); the others are
+# recognised here and scraped by the generic scraper
 DOMAIN_MAPPING = {
-    'amazon.com': 'Amazon',
-    'amazon.co.uk': 'Amazon',
-    'amazon.de': 'Amazon',
-    'amazon.fr': 'Amazon',
-    'amazon.it': 'Amazon',
-    'amazon.es': 'Amazon',
-    'amazon.ca': 'Amazon',
-    'amazon.com.au': 'Amazon',
-    'amazon.in': 'Amazon',
-    'amazon.jp': 'Amazon',
-    'amazon.com.mx': 'Amazon',
-    'amazon.com.br': 'Amazon',
-    
-    'ebay.com': 'eBay',
-    'ebay.co.uk': 'eBay',
-    'ebay.de': 'eBay',
-    'ebay.fr': 'eBay',
-    'ebay.it': 'eBay',
-    'ebay.es': 'eBay',
-    'ebay.ca': 'eBay',
-    'ebay.com.au': 'eBay',
-    
-    'alibaba.com': 'Alibaba',
-    'aliexpress.com': 'AliExpress',
-    'aliexpress.us': 'AliExpress',
-    
+    domain: entry['name'] for entry in BUILTIN_SCRAPERS for domain in entry['domains']
+}
+DOMAIN_MAPPING.update({
     'walmart.com': 'Walmart',
     'target.com': 'Target',
     'bestbuy.com': 'Best Buy',
     'etsy.com': 'Etsy',
     'shopify.com': 'Shopify',
     'shopify.store': 'Shopify',
-}
+})
+
+
+# Multi-label public suffixes under which registrable domains sit; every
+# single-label TLD is a public suffix too (the public suffix list's "*" rule)
+PUBLIC_SUFFIXES = frozenset({
+    'co.uk', 'org.uk', 'me.uk', 'ltd.uk', 'plc.uk', 'ac.uk', 'gov.uk',
+    'com.au', 'net.au', 'org.au', 'co.nz', 'org.nz', 'co.za',
+    'com.br', 'com.mx', 'com.ar', 'com.co', 'com.pe', 'com.tr', 'com.eg', 'com.sa',
+    'co.jp', 'ne.jp', 'or.jp', 'co.kr', 'co.in', 'firm.in', 'net.in',
+    'com.cn', 'com.hk', 'com.tw', 'com.sg', 'com.my', 'com.ph', 'com.vn', 'co.id', 'co.th',
+    'myshopify.com',
+})
+
+# Trie key marking the site name of the domain that ends at a node ('' is never a label)
+_SITE_KEY = ''
+
+# Hosts remembered by detect_site_from_url / classify_urls
+DETECT_CACHE_SIZE = 65536
+
+# Scheme and authority of an absolute URL; cheaper than urlsplit for bulk classification
+_AUTHORITY_RE = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://([^/?#]*)')
+
+
+def _is_public_suffix(domain: str) -> bool:
+    return '.' not in domain or domain in PUBLIC_SUFFIXES
+
+
+def _insert(root: Dict, domain: str, site_name: str):
+    """
+    Add one domain to a reverse-label suffix trie
+    
+    Raises:
+        ValueError: If the domain is itself a public suffix
+    """
+    if _is_public_suffix(domain):
+        raise ValueError(f"'{domain}' is a public suffix, not a site domain")
+    node = root
+    for label in reversed(domain.split('.')):
+        node = node.setdefault(label, {})
+    node[_SITE_KEY] = site_name
+
+
+def _build_index(mapping: Dict[str, str]) -> Dict:
+    """
+    Compile a domain mapping into a reverse-label suffix trie
+    
+    'amazon.co.uk' is stored as uk -> co -> amazon, so a host is matched by
+    walking its labels right to left in O(labels) regardless of how many
+    domains are known, and only at label boundaries.
+    
+    Raises:
+        ValueError: If a mapped domain is itself a public suffix
+    """
+    root: Dict = {}
+    for domain, site_name in mapping.items():
+        _insert(root, domain.lower().strip('.'), site_name)
+    return root
+
+
+_index = _build_index(DOMAIN_MAPPING)
+
+
+def register_domain(domain: str, site_name: str):
+    """
+    Map a domain (and its subdomains) to a site name at runtime
+    
+    The domain is added to the existing trie in O(labels), so registering
+    many sites stays linear; only the host cache is invalidated.
+    
+    Args:
+        domain: Registrable domain, e.g. 'walmart.ca'
+        site_name: Site name returned for matching URLs
+        
+    Raises:
+        ValueError: If the domain is a public suffix
+    """
+    domain = domain.lower().strip('.')
+    if DOMAIN_MAPPING.get(domain) == site_name:
+        return
+    _insert(_index, domain, site_name)
+    DOMAIN_MAPPING[domain] = site_name
+    _detect_host.cache_clear()
+
+
+def _url_host(url: str) -> Optional[str]:
+    """Lowercase host of a URL without port, credentials or trailing dot"""
+    match = _AUTHORITY_RE.match(url.strip())
+    if match is None:
+        return None
+    authority = match.group(1).rpartition('@')[2]
+    if authority.startswith('['):
+        # IPv6 literal; never a known site, but let urlsplit validate it
+        try:
+            host = urlsplit(url).hostname
+        except ValueError:
+            return None
+    else:
+        host = authority.partition(':')[0].lower()
+    return host.rstrip('.') if host else None
+
+
+@lru_cache(maxsize=DETECT_CACHE_SIZE)
+def _detect_host(host: str) -> Optional[str]:
+    """Longest known domain that host equals or is a subdomain of"""
+    node = _index
+    site_name = None
+    for label in reversed(host.split('.')):
+        node = node.get(label)
+        if node is None:
+            break
+        site_name = node.get(_SITE_KEY, site_name)
+    return site_name
 
 
 def detect_site_from_url(url: str) -> Optional[str]:
     """
     Detect e-commerce site from URL
     
+    The host is matched against the compiled domain index, so
+    'smile.amazon.com' is Amazon while 'notamazon.com' and
+    'amazon.com.example.org' are not. Results are memoized per host.
+    
     Args:
         url: Product listing or product page URL
         
@@ -53,35 +152,44 @@ def detect_site_from_url(url: str) -> Optional[str]:
     if not url:
         return None
     
-    try:
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        
-        # Remove 'www.' prefix if present
-        if domain.startswith('www.'):
-            domain = domain[4:]
-        
-        # Check exact match first
-        if domain in DOMAIN_MAPPING:
-            return DOMAIN_MAPPING[domain]
-        
-        # Check if domain contains any of our known domains
-        for known_domain, site_name in DOMAIN_MAPPING.items():
-            if known_domain in domain:
-                return site_name
-        
-        # Check for subdomains (e.g., shop.example.com)
-        parts = domain.split('.')
-        if len(parts) >= 2:
-            # Check domain without first subdomain
-            base_domain = '.'.join(parts[-2:])
-            if base_domain in DOMAIN_MAPPING:
-                return DOMAIN_MAPPING[base_domain]
+    host = _url_host(url)
+    return _detect_host(host) if host else None
+
+
+def classify_urls(urls: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Detect the site of many URLs
+    
+    Args:
+        urls: Any iterable of URLs (consumed lazily, so it may be a huge stream)
         
-    except Exception:
-        pass
+    Yields:
+        (url, site name or None) pairs in input order
+    """
+    detect = _detect_host
+    for url in urls:
+        host = _url_host(url) if url else None
+        yield url, detect(host) if host else None
+
+
+def registrable_domain(host: str) -> Optional[str]:
+    """
+    Registrable domain of a host: its public suffix plus one label
     
-    return None
+    Args:
+        host: Hostname, e.g. 'www.amazon.co.uk'
+        
+    Returns:
+        Registrable domain (e.g. 'amazon.co.uk'), or None if host is itself a public suffix
+    """
+    host = host.lower().strip('.')
+    if _is_public_suffix(host):
+        return None
+    labels = host.split('.')
+    for i in range(1, len(labels)):
+        if '.'.join(labels[i:]) in PUBLIC_SUFFIXES:
+            return '.'.join(labels[i - 1:])
+    return '.'.join(labels[-2:])
 
 
 def get_site_info(url: str) -> Dict[str, Optional[str]]:
@@ -1,2 +1,60 @@
-"""Site-specific scrapers for different e-commerce platforms"""
+"""Site-specific scrapers for different e-commerce platforms
 
+BUILTIN_SCRAPERS is the manifest the scraper registry is built from. It is
+plain data so that site detection and the registry can read it without
+importing any site module; a module is only imported the first time its
+scraper is requested. Adding a site means adding a module here and one
+manifest entry (third-party packages use the "aibot.scrapers" entry point
+group instead, see scraper.registry).
+
+Each entry has:
+    name: Site name returned by site detection and used as the registry key
+    target: "module:Class", relative to the scraper package when it starts with '.'
+    domains: Registrable domains served by the scraper (subdomains match too)
+    capabilities: Any of 'http' (listings work over plain HTTP), 'pagination',
+        'json_payload' (embedded search state is read) and 'detail' (product pages)
+        as BaseScraper.declared_capabilities() reports them for the class; they
+        let the registry answer capability queries before the module is
+        imported, and are replaced by the class's own once it is loaded
+    resource_profile: Name of the scraper's ResourceProfile
+"""
+
+BUILTIN_SCRAPERS = (
+    {
+        'name': 'Amazon',
+        'target': '.sites.amazon_scraper:AmazonScraper',
+        'domains': ('amazon.com', 'amazon.co.uk', 'amazon.de', 'amazon.fr', 'amazon.it', 'amazon.es',
+                    'amazon.ca', 'amazon.com.au', 'amazon.in', 'amazon.jp', 'amazon.com.mx', 'amazon.com.br'),
+        'capabilities': ('http', 'pagination', 'detail'),
+        'resource_profile': 'Amazon',
+    },
+    {
+        'name': 'eBay',
+        'target': '.sites.ebay_scraper:eBayScraper',
+        'domains': ('ebay.com', 'ebay.co.uk', 'ebay.de', 'ebay.fr', 'ebay.it', 'ebay.es', 'ebay.ca',
+                    'ebay.com.au'),
+        'capabilities': ('http', 'pagination', 'detail'),
+        'resource_profile': 'eBay',
+    },
+    {
+        'name': 'Alibaba',
+        'target': '.sites.alibaba_scraper:AlibabaScraper',
+        'domains': ('alibaba.com',),
+        'capabilities': ('json_payload', 'detail'),
+        'resource_profile': 'Alibaba',
+    },
+    {
+        'name': 'AliExpress',
+        'target': '.sites.aliexpress_scraper:AliExpressScraper',
+        'domains': ('aliexpress.com', 'aliexpress.us'),
+        'capabilities': ('http', 'pagination', 'json_payload', 'detail'),
+        'resource_profile': 'AliExpress',
+    },
+    {
+        'name': 'Generic',
+        'target': '.sites.generic_scraper:GenericScraper',
+        'domains': (),
+        'capabilities': ('http',),
+        'resource_profile': 'Generic',
+    },
+)
@@ -1,77 +1,72 @@
 """Alibaba.com product scraper"""
-import asyncio
-import random
-from typing import List, Dict
+from typing import List, Dict, Optional
 from ..base_scraper import BaseScraper
+from ..card_spec import CardSpec, FieldSpec
+from ..resource_profiles import AD_TRACKER_HOSTS, ResourceProfile
 
 
 class AlibabaScraper(BaseScraper):
     """Scraper for Alibaba.com product listings"""
     
+    resource_profile = ResourceProfile(
+        'Alibaba',
+        blocked_hosts=AD_TRACKER_HOSTS + ('mmstat.com', 'arms-retcode.aliyuncs.com'),
+    )
+    
+    card_selectors = [
+        ".organic-gallery-offer-card",
+        ".gallery-offer-card",
+        "[data-content='product']",
+        ".offer-card",
+        ".product-card"
+    ]
+    politeness_delay = (0.3, 1.0)
+    # Wholesale offers are updated rarely
+    cache_ttl = 3600
+    
+    # Offer lists are embedded in the page state as JSON
+    state_globals = ['_init_data_', 'runParams']
+    item_url_template = 'https://www.alibaba.com/product-detail/_{}.html'
+    
+    card_spec = CardSpec({
+        'title': FieldSpec([".element-title-normal_content",
+                            ".element-title, .title, h2, h3, [class*='title']"]),
+        'price': FieldSpec([".element-offer-price-normal_price",
+                            ".price, [class*='price'], [class*='Price']"]),
+        'images': FieldSpec(["img"], attrs=['src'], multiple=True, limit=3),
+        'rating': FieldSpec(["[class*='rating'], [class*='star'], .rating"]),
+        'url': FieldSpec(["a"], attrs=['href']),
+    })
+    require_title = False
+    default_currency = None
+    
+    product_ready_selector = "h1, .product-title, .module-title"
+    detail_spec = CardSpec({
+        'title': FieldSpec(["h1, .product-title, .module-title"]),
+        'price': FieldSpec([".price, .product-price, [class*='price']"]),
+        'description': FieldSpec(["#product-description, .description, .product-description"]),
+        'images': FieldSpec([".main-image img, .detail-gallery img, img"], attrs=['src'],
+                            multiple=True, limit=6),
+        'rating': FieldSpec(["[class*='rating'], [class*='star']"]),
+    })
+    
     def __init__(self):
         super().__init__('Alibaba')
     
-    async def scrape_from_url(self, url: str, max_results: int = 10) -> List[Dict]:
-        """
-        Scrape products from Alibaba.com
-        
-        Args:
-            url: Alibaba product listing page URL
-            max_results: Maximum number of products to extract
-            
-        Returns:
-            List of product dictionaries
-        """
-        from playwright.async_api import async_playwright
-        
-        async with async_playwright() as p:
-            browser, context = await self._create_browser_context(p)
-            page = await context.new_page()
-            await self._set_headers(page)
-            
-            # Navigate to URL
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            await asyncio.sleep(random.uniform(2, 4))
-            
-            # Wait for content to load
-            items = []
-            selectors = [
-                ".organic-gallery-offer-card",
-                ".gallery-offer-card",
-                "[data-content='product']",
-                ".offer-card",
-                ".product-card"
-            ]
-            
-            # Try to find products
-            for selector in selectors:
-                try:
-                    await page.wait_for_selector(selector, timeout=5000)
-                    items = await page.locator(selector).all()
-                    if len(items) > 0:
-                        break
-                except:
-                    continue
-            
-            if len(items) == 0:
-                await page.wait_for_timeout(3000)
-                for selector in selectors:
-                    items = await page.locator(selector).all()
-                    if len(items) > 0:
-                        break
-            
-            products = []
-            for item in items[:max_results]:
-                try:
-                    product = await self._extract_product(item, url)
-                    if product:
-                        products.append(product)
-                except Exception:
-                    continue
-            
-            await context.close()
-            await browser.close()
-            return products
+    def _is_search_page(self, url: str) -> bool:
+        return '/product-detail/' not in url
+    
+    async def _scrape_search_results(self, page, max_results: int, base_url: str) -> List[Dict]:
+        """Scrape products from an Alibaba listing page"""
+        selector, _ = await self._wait_for_cards(page, max_results)
+        return await self._extract_cards(page, selector, max_results, base_url, self._extract_product)
+    
+    async def _scrape_product_page(self, page, url: str) -> Optional[Dict]:
+        """Scrape a single Alibaba product-detail page in one round trip"""
+        rows = await self.detail_spec.extract(page, 'body', 1)
+        if not rows:
+            return None
+        return self._build_product(dict(rows[0], url=url), url)
     
     async def _extract_product(self, item, base_url: str) -> Dict:
         """Extract product information from a single item element"""
@@ -83,7 +78,7 @@ class AlibabaScraper(BaseScraper):
             'rating': None,
             'review_count': None,
             'availability': '',
-            'url': base_url,
+            'url': '',  # Set below from the card's link; never the listing URL
             'source': 'Alibaba',
             'currency': None
         }
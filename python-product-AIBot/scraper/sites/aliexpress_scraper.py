@@ -1,90 +1,53 @@
 """AliExpress.com product scraper"""
-import asyncio
-import random
 from typing import List, Dict
 from ..base_scraper import BaseScraper
+from ..card_spec import CardSpec, FieldSpec
+from ..resource_profiles import AD_TRACKER_HOSTS, ResourceProfile
 
 
 class AliExpressScraper(BaseScraper):
     """Scraper for AliExpress.com product listings"""
     
+    resource_profile = ResourceProfile(
+        'AliExpress',
+        blocked_hosts=AD_TRACKER_HOSTS + ('mmstat.com', 'arms-retcode.aliyuncs.com'),
+    )
+    
+    card_selectors = [
+        ".list--gallery--C2f2tvm",
+        "[data-product-id]",
+        ".gallery-offer-card",
+        ".list-item"
+    ]
+    product_ready_selector = "h1"
+    page_param = "page"
+    results_per_page = 60
+    politeness_delay = (0.3, 1.0)
+    cache_ttl = 1800
+    
+    # Search results ship as inline JSON, so the DOM is only a fallback
+    state_globals = ['runParams', '_init_data_']
+    item_url_template = 'https://www.aliexpress.com/item/{}.html'
+    http_tier_ok = True
+    
+    card_spec = CardSpec({
+        'title': FieldSpec(["h3, [class*='title']", "a, h3 a"]),
+        'url': FieldSpec(["a, h3 a"], attrs=['href']),
+        'price': FieldSpec([".price, .price-current, [class*='price']"]),
+        'images': FieldSpec(["img"], attrs=['src'], multiple=True, limit=1),
+        'rating': FieldSpec(["[class*='rating'], [class*='star']"]),
+    })
+    
     def __init__(self):
         super().__init__('AliExpress')
     
-    async def scrape_from_url(self, url: str, max_results: int = 10) -> List[Dict]:
-        """
-        Scrape products from AliExpress.com
-        
-        Args:
-            url: AliExpress product listing or search results page URL
-            max_results: Maximum number of products to extract
-            
-        Returns:
-            List of product dictionaries
-        """
-        from playwright.async_api import async_playwright
-        
-        async with async_playwright() as p:
-            browser, context = await self._create_browser_context(p)
-            page = await context.new_page()
-            await self._set_headers(page)
-            
-            # Navigate to URL
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            await asyncio.sleep(random.uniform(2, 4))
-            
-            # Determine if this is a search results page or product page
-            is_search_page = '/wholesale' in url or '/search' in url or 'SearchText=' in url
-            
-            if is_search_page:
-                products = await self._scrape_search_results(page, max_results, url)
-            else:
-                # Single product page
-                product = await self._scrape_product_page(page, url)
-                products = [product] if product else []
-            
-            await context.close()
-            await browser.close()
-            return products
+    def _is_search_page(self, url: str) -> bool:
+        return '/wholesale' in url or '/search' in url or 'SearchText=' in url
     
     async def _scrape_search_results(self, page, max_results: int, base_url: str) -> List[Dict]:
         """Scrape products from AliExpress search results"""
-        products = []
-        
-        # AliExpress search results selectors
-        selectors = [
-            ".list--gallery--C2f2tvm",
-            "[data-product-id]",
-            ".gallery-offer-card",
-            ".list-item"
-        ]
-        
-        items = []
-        for selector in selectors:
-            try:
-                await page.wait_for_selector(selector, timeout=5000)
-                items = await page.locator(selector).all()
-                if len(items) > 0:
-                    break
-            except:
-                continue
-        
-        if len(items) == 0:
-            await page.wait_for_timeout(3000)
-            for selector in selectors:
-                items = await page.locator(selector).all()
-                if len(items) > 0:
-                    break
-        
-        for item in items[:max_results]:
-            try:
-                product = await self._extract_search_result_item(item, base_url)
-                if product:
-                    products.append(product)
-            except Exception:
-                continue
-        
-        return products
+        selector, _ = await self._wait_for_cards(page, max_results)
+        return await self._extract_cards(page, selector, max_results, base_url, self._extract_search_result_item)
     
     async def _scrape_product_page(self, page, url: str) -> Dict:
         """Scrape single AliExpress product page"""
@@ -165,7 +128,7 @@ class AliExpressScraper(BaseScraper):
             'rating': None,
             'review_count': None,
             'availability': '',
-            'url': base_url,
+            'url': '',  # Set below from the card's link; never the listing URL
             'source': 'AliExpress',
             'currency': 'USD'
         }
@@ -1,105 +1,51 @@
 """Amazon.com product scraper"""
-import asyncio
-import random
 from typing import List, Dict
 from ..base_scraper import BaseScraper
+from ..card_spec import CardSpec, FieldSpec
+from ..resource_profiles import AD_TRACKER_HOSTS, ResourceProfile
 
 
 class AmazonScraper(BaseScraper):
     """Scraper for Amazon.com product listings"""
     
+    resource_profile = ResourceProfile(
+        'Amazon',
+        blocked_hosts=AD_TRACKER_HOSTS + ('fls-na.amazon.com', 'unagi.amazon.com'),
+    )
+    
+    card_selectors = [
+        "[data-component-type='s-search-result']",
+        ".s-result-item",
+        "[data-asin]",
+        ".s-card-container"
+    ]
+    product_ready_selector = "#productTitle, h1.a-size-large"
+    next_page_selector = "a.s-pagination-next"
+    page_param = "page"
+    # Prices and sponsored slots move quickly
+    cache_ttl = 900
+    
+    card_spec = CardSpec({
+        'title': FieldSpec(["h2 a, .s-title-instructions-style a", "h2"]),
+        'url': FieldSpec(["h2 a, .s-title-instructions-style a", "a.a-link-normal"], attrs=['href']),
+        'price': FieldSpec([".a-price .a-offscreen, .a-price-whole"], attrs=['textContent']),
+        'images': FieldSpec(["img"], attrs=['src'], multiple=True, limit=1),
+        'rating': FieldSpec([".a-icon-alt"], attrs=['textContent']),
+        'review_count': FieldSpec(["a .a-size-base"]),
+    })
+    
+    http_tier_ok = True
+    
     def __init__(self):
         super().__init__('Amazon')
     
-    async def scrape_from_url(self, url: str, max_results: int = 10) -> List[Dict]:
-        """
-        Scrape products from Amazon.com
-        
-        Args:
-            url: Amazon product listing or search results page URL
-            max_results: Maximum number of products to extract
-            
-        Returns:
-            List of product dictionaries
-        """
-        from playwright.async_api import async_playwright
-        
-        async with async_playwright() as p:
-            browser, context = await self._create_browser_context(p)
-            page = await context.new_page()
-            await self._set_headers(page)
-            
-            # Navigate to URL
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            await asyncio.sleep(random.uniform(3, 6))
-            
-            # Check for CAPTCHA
-            page_title = await page.title()
-            if "captcha" in page_title.lower() or "robot" in page_title.lower():
-                await context.close()
-                await browser.close()
-                return []
-            
-            # Determine if this is a search results page or product page
-            is_search_page = 's?' in url or '/s?' in url or '/s/' in url
-            
-            if is_search_page:
-                products = await self._scrape_search_results(page, max_results, url)
-            else:
-                # Single product page
-                product = await self._scrape_product_page(page, url)
-                products = [product] if product else []
-            
-            await context.close()
-            await browser.close()
-            return products
+    def _is_search_page(self, url: str) -> bool:
+        return 's?' in url or '/s?' in url or '/s/' in url
     
     async def _scrape_search_results(self, page, max_results: int, base_url: str) -> List[Dict]:
         """Scrape products from Amazon search results page"""
-        products = []
-        
-        # Amazon search results selectors
-        selectors = [
-            "[data-component-type='s-search-result']",
-            ".s-result-item",
-            "[data-asin]",
-            ".s-card-container"
-        ]
-        
-        items = []
-        # Try waiting for selectors with longer timeout
-        for selector in selectors:
-            try:
-                await page.wait_for_selector(selector, timeout=10000, state='visible')
-                items = await page.locator(selector).all()
-                if len(items) > 0:
-                    break
-            except:
-                continue
-        
-        # If still no items, wait longer and try again
-        if len(items) == 0:
-            await page.wait_for_timeout(5000)
-            # Scroll down to trigger lazy loading
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
-            await asyncio.sleep(2)
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(2)
-            
-            for selector in selectors:
-                items = await page.locator(selector).all()
-                if len(items) > 0:
-                    break
-        
-        for item in items[:max_results]:
-            try:
-                product = await self._extract_search_result_item(item, base_url)
-                if product:
-                    products.append(product)
-            except Exception:
-                continue
-        
-        return products
+        selector, _ = await self._wait_for_cards(page, max_results)
+        return await self._extract_cards(page, selector, max_results, base_url, self._extract_search_result_item)
     
     async def _scrape_product_page(self, page, url: str) -> Dict:
         """Scrape single product page"""
@@ -196,7 +142,7 @@ class AmazonScraper(BaseScraper):
             'rating': None,
             'review_count': None,
             'availability': '',
-            'url': base_url,
+            'url': '',  # Set below from the card's link; never the listing URL
             'source': 'Amazon',
             'currency': 'USD'
         }
@@ -1,102 +1,46 @@
 """eBay.com product scraper"""
-import asyncio
-import random
 from typing import List, Dict
 from ..base_scraper import BaseScraper
+from ..card_spec import CardSpec, FieldSpec
+from ..resource_profiles import ResourceProfile
 
 
 class eBayScraper(BaseScraper):
     """Scraper for eBay.com product listings"""
     
+    resource_profile = ResourceProfile('eBay')
+    
+    card_selectors = [
+        ".s-item",
+        "[data-view]",
+        ".srp-results .s-item"
+    ]
+    product_ready_selector = "#x-item-title-label, h1.it-ttl, h1"
+    next_page_selector = "a.pagination__next"
+    page_param = "_pgn"
+    results_per_page = 60
+    # Auction listings change by the minute
+    cache_ttl = 600
+    
+    card_spec = CardSpec({
+        'title': FieldSpec(["h3 a, .s-item__title a", ".s-item__title"]),
+        'url': FieldSpec(["h3 a, .s-item__title a", "a.s-item__link"], attrs=['href']),
+        'price': FieldSpec([".s-item__price, .s-item__detail--primary"]),
+        'images': FieldSpec(["img"], attrs=['src', 'data-src'], multiple=True, limit=1),
+    })
+    
+    http_tier_ok = True
+    
     def __init__(self):
         super().__init__('eBay')
     
-    async def scrape_from_url(self, url: str, max_results: int = 10) -> List[Dict]:
-        """
-        Scrape products from eBay.com
-        
-        Args:
-            url: eBay search results or product listing page URL
-            max_results: Maximum number of products to extract
-            
-        Returns:
-            List of product dictionaries
-        """
-        from playwright.async_api import async_playwright
-        
-        async with async_playwright() as p:
-            browser, context = await self._create_browser_context(p)
-            page = await context.new_page()
-            await self._set_headers(page)
-            
-            # Navigate to URL
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            await asyncio.sleep(random.uniform(3, 6))
-            
-            # Check for CAPTCHA
-            page_title = await page.title()
-            if "captcha" in page_title.lower() or "robot" in page_title.lower():
-                await context.close()
-                await browser.close()
-                return []
-            
-            # Determine if this is a search results page or product page
-            is_search_page = '/sch/' in url or '/b/' in url or 'nkw=' in url
-            
-            if is_search_page:
-                products = await self._scrape_search_results(page, max_results, url)
-            else:
-                # Single product page
-                product = await self._scrape_product_page(page, url)
-                products = [product] if product else []
-            
-            await context.close()
-            await browser.close()
-            return products
+    def _is_search_page(self, url: str) -> bool:
+        return '/sch/' in url or '/b/' in url or 'nkw=' in url
     
     async def _scrape_search_results(self, page, max_results: int, base_url: str) -> List[Dict]:
         """Scrape products from eBay search results"""
-        products = []
-        
-        # eBay search results selectors
-        selectors = [
-            ".s-item",
-            "[data-view]",
-            ".srp-results .s-item"
-        ]
-        
-        items = []
-        for selector in selectors:
-            try:
-                await page.wait_for_selector(selector, timeout=10000, state='visible')
-                items = await page.locator(selector).all()
-                if len(items) > 0:
-                    break
-            except:
-                continue
-        
-        if len(items) == 0:
-            await page.wait_for_timeout(5000)
-            # Scroll to trigger lazy loading
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
-            await asyncio.sleep(2)
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(2)
-            
-            for selector in selectors:
-                items = await page.locator(selector).all()
-                if len(items) > 0:
-                    break
-        
-        for item in items[:max_results]:
-            try:
-                product = await self._extract_search_result_item(item, base_url)
-                if product:
-                    products.append(product)
-            except Exception:
-                continue
-        
-        return products
+        selector, _ = await self._wait_for_cards(page, max_results)
+        return await self._extract_cards(page, selector, max_results, base_url, self._extract_search_result_item)
     
     async def _scrape_product_page(self, page, url: str) -> Dict:
         """Scrape single eBay product page"""
@@ -177,7 +121,7 @@ class eBayScraper(BaseScraper):
             'rating': None,
             'review_count': None,
             'availability': '',
-            'url': base_url,
+            'url': '',  # Set below from the card's link; never the listing URL
             'source': 'eBay',
             'currency': 'USD'
         }
@@ -1,151 +1,148 @@
 """Generic scraper for unknown e-commerce sites"""
-import asyncio
-import random
 from typing import List, Dict
 from ..base_scraper import BaseScraper
+from ..card_spec import CardSpec, FieldSpec
+from ..resource_profiles import ResourceProfile
 
 
 class GenericScraper(BaseScraper):
     """Generic scraper for unknown or unsupported e-commerce sites"""
     
+    resource_profile = ResourceProfile('Generic')
+    
+    # Common product card selectors, tried in order
+    card_selectors = [
+        "[data-product-id]",
+        "[data-product]",
+        ".product",
+        ".product-item",
+        ".product-card",
+        ".item",
+        "[class*='product']",
+        "[class*='item']",
+        "[class*='card']",
+        "article",
+        ".goods",
+        ".commodity",
+        ".listing",
+        "li",  # List items might contain products
+        "tr",  # Table rows might contain products
+        "div[class*='list']",  # List containers
+        "div[class*='grid']",  # Grid containers
+    ]
+    # Loose selectors can match navigation before products render
+    readiness_require_stable = True
+    
+    card_spec = CardSpec({
+        'title': FieldSpec([
+            "h1", "h2", "h3", "h4",
+            ".title", ".product-title", ".item-title",
+            "[class*='title']", "[class*='name']",
+            "a",  # If item is a link, use link text
+            "span[class*='title']", "div[class*='title']",
+            "",  # The item itself (e.g. a bare product link)
+        ]),
+        'price': FieldSpec([
+            ".price", ".product-price", ".item-price",
+            "[class*='price']", "[class*='cost']", "[class*='amount']"
+        ]),
+        'images': FieldSpec(["img"], attrs=['src', 'data-src'], multiple=True, limit=3),
+        'url': FieldSpec(["", "a"], attrs=['href']),
+    })
+    require_title = False
+    default_currency = None
+    
+    http_tier_ok = True
+    
     def __init__(self):
         super().__init__('Generic')
     
-    async def scrape_from_url(self, url: str, max_results: int = 10) -> List[Dict]:
-        """
-        Generic scraper that tries to extract products using common selectors
+    def _source(self, base_url: str) -> str:
+        """Try to detect source from URL"""
+        from ..site_detector import detect_site_from_url
+        return detect_site_from_url(base_url) or self.site_name
+    
+    def _pick_card_selector(self, selectors, counts):
+        """Only use a selector that found a reasonable number (not too many, not too few)"""
+        for selector, count in zip(selectors, counts):
+            if 1 <= count <= 100:
+                return selector, count
+        return None, 0
+    
+    async def _scrape_search_results(self, page, max_results: int, base_url: str) -> List[Dict]:
+        """Extract products using common selectors, falling back to product-like links"""
+        selector, _ = await self._wait_for_cards(page, max_results)
+        if selector:
+            products = await self._extract_cards(page, selector, max_results, base_url, self._extract_product)
+            if products:
+                return products
         
-        Args:
-            url: Product listing page URL
-            max_results: Maximum number of products to extract
-            
-        Returns:
-            List of product dictionaries
-        """
-        from playwright.async_api import async_playwright
+        # If no cards found, try looking for links that might be products
+        items = []
+        # Try to find product links
+        try:
+            # Look for links with product-related keywords
+            product_links = await page.locator("a[href*='product'], a[href*='item'], a[href*='detail'], a[href*='goods'], a[href*='Product']").all()
+            if len(product_links) > 0:
+                # Use these links directly as items
+                items = product_links[:max_results * 2]
+        except:
+            pass
         
-        async with async_playwright() as p:
-            browser, context = await self._create_browser_context(p)
-            page = await context.new_page()
-            await self._set_headers(page)
-            
-            # Navigate to URL
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            await asyncio.sleep(random.uniform(3, 6))
-            
-            # Check for CAPTCHA
-            page_title = await page.title()
-            if "captcha" in page_title.lower() or "robot" in page_title.lower():
-                await context.close()
-                await browser.close()
-                return []
-            
-            # Try common product selectors
-            selectors = [
-                "[data-product-id]",
-                "[data-product]",
-                ".product",
-                ".product-item",
-                ".product-card",
-                ".item",
-                "[class*='product']",
-                "[class*='item']",
-                "[class*='card']",
-                "article",
-                ".goods",
-                ".commodity",
-                ".listing",
-                "li",  # List items might contain products
-                "tr",  # Table rows might contain products
-                "div[class*='list']",  # List containers
-                "div[class*='grid']",  # Grid containers
-            ]
-            
-            items = []
-            for selector in selectors:
-                try:
-                    await page.wait_for_selector(selector, timeout=3000)
-                    found_items = await page.locator(selector).all()
-                    # Only use if we found a reasonable number (not too many, not too few)
-                    if 1 <= len(found_items) <= 100:
-                        items = found_items
-                        break
-                except:
-                    continue
-            
-            # If no items found, try looking for links that might be products
-            if len(items) == 0:
-                # Scroll to trigger any lazy loading
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2)")
-                await asyncio.sleep(2)
-                await page.wait_for_timeout(3000)
-                
-                # Try to find product links
-                try:
-                    # Look for links with product-related keywords
-                    product_links = await page.locator("a[href*='product'], a[href*='item'], a[href*='detail'], a[href*='goods'], a[href*='Product']").all()
-                    if len(product_links) > 0:
-                        # Use these links directly as items
-                        items = product_links[:max_results * 2]
-                except:
-                    pass
-                
-                # Last resort: try all links that have text and images
-                if len(items) == 0:
+        # Last resort: try all links that have text and images
+        if len(items) == 0:
+            try:
+                all_links = await page.locator("a").all()
+                potential_items = []
+                for link in all_links[:100]:  # Check first 100 links
                     try:
-                        all_links = await page.locator("a").all()
-                        potential_items = []
-                        for link in all_links[:100]:  # Check first 100 links
-                            try:
-                                text = await link.inner_text()
-                                has_img = await link.locator("img").count() > 0
-                                href = await link.get_attribute("href")
-                                # If link has text, image, and valid href, it might be a product
-                                # Or if link text is substantial (likely product name)
-                                if href and text and len(text.strip()) > 3:
-                                    # Prefer links with images, but also accept text-only if substantial
-                                    if has_img or len(text.strip()) > 10:
-                                        potential_items.append(link)
-                            except:
-                                continue
-                        if len(potential_items) > 0:
-                            items = potential_items[:max_results]
+                        text = await link.inner_text()
+                        has_img = await link.locator("img").count() > 0
+                        href = await link.get_attribute("href")
+                        # If link has text, image, and valid href, it might be a product
+                        # Or if link text is substantial (likely product name)
+                        if href and text and len(text.strip()) > 3:
+                            # Prefer links with images, but also accept text-only if substantial
+                            if has_img or len(text.strip()) > 10:
+                                potential_items.append(link)
                     except:
-                        pass
-                
-                # Final fallback: extract any substantial links as potential products
-                if len(items) == 0:
+                        continue
+                if len(potential_items) > 0:
+                    items = potential_items[:max_results]
+            except:
+                pass
+        
+        # Final fallback: extract any substantial links as potential products
+        if len(items) == 0:
+            try:
+                # Get all links and filter for substantial ones
+                all_links = await page.locator("a[href]").all()
+                for link in all_links[:max_results * 2]:
                     try:
-                        # Get all links and filter for substantial ones
-                        all_links = await page.locator("a[href]").all()
-                        for link in all_links[:max_results * 2]:
-                            try:
-                                text = await link.inner_text()
-                                href = await link.get_attribute("href")
-                                # Skip navigation, footer, header links
-                                if (href and text and len(text.strip()) > 5 and 
-                                    not any(skip in href.lower() for skip in ['#', 'javascript:', 'mailto:', 'tel:']) and
-                                    not any(skip in text.lower() for skip in ['home', 'about', 'contact', 'login', 'register', 'cart', 'search'])):
-                                    items.append(link)
-                                    if len(items) >= max_results:
-                                        break
-                            except:
-                                continue
+                        text = await link.inner_text()
+                        href = await link.get_attribute("href")
+                        # Skip navigation, footer, header links
+                        if (href and text and len(text.strip()) > 5 and 
+                            not any(skip in href.lower() for skip in ['#', 'javascript:', 'mailto:', 'tel:']) and
+                            not any(skip in text.lower() for skip in ['home', 'about', 'contact', 'login', 'register', 'cart', 'search'])):
+                            items.append(link)
+                            if len(items) >= max_results:
+                                break
                     except:
-                        pass
-            
-            products = []
-            for item in items[:max_results]:
-                try:
-                    product = await self._extract_product(item, url)
-                    if product:
-                        products.append(product)
-                except Exception:
-                    continue
-            
-            await context.close()
-            await browser.close()
-            return products
+                        continue
+            except:
+                pass
+        
+        products = []
+        for item in items[:max_results]:
+            try:
+                product = await self._extract_product(item, base_url)
+                if product:
+                    products.append(product)
+            except Exception:
+                continue
+        
+        return products
     
     async def _extract_product(self, item, base_url: str) -> Dict:
         """Extract product using generic selectors"""
@@ -157,7 +154,7 @@ class GenericScraper(BaseScraper):
             'rating': None,
             'review_count': None,
             'availability': '',
-            'url': base_url,
+            'url': '',  # Set below from the card's link; never the listing URL
             'source': 'Generic',
             'currency': None
         }
@@ -0,0 +1,237 @@
+"""Per-job product sink for streaming products out of a running scrape"""
+import asyncio
+import queue
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+# Held in a ContextVar rather than on the scraper so one scraper instance
+# can serve concurrent jobs, each with its own sink
+_product_sink: ContextVar[Optional[Callable[[Dict], None]]] = ContextVar('product_sink', default=None)
+
+
+@contextmanager
+def product_sink(callback: Callable[[Dict], None]):
+    """
+    Route products emitted by scrapes in the current context to a callback
+
+    Args:
+        callback: Called once per product as soon as it is collected
+    """
+    token = _product_sink.set(callback)
+    try:
+        yield
+    finally:
+        _product_sink.reset(token)
+
+
+def emit_product(product: Dict):
+    """Hand a freshly collected product to the current job's sink, if any"""
+    sink = _product_sink.get()
+    if sink is not None:
+        sink(product)
+
+
+async def wait_for_sink():
+    """Pause the producer while the current sink is over its backlog limit
+
+    Sinks that expose an async ``drain()`` (see write_behind.WriteBehindSink)
+    apply backpressure this way; plain callbacks never block.
+    """
+    drain = getattr(_product_sink.get(), 'drain', None)
+    if drain is not None:
+        await drain()
+
+
+class _QueueSink:
+    """Sink feeding stream_products; also forwards to the sink it shadows"""
+
+    def __init__(self, max_buffered: int, outer: Optional[Callable[[Dict], None]]):
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.streamed = set()
+        self.max_buffered = max_buffered
+        self.outer = outer
+        self._taken = asyncio.Event()
+
+    def __call__(self, product: Dict):
+        self.streamed.add(id(product))
+        self.queue.put_nowait(product)
+        if self.outer is not None:
+            self.outer(product)
+
+    async def drain(self):
+        # A slow consumer pauses the scrape instead of letting products pile up
+        while self.queue.qsize() >= self.max_buffered:
+            self._taken.clear()
+            await self._taken.wait()
+        drain = getattr(self.outer, 'drain', None)
+        if drain is not None:
+            await drain()
+
+    def taken(self):
+        self._taken.set()
+
+
+async def stream_products(scrape: Awaitable[List[Dict]], max_buffered: int = 200) -> AsyncIterator[Dict]:
+    """
+    Run a scrape and yield its products as they are emitted
+
+    Products the scrape returns without emitting them are yielded at the
+    end. Leaving the loop early (break, aclose, cancellation) cancels the
+    scrape, which closes its browser context.
+
+    Args:
+        scrape: Coroutine returning the scrape's product list
+        max_buffered: Unconsumed products at which the scrape is paused
+
+    Yields:
+        Product dictionaries in extraction order
+    """
+    sink = _QueueSink(max(1, max_buffered), _product_sink.get())
+    with product_sink(sink):
+        # The task copies the current context, so the sink stays installed for it
+        task = asyncio.ensure_future(scrape)
+    try:
+        while True:
+            getter = asyncio.ensure_future(sink.queue.get())
+            done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                break
+            sink.taken()
+            yield getter.result()
+        while not sink.queue.empty():
+            yield sink.queue.get_nowait()
+        for product in task.result():
+            if id(product) not in sink.streamed:
+                yield product
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+_DONE = object()
+
+
+def iterate_sync(make_stream: Callable[[], AsyncIterator[Dict]],
+                 cleanup: Optional[Callable[[], Awaitable[None]]] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None) -> Iterator[Dict]:
+    """
+    Consume an async product stream from synchronous code
+
+    The stream runs on a private event loop in a background thread, so this
+    works from Streamlit or any caller that already owns a loop. Stopping
+    iteration early cancels the stream.
+
+    Args:
+        make_stream: Called on the background loop to create the async iterator
+        cleanup: Optional coroutine function run on that loop before it closes
+        loop: Run the stream on this already running loop (owned by another
+            thread) instead of a private one; cleanup is then not run
+
+    Yields:
+        Products as the stream produces them
+
+    Raises:
+        Whatever the stream raised, after the products before the error
+    """
+    if loop is not None:
+        yield from _iterate_on_loop(make_stream, loop)
+        return
+
+    items: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    state: Dict = {}
+
+    async def pump():
+        async for product in make_stream():
+            items.put(product)
+            if stop.is_set():
+                break
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            state['loop'] = loop
+            state['task'] = loop.create_task(pump())
+            if stop.is_set():
+                state['task'].cancel()
+            loop.run_until_complete(state['task'])
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            state['error'] = e
+        finally:
+            try:
+                if cleanup is not None:
+                    loop.run_until_complete(cleanup())
+            finally:
+                loop.close()
+                items.put(_DONE)
+
+    thread = threading.Thread(target=run, name='product-stream', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                break
+            yield item
+        if 'error' in state:
+            raise state['error']
+    finally:
+        if thread.is_alive():
+            stop.set()
+            task, loop = state.get('task'), state.get('loop')
+            if task is not None:
+                try:
+                    loop.call_soon_threadsafe(task.cancel)
+                except RuntimeError:
+                    pass
+            thread.join()
+
+
+def _iterate_on_loop(make_stream: Callable[[], AsyncIterator[Dict]],
+                     loop: asyncio.AbstractEventLoop) -> Iterator[Dict]:
+    """iterate_sync over a loop that keeps running after the stream ends"""
+    items: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    state: Dict = {}
+
+    async def pump():
+        state['started'] = True
+        try:
+            async for product in make_stream():
+                items.put(product)
+                if stop.is_set():
+                    break
+        except Exception as e:
+            state['error'] = e
+        finally:
+            items.put(_DONE)
+
+    future = asyncio.run_coroutine_threadsafe(pump(), loop)
+    finished = False
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                finished = True
+                break
+            yield item
+        if 'error' in state:
+            raise state['error']
+    finally:
+        if not finished:
+            stop.set()
+            future.cancel()
+            # A task cancelled before its first step never reaches pump's finally
+            if state.get('started'):
+                while items.get() is not _DONE:
+                    pass
@@ -0,0 +1,395 @@
+"""Extract products from embedded page state (JSON-LD, window.runParams, _init_data_)"""
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    # orjson is optional; the stdlib parser is slower but equivalent
+    _loads = json.loads
+
+
+# Collects JSON-LD blocks and serialized state globals in one round trip.
+# Globals are stringified in the page so Python can parse them with orjson
+# instead of paying for Playwright's per-value serialization.
+COLLECT_PAYLOADS_JS = """
+(globals) => {
+    const out = {jsonld: [], state: [], inline: []};
+    for (const s of document.querySelectorAll('script[type="application/ld+json"]')) {
+        if (s.textContent) out.jsonld.push(s.textContent);
+    }
+    const missing = [];
+    for (const name of globals) {
+        try {
+            const value = window[name];
+            if (value && typeof value === 'object') out.state.push(JSON.stringify(value));
+            else missing.push(name);
+        } catch (e) {
+            missing.push(name);
+        }
+    }
+    if (missing.length) {
+        for (const s of document.querySelectorAll('script:not([src])')) {
+            const text = s.textContent || '';
+            if (missing.some((name) => text.includes(name))) out.inline.push(text);
+        }
+    }
+    return out;
+}
+"""
+
+_JSONLD_RE = re.compile(
+    r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Keys that hold each product field in the embedded payloads we know about
+_TITLE_KEYS = ('displayTitle', 'title', 'subject', 'productTitle', 'name')
+_PRICE_KEYS = ('formattedPrice', 'salePrice', 'price', 'minPrice', 'priceInfo',
+               'prices', 'promotionPrice', 'originalPrice', 'value')
+_URL_KEYS = ('productDetailUrl', 'detailUrl', 'itemUrl', 'productUrl', 'url', 'href')
+_IMAGE_KEYS = ('imageUrl', 'imgUrl', 'mainImage', 'image', 'images', 'imageList', 'imagePath')
+_RATING_KEYS = ('starRating', 'averageStar', 'averageStarRate', 'ratingValue', 'rating', 'evaluation')
+_REVIEW_KEYS = ('reviewCount', 'totalReviews', 'ratingCount', 'evaluationCount', 'reviews')
+_CURRENCY_KEYS = ('currencyCode', 'priceCurrency', 'currency')
+_ID_KEYS = ('productId', 'itemId', 'offerId', 'id')
+
+_MAX_DEPTH = 14
+
+
+def loads(text):
+    """Parse JSON text (str or bytes) with the fastest available parser"""
+    return _loads(text)
+
+
+def _slice_object(text: str, start: int) -> Optional[str]:
+    """Return the balanced {...} literal starting at text[start], or None"""
+    if start >= len(text) or text[start] != '{':
+        return None
+    depth, in_string, escaped = 0, None, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == in_string:
+                in_string = None
+        elif ch in ('"', "'"):
+            in_string = ch
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _parse_assigned_object(text: str, start: int):
+    """
+    Parse the object literal assigned at text[start]
+
+    ``_init_data_ = { data: {...} }`` wraps JSON in a JS literal with bare
+    keys, so when the outer literal is not valid JSON the first nested
+    object is tried instead.
+    """
+    literal = _slice_object(text, start)
+    if literal is None:
+        return None
+    try:
+        return loads(literal)
+    except ValueError:
+        inner = literal.find('{', 1)
+        if inner < 0:
+            return None
+        nested = _slice_object(literal, inner)
+        if nested is None:
+            return None
+        try:
+            return loads(nested)
+        except ValueError:
+            return None
+
+
+def find_state_objects(text: str, names: Sequence[str]) -> List:
+    """
+    Find objects assigned to the given globals in HTML or script text
+
+    Args:
+        text: HTML page or inline script source
+        names: Global names, e.g. ['runParams', '_init_data_']
+
+    Returns:
+        Parsed objects, in document order (empty or broken ones are skipped)
+    """
+    if not names:
+        return []
+    pattern = re.compile(r'(?:window\.)?(?:%s)\s*=\s*' % '|'.join(re.escape(n) for n in names))
+    objects = []
+    for match in pattern.finditer(text):
+        value = _parse_assigned_object(text, match.end())
+        if value:
+            objects.append(value)
+    return objects
+
+
+def find_jsonld_blocks(html: str) -> List:
+    """Parse every JSON-LD block in an HTML document"""
+    blocks = []
+    for match in _JSONLD_RE.finditer(html):
+        try:
+            blocks.append(loads(match.group(1).strip()))
+        except ValueError:
+            continue
+    return blocks
+
+
+def _scalar(value, keys: Sequence[str] = (), depth: int = 0):
+    """Unwrap nested {key: value} wrappers (e.g. {'displayTitle': ...}) to a scalar"""
+    if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, dict) and depth < 3:
+        for key in keys:
+            if key in value:
+                found = _scalar(value[key], keys, depth + 1)
+                if found not in (None, ''):
+                    return found
+    return None
+
+
+def _first(item: Dict, keys: Sequence[str], nested_keys: Sequence[str] = ()):
+    for key in keys:
+        if key in item:
+            value = _scalar(item[key], nested_keys or keys)
+            if value not in (None, ''):
+                return value
+    return None
+
+
+def _images(item: Dict, limit: int = 3) -> List[str]:
+    images = []
+    for key in _IMAGE_KEYS:
+        value = item.get(key)
+        if not value:
+            continue
+        values = value if isinstance(value, list) else [value]
+        for entry in values:
+            url = _scalar(entry, ('imgUrl', 'imageUrl', 'url', 'contentUrl', 'src'))
+            if isinstance(url, str) and url:
+                images.append('https:' + url if url.startswith('//') else url)
+            if len(images) >= limit:
+                return images
+        if images:
+            break
+    return images
+
+
+def _ld_types(node: Dict) -> List[str]:
+    kind = node.get('@type')
+    return kind if isinstance(kind, list) else [kind]
+
+
+def _jsonld_product(node: Dict) -> Dict:
+    """Map a schema.org Product (or ListItem wrapping one) to a raw product row"""
+    if 'ListItem' in _ld_types(node) and isinstance(node.get('item'), dict):
+        item = node['item']
+        if not item.get('url') and node.get('url'):
+            item = dict(item, url=node['url'])
+        node = item
+    offers = node.get('offers') or {}
+    if isinstance(offers, list):
+        offers = offers[0] if offers and isinstance(offers[0], dict) else {}
+    price = offers.get('price')
+    if price in (None, '') and offers.get('lowPrice') not in (None, ''):
+        price = offers['lowPrice']
+        if offers.get('highPrice') not in (None, '') and offers['highPrice'] != offers['lowPrice']:
+            price = f"{offers['lowPrice']} - {offers['highPrice']}"
+    rating = node.get('aggregateRating') or {}
+    availability = offers.get('availability') or ''
+    return {
+        'title': _scalar(node.get('name')) or '',
+        'price': '' if price is None else str(price),
+        'currency': offers.get('priceCurrency'),
+        'url': node.get('url'),
+        'images': _images(node),
+        'rating': '' if rating.get('ratingValue') is None else str(rating['ratingValue']),
+        'review_count': str(rating.get('reviewCount') or rating.get('ratingCount') or ''),
+        'description': _scalar(node.get('description')) or '',
+        'availability': availability.rsplit('/', 1)[-1] if isinstance(availability, str) else '',
+    }
+
+
+def _walk_jsonld(node, out: List[Dict], depth: int = 0):
+    if depth > _MAX_DEPTH:
+        return
+    if isinstance(node, list):
+        for child in node:
+            _walk_jsonld(child, out, depth + 1)
+        return
+    if not isinstance(node, dict):
+        return
+    types = _ld_types(node)
+    if 'Product' in types:
+        out.append(_jsonld_product(node))
+        return
+    if 'ListItem' in types and isinstance(node.get('item'), dict):
+        out.append(_jsonld_product(node))
+        return
+    for key in ('@graph', 'itemListElement', 'mainEntity', 'hasVariant'):
+        if key in node:
+            _walk_jsonld(node[key], out, depth + 1)
+
+
+def products_from_jsonld(blocks: Iterable) -> List[Dict]:
+    """
+    Collect raw product rows from parsed JSON-LD blocks
+
+    Handles Product, ItemList/ListItem and @graph containers.
+    """
+    rows: List[Dict] = []
+    for block in blocks:
+        _walk_jsonld(block, rows)
+    return [row for row in rows if row.get('title') or row.get('url')]
+
+
+def _product_score(item) -> int:
+    """Score how product-like a dictionary is (0 = no title)"""
+    if not isinstance(item, dict) or _first(item, _TITLE_KEYS) is None:
+        return 0
+    score = 1
+    if any(key in item for key in _PRICE_KEYS):
+        score += 2
+    if any(key in item for key in _IMAGE_KEYS):
+        score += 1
+    if any(key in item for key in _URL_KEYS + _ID_KEYS):
+        score += 1
+    return score
+
+
+def _looks_like_product(item) -> bool:
+    # A title plus a price, or a title with both an image and a link
+    return _product_score(item) >= 3
+
+
+def _product_lists(node, out: List[List[Dict]], depth: int = 0):
+    if depth > _MAX_DEPTH:
+        return
+    if isinstance(node, list):
+        if node and sum(1 for item in node[:5] if _looks_like_product(item)) >= min(2, len(node)):
+            out.append(node)
+            return
+        for child in node:
+            _product_lists(child, out, depth + 1)
+    elif isinstance(node, dict):
+        for child in node.values():
+            if isinstance(child, (dict, list)):
+                _product_lists(child, out, depth + 1)
+
+
+def _state_item(item: Dict, item_url_template: Optional[str]) -> Dict:
+    """Map one item of an embedded search-state list to a raw product row"""
+    url = _first(item, _URL_KEYS)
+    if not url and item_url_template:
+        item_id = _first(item, _ID_KEYS)
+        if item_id is not None:
+            url = item_url_template.format(item_id)
+    if isinstance(url, str) and url.startswith('//'):
+        url = 'https:' + url
+    price = _first(item, _PRICE_KEYS)
+    rating = _first(item, _RATING_KEYS, ('starRating', 'averageStar', 'ratingValue', 'value'))
+    reviews = _first(item, _REVIEW_KEYS)
+    return {
+        'title': str(_first(item, _TITLE_KEYS) or ''),
+        'price': '' if price is None else str(price),
+        'currency': _first(item, _CURRENCY_KEYS, ('currencyCode',)),
+        'url': url if isinstance(url, str) else None,
+        'images': _images(item),
+        'rating': '' if rating is None else str(rating),
+        'review_count': '' if reviews is None else str(reviews),
+    }
+
+
+def products_from_state(objects: Iterable, item_url_template: Optional[str] = None) -> List[Dict]:
+    """
+    Collect raw product rows from embedded search state
+
+    The payload layout changes often, so instead of hard-coding one path the
+    largest list of product-like dictionaries is used.
+
+    Args:
+        objects: Parsed state objects (e.g. window.runParams)
+        item_url_template: Format string building an item URL from its id
+            when the payload has no URL (e.g. 'https://www.aliexpress.com/item/{}.html')
+
+    Returns:
+        Raw product rows in page order
+    """
+    candidates: List[List[Dict]] = []
+    for obj in objects:
+        _product_lists(obj, candidates)
+    if not candidates:
+        return []
+    best = max(candidates, key=lambda items: sum(_product_score(item) for item in items))
+    return [_state_item(item, item_url_template) for item in best if _looks_like_product(item)]
+
+
+def products_from_payloads(jsonld_blocks: Iterable, state_objects: Iterable,
+                           item_url_template: Optional[str] = None) -> List[Dict]:
+    """Prefer embedded search state, falling back to JSON-LD rows"""
+    rows = products_from_state(state_objects, item_url_template)
+    return rows or products_from_jsonld(jsonld_blocks)
+
+
+def extract_from_html(html: str, state_globals: Sequence[str] = (),
+                      item_url_template: Optional[str] = None) -> List[Dict]:
+    """
+    Extract raw product rows from the payloads embedded in static HTML
+
+    Args:
+        html: Page HTML
+        state_globals: Global names holding search state
+        item_url_template: See products_from_state
+
+    Returns:
+        Raw product rows (empty if the page embeds no usable payload)
+    """
+    return products_from_payloads(find_jsonld_blocks(html), find_state_objects(html, state_globals),
+                                  item_url_template)
+
+
+async def extract_from_page(page, state_globals: Sequence[str] = (),
+                            item_url_template: Optional[str] = None) -> List[Dict]:
+    """
+    Extract raw product rows from a live page's embedded payloads
+
+    One page.evaluate collects every JSON-LD block and the serialized state
+    globals; parsing happens in Python.
+
+    Args:
+        page: Playwright page
+        state_globals: Global names holding search state
+        item_url_template: See products_from_state
+
+    Returns:
+        Raw product rows (empty if the page embeds no usable payload)
+    """
+    payloads = await page.evaluate(COLLECT_PAYLOADS_JS, list(state_globals))
+    blocks = []
+    for text in payloads.get('jsonld') or []:
+        try:
+            blocks.append(loads(text))
+        except ValueError:
+            continue
+    state = []
+    for text in payloads.get('state') or []:
+        try:
+            state.append(loads(text))
+        except ValueError:
+            continue
+    for text in payloads.get('inline') or []:
+        state.extend(find_state_objects(text, state_globals))
+    return products_from_payloads(blocks, state, item_url_template)
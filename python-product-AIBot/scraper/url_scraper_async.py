@@ -1,7 +1,11 @@
 """Async version of URL scraper - uses factory pattern for multi-site support"""
 import sys
+import time
+import atexit
 import asyncio
-from typing import Optional
+import threading
+from contextlib import nullcontext
+from typing import Dict, Iterable, Iterator, List, Optional
 
 # CRITICAL: Set event loop policy BEFORE importing Playwright on Windows
 if sys.platform == 'win32':
@@ -9,33 +13,224 @@ if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
 from .scraper_factory import create_scraper
+from .browser_pool import shutdown_browser_pool
+from .fetch_tier import scrape_tiered
+from .rate_limiter import limiter_for
+from .site_detector import get_site_info
+from .streaming import iterate_sync
+from .write_behind import write_behind
 
 
-def scrape_from_url_sync(url: str, max_results: int = 10, site_name: Optional[str] = None):
+def _new_event_loop():
+    """Create and install a fresh event loop with the right policy"""
+    if sys.platform == 'win32':
+        if hasattr(asyncio, 'WindowsProactorEventLoopPolicy'):
+            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop
+
+
+# Background event loop that runs every synchronous call, so the browser pool
+# bound to it stays warm from one call to the next
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_thread: Optional[threading.Thread] = None
+_sync_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background loop for sync callers, starting it on first use"""
+    global _sync_loop, _sync_thread
+    with _sync_lock:
+        if _sync_loop is None:
+            started = threading.Event()
+            state = {}
+            
+            def run():
+                state['loop'] = loop = _new_event_loop()
+                loop.call_soon(started.set)
+                loop.run_forever()
+            
+            thread = threading.Thread(target=run, name='scraper-sync-loop', daemon=True)
+            thread.start()
+            started.wait()
+            if _sync_thread is None:
+                atexit.register(_stop_sync_loop)
+            _sync_loop, _sync_thread = state['loop'], thread
+        return _sync_loop
+
+
+def _run_sync(coro):
+    """Run a coroutine on the shared background loop and wait for its result"""
+    loop = _get_sync_loop()
+    if threading.current_thread() is _sync_thread:
+        coro.close()
+        raise RuntimeError("Synchronous scraper calls cannot be made from the scraper's own event loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def _stop_sync_loop():
+    """Close the pooled browsers and stop the shared background loop (run at exit)"""
+    global _sync_loop
+    with _sync_lock:
+        loop, _sync_loop = _sync_loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown_browser_pool(), loop).result(timeout=30)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        _sync_thread.join()
+        loop.close()
+
+
+def _persisting(persist: bool):
+    """Write-behind context when persisting, otherwise a no-op context"""
+    return write_behind() if persist else nullcontext()
+
+
+def scrape_from_url_sync(url: str, max_results: int = 10, site_name: Optional[str] = None,
+                         enrich: bool = False, persist: bool = False):
     """
     Synchronous wrapper for async scraper using factory pattern
     
+    Every synchronous call runs on one long-lived background event loop, so
+    the browser pool stays warm across calls; it is shut down at exit.
+    
     Args:
         url: Product listing page URL
         max_results: Maximum number of products to extract
         site_name: Optional site name to override auto-detection
+        enrich: Merge each product's detail page into its listing record
+        persist: Store products in Supabase in batches while scraping
         
     Returns:
         List of product dictionaries
     """
-    # Create new event loop with proper policy
-    if sys.platform == 'win32':
-        if hasattr(asyncio, 'WindowsProactorEventLoopPolicy'):
-            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    # Use factory to get appropriate scraper
+    scraper = create_scraper(url=url, site_name=site_name)
     
-    # Create new event loop
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    async def run():
+        async with _persisting(persist):
+            return await scrape_tiered(url, max_results, scraper=scraper, enrich=enrich)
+    
+    products, _ = _run_sync(run())
+    return products
+
+
+def iter_products_sync(url: str, max_results: int = 10, site_name: Optional[str] = None,
+                       normalize: bool = True) -> Iterator[Dict]:
+    """
+    Synchronous iterator over a scrape's products as they are extracted
     
-    try:
-        # Use factory to get appropriate scraper
+    The scrape runs on the shared background loop (see scrape_from_url_sync);
+    stopping iteration early (break, closing the generator) cancels it.
+    
+    Args:
+        url: Product listing page URL
+        max_results: Maximum number of products to yield
+        site_name: Optional site name to override auto-detection
+        normalize: Yield normalized products (see normalize.normalize_product)
+        
+    Yields:
+        Product dictionaries
+    """
+    def stream():
         scraper = create_scraper(url=url, site_name=site_name)
-        return loop.run_until_complete(scraper.scrape_from_url(url, max_results))
-    finally:
-        loop.close()
+        return scraper.iter_products(url, max_results, normalize=normalize)
+    
+    return iterate_sync(stream, loop=_get_sync_loop())
+
+
+async def scrape_many(urls: Iterable[str], max_results: int = 10, concurrency: int = 8,
+                      per_domain: int = 2, site_name: Optional[str] = None,
+                      timeout: Optional[float] = None, enrich: bool = False,
+                      persist: bool = False) -> List[Dict]:
+    """
+    Scrape many listing URLs concurrently over the shared browser pool
+    
+    Each URL is routed through create_scraper and served from the page cache
+    when fresh, otherwise tried over plain HTTP first where the site allows it
+    (see fetch_tier). At most ``concurrency`` URLs
+    run at once overall and at most ``per_domain`` against any one domain;
+    within that cap the domain's adaptive rate limiter (see rate_limiter)
+    lowers concurrency while the site is pushing back.
+    A failing URL never aborts the batch; its error is reported instead.
+    
+    Args:
+        urls: Listing page URLs to scrape
+        max_results: Maximum number of products to extract per URL
+        concurrency: Maximum number of URLs scraped at the same time
+        per_domain: Maximum number of concurrent scrapes per domain
+        site_name: Optional site name to override auto-detection
+        timeout: Optional per-URL time limit in seconds
+        enrich: Merge each product's detail page into its listing record
+        persist: Store products in Supabase in batches while scraping; products
+            of a URL that times out are kept
+        
+    Returns:
+        One result dictionary per input URL, in input order:
+        {
+            'url': str,
+            'site': str or None,
+            'products': List[Dict],
+            'error': str or None,
+            'tier': 'cache', 'http', 'browser' or None,
+            'elapsed': float (seconds spent scraping, excluding queueing)
+        }
+    """
+    global_limit = asyncio.Semaphore(max(1, concurrency))
+    domain_limits: Dict[str, asyncio.Semaphore] = {}
+    
+    async def scrape_one(url: str) -> Dict:
+        result = {'url': url, 'site': None, 'products': [], 'error': None,
+                  'tier': None, 'elapsed': 0.0}
+        domain = get_site_info(url)['domain'] or ''
+        domain_limit = domain_limits.setdefault(domain, asyncio.Semaphore(max(1, per_domain)))
+        # Take the domain slot first so a busy domain never holds a global slot idle
+        async with domain_limit, limiter_for(url).slot():
+            async with global_limit:
+                started = time.perf_counter()
+                try:
+                    scraper = create_scraper(url=url, site_name=site_name)
+                    result['site'] = scraper.site_name
+                    result['products'], result['tier'] = await asyncio.wait_for(
+                        scrape_tiered(url, max_results, scraper=scraper, enrich=enrich), timeout
+                    )
+                except asyncio.TimeoutError:
+                    result['error'] = f"Timeout after {timeout}s"
+                except Exception as e:
+                    result['error'] = f"{type(e).__name__}: {e}"
+                result['elapsed'] = time.perf_counter() - started
+        return result
+    
+    async with _persisting(persist):
+        return list(await asyncio.gather(*(scrape_one(url) for url in urls)))
+
 
+def scrape_many_sync(urls: Iterable[str], max_results: int = 10, concurrency: int = 8,
+                     per_domain: int = 2, site_name: Optional[str] = None,
+                     timeout: Optional[float] = None, enrich: bool = False,
+                     persist: bool = False) -> List[Dict]:
+    """
+    Synchronous wrapper for scrape_many
+    
+    Args:
+        urls: Listing page URLs to scrape
+        max_results: Maximum number of products to extract per URL
+        concurrency: Maximum number of URLs scraped at the same time
+        per_domain: Maximum number of concurrent scrapes per domain
+        site_name: Optional site name to override auto-detection
+        timeout: Optional per-URL time limit in seconds
+        enrich: Merge each product's detail page into its listing record
+        persist: Store products in Supabase in batches while scraping
+        
+    Returns:
+        List of per-URL result dictionaries (see scrape_many)
+    """
+    return _run_sync(scrape_many(
+        urls, max_results, concurrency=concurrency, per_domain=per_domain,
+        site_name=site_name, timeout=timeout, enrich=enrich, persist=persist,
+    ))
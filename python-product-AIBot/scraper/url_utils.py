@@ -0,0 +1,47 @@
+"""URL helpers shared by the cache and the crawlers"""
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the visit and never change the page content
+TRACKING_PARAMS = frozenset({
+    'gclid', 'fbclid', 'msclkid', 'yclid', 'ref', 'ref_', 'spm', 'scm', 'pvid',
+    'algo_pvid', 'algo_exp_id', 'aff_platform', 'aff_trace_key', 'terminal_id',
+    '_trkparms', '_trksid', 'hash', 'crid', 'sprefix', 'qid', 'content-id', 'pd_rd_r',
+    'pd_rd_w', 'pd_rd_wg', 'pf_rd_p', 'pf_rd_r',
+})
+TRACKING_PREFIXES = ('utm_', 'mc_', 'trk')
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent links compare equal
+
+    Lower-cases the scheme and host, drops default ports, fragments and
+    tracking parameters, sorts the remaining query parameters and removes
+    a trailing slash from non-root paths.
+
+    Args:
+        url: Absolute URL
+
+    Returns:
+        Canonical form of the URL (unchanged if it has no host)
+    """
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return url.strip()
+    scheme = parts.scheme.lower() or 'https'
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/') or '/'
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not _is_tracking(k))
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
@@ -0,0 +1,216 @@
+"""Write-behind persistence: store products in batches while the scrape is still running"""
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from .fingerprint import FingerprintIndex, get_fingerprint_index
+from .product_record import ProductRecord
+from .streaming import product_sink
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv('SCRAPER_WRITE_BATCH', '50'))
+DEFAULT_FLUSH_INTERVAL = float(os.getenv('SCRAPER_WRITE_INTERVAL', '2.0'))
+# Products waiting to be written before scrapers are paused
+DEFAULT_MAX_PENDING = int(os.getenv('SCRAPER_WRITE_MAX_PENDING', '500'))
+
+_STOP = object()
+
+
+def to_database_row(product: Dict) -> Dict:
+    """Turn a scraped product into a products-table row"""
+    return ProductRecord.from_raw(product).to_db_row()
+
+
+def _default_writer(rows: List[Dict]):
+    from .storage import insert_products_supabase
+    return insert_products_supabase(rows)
+
+
+class WriteBehindSink:
+    """
+    Product sink that queues products and writes them in the background
+
+    Install it with streaming.product_sink (or use write_behind()). A batch
+    is written as soon as batch_size products are queued or flush_interval
+    seconds after its first product, whichever comes first. Failed batches
+    are logged and counted; they never abort the scrape. With a fingerprint
+    index, products whose content has not changed since they were last
+    written are skipped and counted as unchanged.
+    """
+
+    def __init__(self, writer: Optional[Callable[[List[Dict]], Any]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 prepare: Optional[Callable[[Dict], Dict]] = to_database_row,
+                 fingerprints: Optional[FingerprintIndex] = None):
+        """
+        Initialize the sink (call start() from inside the event loop)
+
+        Args:
+            writer: Blocking callable that stores a list of rows; runs in a worker
+                thread (defaults to storage.insert_products_supabase)
+            batch_size: Maximum rows per write
+            flush_interval: Maximum seconds a product waits before being written
+            max_pending: Queued products above which drain() blocks the scraper
+            prepare: Maps a scraped product to a row (None stores products as-is)
+            fingerprints: Index used to skip unchanged products (defaults to
+                fingerprint.get_fingerprint_index(), i.e. SCRAPER_FINGERPRINTS)
+        """
+        self.writer = writer or _default_writer
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max(1, max_pending)
+        self.prepare = prepare
+        self.fingerprints = fingerprints if fingerprints is not None else get_fingerprint_index()
+        self.queued = 0
+        self.written = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.batches = 0
+        self.inserted = 0
+        self.updated = 0
+        self.errors: List[str] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._has_room: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._started = 0.0
+
+    def start(self):
+        """Start the background flusher on the running event loop"""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+        self._started = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def __call__(self, product: Dict):
+        """Queue one product (the product_sink callback; never blocks)"""
+        if self._closed or self._task is None:
+            raise RuntimeError("WriteBehindSink is not running")
+        self._queue.put_nowait(product)
+        self.queued += 1
+        if self._queue.qsize() >= self.max_pending:
+            self._has_room.clear()
+
+    async def drain(self):
+        """Wait until the backlog is below max_pending"""
+        if self._has_room is not None:
+            await self._has_room.wait()
+
+    def _update_room(self):
+        if self._queue.qsize() < self.max_pending:
+            self._has_room.set()
+
+    async def _next_batch(self):
+        """Collect up to batch_size products, returning (batch, stop_seen)"""
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                item = self._queue.get_nowait()
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = await self._next_batch()
+            self._update_room()
+            if batch:
+                await self._write(batch)
+        # Nothing is queued after _STOP, but let producers go regardless
+        self._has_room.set()
+
+    async def _write(self, batch: List[Dict]):
+        changes = None
+        try:
+            if self.fingerprints is not None:
+                changes = await asyncio.to_thread(self.fingerprints.diff, batch)
+                self.unchanged += changes.unchanged
+                batch = changes.changed
+            if not batch:
+                await asyncio.to_thread(self.fingerprints.commit, changes)
+                return
+            rows = [self.prepare(p) for p in batch] if self.prepare else list(batch)
+            result = await asyncio.to_thread(self.writer, rows)
+            if changes is not None:
+                await asyncio.to_thread(self.fingerprints.commit, changes)
+        except Exception as e:
+            self.failed += len(batch)
+            self.errors.append(f"{type(e).__name__}: {e}")
+            logger.warning("write-behind batch of %d products failed: %s", len(batch), e)
+            return
+        self.batches += 1
+        self.written += len(batch)
+        self.inserted += getattr(result, 'inserted', 0)
+        self.updated += getattr(result, 'updated', 0)
+
+    async def close(self):
+        """Write everything still queued and stop the flusher"""
+        if self._task is None or self._closed:
+            return
+        self._closed = True
+        self._queue.put_nowait(_STOP)
+        await self._task
+
+    def stats(self) -> Dict:
+        """Return queue and write counters"""
+        return {
+            'queued': self.queued,
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'written': self.written,
+            'unchanged': self.unchanged,
+            'failed': self.failed,
+            'batches': self.batches,
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'errors': list(self.errors),
+            'elapsed': round(time.perf_counter() - self._started, 3) if self._started else 0.0,
+        }
+
+
+@asynccontextmanager
+async def write_behind(writer: Optional[Callable[[List[Dict]], Any]] = None, **options):
+    """
+    Persist every product emitted inside the block while the block is running
+
+    The final flush runs on normal exit, on errors and on cancellation, so
+    products collected before a timeout are not lost.
+
+    Args:
+        writer: Blocking callable that stores a list of rows
+        **options: Passed to WriteBehindSink
+
+    Yields:
+        The running WriteBehindSink (see its stats())
+    """
+    sink = WriteBehindSink(writer, **options)
+    sink.start()
+    try:
+        with product_sink(sink):
+            yield sink
+    finally:
+        # Shielded so a second cancellation cannot drop the last batch
+        await asyncio.shield(sink.close())
@@ -0,0 +1,393 @@
+"""Long-lived scraper worker process with warm browsers and streamed results"""
+import asyncio
+import itertools
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Get the project root
+ROOT = Path(__file__).resolve().parent
+
+# Events sent from the worker to the client: (kind, job_id, payload)
+EVENT_READY = 'ready'
+EVENT_PRODUCT = 'product'
+EVENT_UPDATE = 'update'
+EVENT_DONE = 'done'
+EVENT_ERROR = 'error'
+EVENT_CANCELLED = 'cancelled'
+
+_FINISHED = (EVENT_DONE, EVENT_ERROR, EVENT_CANCELLED)
+
+
+class WorkerUnavailable(Exception):
+    """Raised when the worker process cannot be started"""
+
+
+async def _run_scrape(job: Dict) -> List[Dict]:
+    """Default job runner: tiered scrape of one URL in the worker's warm loop"""
+    from scraper.fetch_tier import scrape_tiered
+    from scraper.scraper_factory import create_scraper
+
+    scraper = create_scraper(url=job['url'], site_name=job.get('site_name'))
+    products, _ = await scrape_tiered(job['url'], job.get('max_results', 10), scraper=scraper,
+                                      enrich=job.get('enrich', False))
+    return products
+
+
+async def _serve(job_queue, event_queue, run_job=_run_scrape):
+    """
+    Run jobs from job_queue concurrently until a 'stop' message arrives
+
+    Products are streamed as ('product', job_id, product) events while a job
+    runs; products the scraper returns without having streamed them (e.g.
+    single product pages) are sent just before 'done'. Products enriched
+    after they were streamed are re-sent one by one as ('update', job_id,
+    (index, product)). 'done' carries only the product count, so the result
+    list is never pickled as a whole.
+
+    Args:
+        job_queue: Queue of {'type': 'scrape'|'cancel'|'stop', 'id': ..., ...}
+        event_queue: Queue receiving (kind, job_id, payload) tuples
+        run_job: Coroutine function taking a job dictionary
+    """
+    from scraper.streaming import product_sink
+
+    loop = asyncio.get_running_loop()
+    tasks: Dict[int, asyncio.Task] = {}
+
+    async def run(job: Dict):
+        job_id = job['id']
+        # id(product) -> its position in the client's list
+        streamed: Dict[int, int] = {}
+
+        def send(product: Dict):
+            streamed[id(product)] = len(streamed)
+            event_queue.put((EVENT_PRODUCT, job_id, product))
+
+        try:
+            with product_sink(send):
+                products = await run_job(job)
+            for product in products:
+                index = streamed.get(id(product))
+                if index is None:
+                    send(product)
+                elif job.get('enrich'):
+                    # Enrichment merges detail pages into products that were already sent
+                    event_queue.put((EVENT_UPDATE, job_id, (index, product)))
+            event_queue.put((EVENT_DONE, job_id, len(streamed)))
+        except asyncio.CancelledError:
+            event_queue.put((EVENT_CANCELLED, job_id, None))
+        except Exception as e:
+            event_queue.put((EVENT_ERROR, job_id, f"{type(e).__name__}: {e}"))
+        finally:
+            tasks.pop(job_id, None)
+
+    event_queue.put((EVENT_READY, None, os.getpid()))
+    while True:
+        message = await loop.run_in_executor(None, job_queue.get)
+        kind = message.get('type')
+        if kind == 'stop':
+            break
+        if kind == 'cancel':
+            task = tasks.get(message['id'])
+            if task is not None:
+                task.cancel()
+        elif kind == 'scrape':
+            tasks[message['id']] = asyncio.ensure_future(run(message))
+
+    for task in list(tasks.values()):
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+def _worker_main(job_queue, event_queue):
+    """Entry point of the worker process"""
+    sys.path.insert(0, str(ROOT / "python-product-AIBot"))
+    from scraper.url_scraper_async import _new_event_loop
+    from scraper.browser_pool import get_browser_pool, shutdown_browser_pool
+    from scraper import metrics
+
+    # Scrapes run here, not in the UI process, so this is where /metrics lives
+    metrics.start_http_server_from_env()
+    loop = _new_event_loop()
+    try:
+        # Launch the browsers up front so the first job does not pay for it
+        try:
+            pool = loop.run_until_complete(get_browser_pool())
+            loop.run_until_complete(pool.start())
+        except Exception:
+            pass
+        loop.run_until_complete(_serve(job_queue, event_queue))
+    finally:
+        loop.run_until_complete(shutdown_browser_pool())
+        loop.close()
+
+
+class ScrapeJob:
+    """Handle for one job submitted to a ScraperWorker"""
+
+    def __init__(self, worker: 'ScraperWorker', job_id: int):
+        self.worker = worker
+        self.id = job_id
+        self.products: List[Dict] = []
+        self.error: Optional[str] = None
+        self.cancelled = False
+        self._events: 'queue.Queue' = queue.Queue()
+        self._done = threading.Event()
+
+    def _deliver(self, kind: str, payload):
+        if kind == EVENT_PRODUCT:
+            self.products.append(payload)
+        elif kind == EVENT_UPDATE:
+            index, product = payload
+            self.products[index] = product
+            return
+        elif kind == EVENT_ERROR:
+            self.error = payload
+        elif kind == EVENT_CANCELLED:
+            self.cancelled = True
+        self._events.put((kind, payload))
+        if kind in _FINISHED:
+            self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def _next_event(self, timeout: Optional[float]):
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            self.cancel()
+            raise TimeoutError(f"No result from scraper worker within {timeout}s")
+
+    def iter_products(self, timeout: Optional[float] = None) -> Iterator[Dict]:
+        """
+        Yield products as the worker streams them
+
+        Args:
+            timeout: Maximum seconds to wait for each next product
+
+        Raises:
+            TimeoutError: If no event arrives within timeout (the job is cancelled)
+            RuntimeError: If the job fails
+        """
+        while True:
+            kind, payload = self._next_event(timeout)
+            if kind == EVENT_PRODUCT:
+                yield payload
+            elif kind == EVENT_ERROR:
+                raise RuntimeError(payload)
+            elif kind in _FINISHED:
+                return
+
+    def iter_batches(self, max_size: int = 20, timeout: Optional[float] = None) -> Iterator[List[Dict]]:
+        """
+        Yield streamed products in lists, for consumers that redraw per batch
+
+        Waits for the next product, then takes the products already queued
+        behind it (up to max_size), so a fast scrape arrives in a few large
+        batches and a slow one product by product.
+
+        Args:
+            max_size: Most products per batch
+            timeout: Maximum seconds to wait for each next product
+
+        Raises:
+            TimeoutError: If no event arrives within timeout (the job is cancelled)
+            RuntimeError: If the job fails (after the products received before it)
+        """
+        while True:
+            kind, payload = self._next_event(timeout)
+            batch = []
+            while True:
+                if kind == EVENT_PRODUCT:
+                    batch.append(payload)
+                elif kind == EVENT_ERROR or kind in _FINISHED:
+                    if batch:
+                        yield batch
+                    if kind == EVENT_ERROR:
+                        raise RuntimeError(payload)
+                    return
+                if len(batch) >= max_size:
+                    break
+                try:
+                    kind, payload = self._events.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                yield batch
+
+    def result(self, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Wait for the job and return its final product list
+
+        Raises:
+            TimeoutError: If the job does not finish in time (it is cancelled)
+            RuntimeError: If the job fails or was cancelled
+        """
+        if not self._done.wait(timeout):
+            self.cancel()
+            raise TimeoutError(f"Scraping took longer than {timeout}s")
+        if self.error:
+            raise RuntimeError(self.error)
+        if self.cancelled:
+            raise RuntimeError("Scrape was cancelled")
+        return self.products
+
+    def cancel(self):
+        """Ask the worker to stop this job"""
+        if not self.done:
+            self.worker._send({'type': 'cancel', 'id': self.id})
+
+
+class ScraperWorker:
+    """Client for a persistent scraper process that keeps its loop and browsers warm"""
+
+    def __init__(self, start_timeout: float = 60.0):
+        """
+        Initialize the client (the process starts on first use)
+
+        Args:
+            start_timeout: Seconds to wait for the worker to come up
+        """
+        self.start_timeout = start_timeout
+        self._ctx = multiprocessing.get_context('spawn')
+        self._process = None
+        self._job_queue = None
+        self._event_queue = None
+        self._jobs: Dict[int, ScrapeJob] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._dispatcher = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        """
+        Start the worker process if it is not running
+
+        Raises:
+            WorkerUnavailable: If the process does not report ready in time
+        """
+        with self._lock:
+            if self.alive:
+                return
+            self._job_queue = self._ctx.Queue()
+            self._event_queue = self._ctx.Queue()
+            self._process = self._ctx.Process(
+                target=_worker_main, args=(self._job_queue, self._event_queue),
+                name='scraper-worker', daemon=True,
+            )
+            self._process.start()
+            try:
+                kind, _, _ = self._event_queue.get(timeout=self.start_timeout)
+            except queue.Empty:
+                self._process.terminate()
+                self._process.join(5)
+                self._process = None
+                raise WorkerUnavailable("Scraper worker did not start in time")
+            if kind != EVENT_READY:
+                self._process.terminate()
+                self._process.join(5)
+                self._process = None
+                raise WorkerUnavailable(f"Unexpected first event from scraper worker: {kind}")
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, args=(self._process, self._event_queue),
+                                                name='scraper-worker-events', daemon=True)
+            self._dispatcher.start()
+
+    def _send(self, message: Dict):
+        self._job_queue.put(message)
+
+    def _dispatch_event(self, kind: str, job_id, payload):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and kind in _FINISHED:
+                del self._jobs[job_id]
+        if job is not None:
+            job._deliver(kind, payload)
+
+    def _fail_pending(self, message: str):
+        with self._lock:
+            jobs, self._jobs = list(self._jobs.values()), {}
+        for job in jobs:
+            job._deliver(EVENT_ERROR, message)
+
+    def _dispatch_loop(self, process, event_queue):
+        while True:
+            try:
+                kind, job_id, payload = event_queue.get(timeout=0.5)
+            except queue.Empty:
+                if not process.is_alive():
+                    self._fail_pending("Scraper worker exited unexpectedly")
+                    return
+                continue
+            except (EOFError, OSError):
+                self._fail_pending("Scraper worker connection lost")
+                return
+            self._dispatch_event(kind, job_id, payload)
+
+    def submit(self, url: str, max_results: int = 10, site_name: Optional[str] = None,
+               enrich: bool = False) -> ScrapeJob:
+        """
+        Queue a scrape on the worker
+
+        Args:
+            url: Product listing page URL
+            max_results: Maximum number of products to extract
+            site_name: Optional site name to override auto-detection
+            enrich: Merge each product's detail page into its listing record
+
+        Returns:
+            ScrapeJob handle for streaming, waiting on or cancelling the job
+        """
+        self.start()
+        with self._lock:
+            job = ScrapeJob(self, next(self._ids))
+            self._jobs[job.id] = job
+        self._send({'type': 'scrape', 'id': job.id, 'url': url, 'max_results': max_results,
+                    'site_name': site_name, 'enrich': enrich})
+        return job
+
+    def scrape(self, url: str, max_results: int = 10, site_name: Optional[str] = None,
+               timeout: Optional[float] = 120) -> List[Dict]:
+        """Submit a scrape and wait for its products"""
+        return self.submit(url, max_results, site_name).result(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the worker process and its browsers"""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None:
+            return
+        if process.is_alive():
+            self._job_queue.put({'type': 'stop'})
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._fail_pending("Scraper worker stopped")
+
+
+_worker: Optional[ScraperWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_scraper_worker() -> ScraperWorker:
+    """Return the process-wide scraper worker client"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = ScraperWorker()
+        return _worker
+
+
+def worker_enabled() -> bool:
+    """Set SCRAPER_USE_WORKER=0 to go back to one subprocess per scrape"""
+    return os.getenv('SCRAPER_USE_WORKER', '1').lower() not in ('0', 'false', 'no', 'off')
@@ -3,12 +3,73 @@ import subprocess
 import json
 import sys
 import os
+import time
 from pathlib import Path
 
+from scraper_worker import WorkerUnavailable, get_scraper_worker, worker_enabled
+
 # Get the project root
 ROOT = Path(__file__).resolve().parent
 
+SCRAPE_TIMEOUT = 120
+# Most products handed to the UI per redraw
+STREAM_BATCH_SIZE = 10
+
 def scrape_in_thread(url, max_results, site_name=None):
+    """Run scraper outside Streamlit's event loop, preferring the warm worker process"""
+    if worker_enabled():
+        try:
+            products = get_scraper_worker().scrape(url, max_results, site_name, timeout=SCRAPE_TIMEOUT)
+            return products, None
+        except WorkerUnavailable:
+            # Worker could not start; fall back to a one-off subprocess
+            pass
+        except TimeoutError:
+            return None, "Timeout: Scraping took too long (over 2 minutes)"
+        except RuntimeError as e:
+            return None, f"Scraper worker failed: {e}"
+    return scrape_in_subprocess(url, max_results, site_name)
+
+def stream_in_thread(url, max_results, site_name=None, batch_size=STREAM_BATCH_SIZE):
+    """
+    Yield lists of products while the scrape runs, preferring the warm worker process
+
+    The worker streams products as each listing page is extracted; the
+    one-off subprocess fallback delivers everything in one list at the end.
+    Stopping the iteration early cancels the worker job.
+
+    Raises:
+        RuntimeError: With a message for the user if scraping fails or times out
+    """
+    job = None
+    if worker_enabled():
+        try:
+            job = get_scraper_worker().submit(url, max_results, site_name)
+        except WorkerUnavailable:
+            # Worker could not start; fall back to a one-off subprocess
+            pass
+    if job is None:
+        products, error = scrape_in_subprocess(url, max_results, site_name)
+        if error:
+            raise RuntimeError(error)
+        if products:
+            yield products
+        return
+
+    deadline = time.monotonic() + SCRAPE_TIMEOUT
+    try:
+        for batch in job.iter_batches(batch_size, timeout=SCRAPE_TIMEOUT):
+            yield batch
+            if time.monotonic() > deadline:
+                raise TimeoutError
+    except TimeoutError:
+        raise RuntimeError("Timeout: Scraping took too long (over 2 minutes)") from None
+    except RuntimeError as e:
+        raise RuntimeError(f"Scraper worker failed: {e}") from None
+    finally:
+        job.cancel()
+
+def scrape_in_subprocess(url, max_results, site_name=None):
     """Run scraper in a separate subprocess to avoid event loop conflicts"""
     try:
         # Run scraper in a completely separate process
@@ -32,7 +93,7 @@ def scrape_in_thread(url, max_results, site_name=None):
             cmd,
             capture_output=True,
             text=True,
-            timeout=120,  # 2 minute timeout
+            timeout=SCRAPE_TIMEOUT,  # 2 minute timeout
             cwd=str(ROOT),
             env=env
         )
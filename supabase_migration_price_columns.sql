@@ -0,0 +1,31 @@
+-- Migration: Numeric price columns for range filters and sorting in the database
+-- Run this SQL in your Supabase SQL Editor (after supabase_migration_extended_fields.sql),
+-- before deploying a bot version that writes price_min / price_max / price_unit
+
+-- The display text stays in price; these hold the parsed amounts
+-- (a single price has price_min = price_max, "US$1.20-3.50 / piece" is 1.20 / 3.50 / 'piece')
+ALTER TABLE public.products
+ADD COLUMN IF NOT EXISTS price_min NUMERIC(14,4),
+ADD COLUMN IF NOT EXISTS price_max NUMERIC(14,4),
+ADD COLUMN IF NOT EXISTS price_unit TEXT;
+
+ALTER TABLE public.products DROP CONSTRAINT IF EXISTS products_price_range_check;
+ALTER TABLE public.products
+ADD CONSTRAINT products_price_range_check CHECK (price_min IS NULL OR price_max >= price_min);
+
+-- Backfill rows whose text is a plain single price such as "$1,299.99" or "USD 15";
+-- other formats are filled in the next time the product is scraped
+UPDATE public.products
+SET price_min = replace(substring(price from '[0-9][0-9,]*(?:\.[0-9]+)?'), ',', '')::NUMERIC,
+    price_max = replace(substring(price from '[0-9][0-9,]*(?:\.[0-9]+)?'), ',', '')::NUMERIC
+WHERE price_min IS NULL
+  AND price ~ '^[^0-9]*[0-9]{1,3}(,[0-9]{3})*(\.[0-9]+)?[^0-9]*$';
+
+-- Range queries ask for price_min <= :max AND price_max >= :min, ordered by price_min
+CREATE INDEX IF NOT EXISTS idx_products_price_min ON public.products(price_min);
+CREATE INDEX IF NOT EXISTS idx_products_price_max ON public.products(price_max);
+CREATE INDEX IF NOT EXISTS idx_products_currency_price_min ON public.products(currency, price_min);
+
+COMMENT ON COLUMN public.products.price_min IS 'Lowest parsed price amount (equals price_max for a single price)';
+COMMENT ON COLUMN public.products.price_max IS 'Highest parsed price amount';
+COMMENT ON COLUMN public.products.price_unit IS 'Unit the price is per (e.g., piece, set, kg)';
@@ -0,0 +1,29 @@
+-- Migration: Make product_url unique so the bot can upsert instead of insert
+-- Run this SQL in your Supabase SQL Editor (after supabase_migration_extended_fields.sql)
+
+-- Remove duplicate rows left by earlier re-scrapes, keeping the newest one
+DELETE FROM public.products a
+USING public.products b
+WHERE a.product_url IS NOT NULL
+  AND a.product_url = b.product_url
+  AND a.id < b.id;
+
+-- Replace the plain lookup index with a unique one
+-- (ON CONFLICT (product_url) requires a unique index; NULL urls stay allowed)
+DROP INDEX IF EXISTS idx_products_url;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_products_product_url_unique ON public.products(product_url);
+
+-- An upsert that hits an existing row is an UPDATE. The anon key ships with the
+-- bot, so an anonymous UPDATE policy would let anyone rewrite every product:
+-- only the service role may update. With the anon key the bot inserts new
+-- products and leaves existing rows untouched (ON CONFLICT DO NOTHING); set
+-- SUPABASE_KEY to the service role key to refresh existing rows as well.
+DROP POLICY IF EXISTS "Allow anonymous updates" ON public.products;
+REVOKE UPDATE ON public.products FROM anon;
+DROP POLICY IF EXISTS "Allow service role updates" ON public.products;
+CREATE POLICY "Allow service role updates"
+ON public.products
+FOR UPDATE
+TO service_role
+USING (true)
+WITH CHECK (true);
@@ -5,3 +5,6 @@ from pathlib import Path
 # Ensure project python-product-AIBot is importable
 ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
 sys.path.insert(0, str(ROOT))
+
+# Fake pages are served instantly; keep the shared per-domain rate limiter from pacing them
+os.environ.setdefault("SCRAPER_RATE_LIMIT", "0")
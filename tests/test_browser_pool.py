@@ -0,0 +1,246 @@
+"""Tests for the shared browser pool"""
+import asyncio
+import logging
+import sys
+import threading
+import types
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+import scraper.browser_pool as browser_pool
+import scraper.url_scraper_async as url_scraper_async
+from scraper.browser_pool import BrowserPool
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+        self._handlers = {}
+
+    def on(self, event, handler):
+        self._handlers[event] = handler
+
+    async def new_page(self):
+        self._handlers["page"](object())
+        return object()
+
+    async def add_init_script(self, script):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.contexts = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+        self.connected = False
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launched = []
+
+    async def launch(self, headless=True, args=None):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+        self.stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+
+class FakeStarter:
+    def __init__(self, playwright):
+        self._playwright = playwright
+
+    async def start(self):
+        return self._playwright
+
+
+def _patch_playwright(monkeypatch):
+    fake = FakePlaywright()
+    monkeypatch.setattr(browser_pool, "async_playwright", lambda: FakeStarter(fake))
+    return fake
+
+
+def test_pool_reuses_warm_browsers(monkeypatch):
+    """Contexts come from the same launched browsers across jobs"""
+    fake = _patch_playwright(monkeypatch)
+
+    async def run():
+        pool = BrowserPool(size=2)
+        for _ in range(5):
+            async with pool.context() as context:
+                await context.new_page()
+        stats = pool.stats()
+        await pool.close()
+        return stats
+
+    stats = asyncio.run(run())
+    assert len(fake.chromium.launched) == 2
+    assert stats["pages_served"] == 5
+    assert stats["active_contexts"] == 0
+    assert all(c.closed for b in fake.chromium.launched for c in b.contexts)
+    assert fake.stopped
+
+
+def test_pool_recycles_after_page_limit(monkeypatch):
+    """A browser is replaced once it reaches max_pages_per_browser"""
+    fake = _patch_playwright(monkeypatch)
+
+    async def run():
+        pool = BrowserPool(size=1, max_pages_per_browser=2)
+        for _ in range(3):
+            async with pool.context() as context:
+                await context.new_page()
+        await pool.close()
+        return pool
+
+    pool = asyncio.run(run())
+    assert pool.browsers_recycled == 1
+    assert len(fake.chromium.launched) == 2
+    assert fake.chromium.launched[0].closed
+
+
+def test_pool_replaces_disconnected_browser(monkeypatch):
+    """health_check swaps out crashed browsers"""
+    fake = _patch_playwright(monkeypatch)
+
+    async def run():
+        pool = BrowserPool(size=1)
+        await pool.start()
+        fake.chromium.launched[0].connected = False
+        stats = await pool.health_check()
+        await pool.close()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats["browsers_recycled"] == 1
+    assert stats["healthy"] == 1
+
+
+def test_get_browser_pool_is_per_event_loop(monkeypatch):
+    """A pool left behind by a finished event loop is not reused"""
+    _patch_playwright(monkeypatch)
+    first = asyncio.run(browser_pool.get_browser_pool())
+    second = asyncio.run(browser_pool.get_browser_pool())
+    assert first is not second
+    asyncio.run(browser_pool.shutdown_browser_pool())
+
+
+class FakeDriverProcess:
+    def __init__(self):
+        self.returncode = None
+
+    def kill(self):
+        self.returncode = -9
+
+
+def _attach_driver(playwright):
+    process = FakeDriverProcess()
+    transport = types.SimpleNamespace(_proc=process)
+    connection = types.SimpleNamespace(_transport=transport)
+    playwright._impl_obj = types.SimpleNamespace(_connection=connection)
+    return process
+
+
+async def _start_global_pool():
+    pool = await browser_pool.get_browser_pool()
+    async with pool.context():
+        pass
+    return pool
+
+
+def test_stale_pool_of_finished_loop_kills_driver(monkeypatch):
+    """The driver of a pool whose loop has finished is killed, not leaked"""
+    fake = _patch_playwright(monkeypatch)
+    process = _attach_driver(fake)
+    first = asyncio.run(_start_global_pool())
+    second = asyncio.run(browser_pool.get_browser_pool())
+    assert first is not second
+    assert first._closed
+    assert process.returncode == -9
+    asyncio.run(browser_pool.shutdown_browser_pool())
+
+
+def test_stale_pool_without_driver_handle_logs_warning(monkeypatch, caplog):
+    """A stale pool that cannot be shut down is reported"""
+    _patch_playwright(monkeypatch)
+    asyncio.run(_start_global_pool())
+    with caplog.at_level(logging.WARNING, logger=browser_pool.__name__):
+        asyncio.run(browser_pool.get_browser_pool())
+    assert "may still be running" in caplog.text
+    asyncio.run(browser_pool.shutdown_browser_pool())
+
+
+def test_stale_pool_on_running_loop_is_closed_there(monkeypatch):
+    """A pool whose loop still runs in another thread is closed on that loop"""
+    fake = _patch_playwright(monkeypatch)
+    process = _attach_driver(fake)
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        first = asyncio.run_coroutine_threadsafe(_start_global_pool(), other_loop).result(5)
+        asyncio.run(browser_pool.get_browser_pool())
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other_loop).result(5)
+        assert first._closed
+        assert fake.stopped
+        assert all(browser.closed for browser in fake.chromium.launched)
+        assert process.returncode is None
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(5)
+        other_loop.close()
+    asyncio.run(browser_pool.shutdown_browser_pool())
+
+
+def test_sync_calls_share_one_warm_pool(monkeypatch):
+    """Back-to-back sync scrapes reuse the browsers of the first one"""
+    fake = _patch_playwright(monkeypatch)
+    starts = []
+    monkeypatch.setattr(browser_pool, "async_playwright", lambda: starts.append(1) or FakeStarter(fake))
+
+    async def fake_scrape_tiered(url, max_results, scraper=None, enrich=False):
+        pool = await browser_pool.get_browser_pool()
+        async with pool.context() as context:
+            await context.new_page()
+        return [{"url": url}], "browser"
+
+    monkeypatch.setattr(url_scraper_async, "scrape_tiered", fake_scrape_tiered)
+    monkeypatch.setattr(url_scraper_async, "create_scraper", lambda url=None, site_name=None: object())
+    try:
+        url_scraper_async.scrape_from_url_sync("https://example.com/a")
+        launched = len(fake.chromium.launched)
+        url_scraper_async.scrape_from_url_sync("https://example.com/b")
+        url_scraper_async.scrape_many_sync(["https://example.com/c"])
+        assert len(starts) == 1
+        assert len(fake.chromium.launched) == launched
+        assert not any(browser.closed for browser in fake.chromium.launched)
+    finally:
+        url_scraper_async._stop_sync_loop()
+    assert fake.stopped
+    assert all(browser.closed for browser in fake.chromium.launched)
@@ -0,0 +1,76 @@
+"""Tests for single round-trip card extraction"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper.card_spec import EXTRACT_CARDS_JS
+from scraper.sites.amazon_scraper import AmazonScraper
+from scraper.sites.alibaba_scraper import AlibabaScraper
+
+
+class FakePage:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def evaluate(self, script, arg=None):
+        self.calls.append((script, arg))
+        return self.rows
+
+    def locator(self, selector):
+        class L:
+            async def all(self_inner):
+                return ["item"]
+        return L()
+
+
+def test_cards_extracted_in_one_evaluate():
+    """All cards come back from a single evaluate call and are normalized"""
+    page = FakePage([
+        {"title": " Power Bank ", "url": "/dp/B01", "price": "$12.99",
+         "images": ["https://img/1.jpg"], "rating": "4.5 out of 5 stars", "review_count": "1,234"},
+        {"title": None, "url": None, "price": "$1", "images": [], "rating": None, "review_count": None},
+    ])
+    scraper = AmazonScraper()
+    products = asyncio.run(scraper._extract_cards(
+        page, ".card", 10, "https://www.amazon.co.uk/s?k=x", scraper._extract_search_result_item
+    ))
+
+    assert len(page.calls) == 1
+    assert page.calls[0][0] == EXTRACT_CARDS_JS
+    assert page.calls[0][1]["selector"] == ".card"
+    assert len(products) == 1
+    product = products[0]
+    assert product["title"] == "Power Bank"
+    assert product["url"] == "https://www.amazon.co.uk/dp/B01"
+    assert product["rating"] == 4.5
+    assert product["review_count"] == 1234
+    assert product["source"] == "Amazon"
+    assert product["currency"] == "USD"
+
+
+def test_price_only_cards_allowed_where_site_accepts_them():
+    """Alibaba keeps cards with a price but no title, like its locator path"""
+    page = FakePage([{"title": None, "price": "US$1.20", "images": ["//s.alicdn.com/a.jpg"], "url": None}])
+    scraper = AlibabaScraper()
+    products = asyncio.run(scraper._extract_cards(
+        page, ".card", 10, "https://www.alibaba.com/trade/search", scraper._extract_product
+    ))
+    assert products[0]["price"] == "US$1.20"
+    assert products[0]["images"] == ["https://s.alicdn.com/a.jpg"]
+
+
+def test_falls_back_to_locators_when_fast_path_is_empty():
+    """The legacy per-card path runs if the evaluate path finds nothing"""
+    page = FakePage([])
+    scraper = AmazonScraper()
+
+    async def extract_item(item, base_url):
+        return {"title": "from locator"}
+
+    products = asyncio.run(scraper._extract_cards(page, ".card", 10, "https://www.amazon.com/s?k=x", extract_item))
+    assert products == [{"title": "from locator"}]
@@ -0,0 +1,89 @@
+"""Tests for concurrent product-detail enrichment"""
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper.enrich import enrich_products, merge_detail
+from scraper.sites.ebay_scraper import eBayScraper
+
+
+class FakePage:
+    async def close(self):
+        pass
+
+
+class DetailScraper(eBayScraper):
+    politeness_delay = (0, 0)
+
+    def __init__(self, slow=()):
+        super().__init__()
+        self.slow = set(slow)
+        self.active = {}
+        self.peak = {}
+        self.peak_tabs = 0
+
+    @asynccontextmanager
+    async def _browser_context(self):
+        yield object()
+
+    async def _new_page(self, context):
+        return FakePage()
+
+    async def _navigate(self, page, url):
+        pass
+
+    async def _is_blocked(self, page):
+        return False
+
+    async def _wait_for_product_page(self, page):
+        pass
+
+    async def _scrape_product_page(self, page, url):
+        domain = url.split("/")[2]
+        self.active[domain] = self.active.get(domain, 0) + 1
+        self.peak[domain] = max(self.peak.get(domain, 0), self.active[domain])
+        self.peak_tabs = max(self.peak_tabs, sum(self.active.values()))
+        await asyncio.sleep(5 if url in self.slow else 0.01)
+        self.active[domain] -= 1
+        return {"title": "Detail", "description": f"About {url}", "images": ["https://img/detail.jpg"],
+                "rating": 4.5, "review_count": 12}
+
+
+def _listing(hosts, count):
+    return [{"title": f"Item {h}{i}", "price": "$1", "url": f"https://{h}/itm/{i}",
+             "images": ["https://img/thumb.jpg"], "description": "", "rating": None, "review_count": None}
+            for h in hosts for i in range(count)]
+
+
+def test_enrichment_merges_details_within_caps():
+    products = _listing(["www.ebay.com", "www.ebay.co.uk"], 4)
+    scraper = DetailScraper()
+
+    asyncio.run(enrich_products(products, scraper, max_tabs=3, per_domain=2, deadline=5))
+
+    assert scraper.peak_tabs <= 3
+    assert max(scraper.peak.values()) <= 2
+    assert all(p["description"].startswith("About") for p in products)
+    assert products[0]["title"] == "Item www.ebay.com0"
+    assert products[0]["images"] == ["https://img/thumb.jpg", "https://img/detail.jpg"]
+    assert products[0]["rating"] == 4.5 and products[0]["review_count"] == 12
+
+
+def test_deadline_leaves_slow_products_unenriched():
+    products = _listing(["www.ebay.com"], 2)
+    scraper = DetailScraper(slow=[products[1]["url"]])
+
+    asyncio.run(enrich_products(products, scraper, max_tabs=2, per_domain=2, deadline=0.5))
+
+    assert products[0]["description"]
+    assert products[1]["description"] == ""
+
+
+def test_merge_detail_ignores_missing_detail():
+    product = {"title": "A", "description": "short", "images": []}
+    assert merge_detail(product, None) == {"title": "A", "description": "short", "images": []}
@@ -0,0 +1,103 @@
+"""Tests for the HTTP-first fetch tier"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+import scraper.fetch_tier as fetch_tier
+from scraper.base_scraper import BaseScraper
+from scraper.fetch_tier import TierMemory, looks_like_bot_wall, scrape_tiered
+
+LISTING = "<html><head><title>Results</title></head><body>" + "<div class='card'>x</div>" * 200 + "</body></html>"
+CAPTCHA = "<html><head><title>Robot Check</title></head><body>" + "." * 600 + "</body></html>"
+
+
+class FakeFetcher:
+    def __init__(self, status, html):
+        self.status, self.html, self.calls = status, html, 0
+
+    async def fetch(self, url, headers=None):
+        self.calls += 1
+        return self.status, self.html, {}, url
+
+
+class FakeScraper(BaseScraper):
+    http_tier_ok = True
+    max_pages = 1
+
+    def __init__(self, static_products, browser_products):
+        super().__init__("Fake")
+        self.static_products = static_products
+        self.browser_products = browser_products
+        self.browser_calls = 0
+
+    def _is_search_page(self, url):
+        return "/s?" in url
+
+    def extract_from_html(self, html, base_url, max_results=10):
+        return self.static_products[:max_results]
+
+    async def scrape_from_url(self, url, max_results=10):
+        self.browser_calls += 1
+        return self.browser_products[:max_results]
+
+    async def _scrape_search_results(self, page, max_results, base_url):
+        return []
+
+
+def _run(scraper, fetcher, memory, url="https://shop.example/s?k=cup"):
+    return asyncio.run(scrape_tiered(url, 5, scraper=scraper, fetcher=fetcher, memory=memory))
+
+
+def test_bot_wall_detection():
+    assert looks_like_bot_wall(503, LISTING)
+    assert looks_like_bot_wall(200, CAPTCHA)
+    assert looks_like_bot_wall(200, "")
+    assert not looks_like_bot_wall(200, LISTING)
+
+
+def test_static_hit_skips_browser(monkeypatch):
+    monkeypatch.setattr(fetch_tier, "http_tier_available", lambda: True)
+    scraper = FakeScraper([{"title": "Cup"}], [{"title": "Cup (browser)"}])
+    memory = TierMemory()
+
+    products, tier = _run(scraper, FakeFetcher(200, LISTING), memory)
+
+    assert tier == "http" and products == [{"title": "Cup"}]
+    assert scraper.browser_calls == 0
+    assert memory.snapshot() == {"shop.example": "http"}
+
+
+def test_bot_wall_escalates_and_is_remembered(monkeypatch):
+    monkeypatch.setattr(fetch_tier, "http_tier_available", lambda: True)
+    scraper = FakeScraper([{"title": "Cup"}], [{"title": "Cup (browser)"}])
+    fetcher = FakeFetcher(200, CAPTCHA)
+    memory = TierMemory()
+
+    products, tier = _run(scraper, fetcher, memory)
+    assert tier == "browser" and products == [{"title": "Cup (browser)"}]
+    assert memory.preferred("shop.example") == "browser"
+
+    # The domain now goes straight to the browser
+    _run(scraper, fetcher, memory)
+    assert fetcher.calls == 1 and scraper.browser_calls == 2
+
+
+def test_product_pages_use_browser(monkeypatch):
+    monkeypatch.setattr(fetch_tier, "http_tier_available", lambda: True)
+    scraper = FakeScraper([{"title": "Cup"}], [{"title": "Cup (browser)"}])
+    fetcher = FakeFetcher(200, LISTING)
+
+    _, tier = _run(scraper, fetcher, TierMemory(), url="https://shop.example/dp/1")
+
+    assert tier == "browser" and fetcher.calls == 0
+
+
+def test_tier_memory_persists(tmp_path):
+    path = str(tmp_path / "tiers.json")
+    TierMemory(path).record("shop.example", "browser")
+    assert TierMemory(path).preferred("shop.example") == "browser"
+    assert TierMemory(path, ttl=0).preferred("shop.example") is None
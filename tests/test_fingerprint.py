@@ -0,0 +1,106 @@
+"""Tests for product fingerprints and change-only writes"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper.fingerprint import FingerprintIndex, product_fingerprint
+from scraper.streaming import emit_product
+from scraper.write_behind import write_behind
+
+
+def _product(i, price="$10.00"):
+    return {"title": f"Item {i}", "price": price, "url": f"https://shop.example/p/{i}?utm_source=ad",
+            "images": [f"https://img.example/{i}.jpg"], "rating": 4.5}
+
+
+def test_fingerprint_ignores_formatting_and_untracked_fields():
+    product = _product(1)
+    reformatted = dict(product, title="  Item 1 ", rating=3.0, description="new copy")
+
+    assert product_fingerprint(product) == product_fingerprint(reformatted)
+    assert product_fingerprint(product) != product_fingerprint(_product(1, "$9.99"))
+    assert len(product_fingerprint(product)) == 16
+
+
+def test_rescrape_only_reports_new_and_changed_products(tmp_path):
+    index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    first = index.diff([_product(i) for i in range(5)])
+    assert (first.new, first.updated, first.unchanged) == (5, 0, 0)
+    index.commit(first)
+
+    # Same catalog, tracking params dropped, one price change and one new product
+    rescrape = [dict(_product(i), url=f"https://shop.example/p/{i}") for i in range(5)]
+    rescrape[2] = _product(2, "$8.00")
+    rescrape.append(_product(5))
+    second = FingerprintIndex(str(tmp_path / "fingerprints.db")).diff(rescrape)
+
+    assert (second.new, second.updated, second.unchanged) == (1, 1, 4)
+    assert [p["price"] for p in second.changed] == ["$8.00", "$10.00"]
+
+
+def test_uncommitted_changes_are_written_again():
+    index = FingerprintIndex()
+    index.diff([_product(1)])
+
+    assert len(index.diff([_product(1)])) == 1
+    assert len(index) == 0
+
+
+def test_products_without_url_are_always_written():
+    index = FingerprintIndex()
+    anonymous = {"title": "No link", "price": "$1"}
+    index.commit(index.diff([anonymous]))
+
+    assert index.diff([anonymous]).changed == [anonymous]
+
+
+def test_distinct_products_sharing_a_url_are_all_written():
+    index = FingerprintIndex()
+    red = {"title": "Red mug", "price": "$5", "url": "https://shop.example/s?q=mug"}
+    blue = {"title": "Blue mug", "price": "$6", "url": "https://shop.example/s?q=mug"}
+
+    changes = index.diff([red, blue, _product(1), _product(1)])
+    index.commit(changes)
+
+    assert changes.changed == [red, blue, _product(1)]
+    assert (changes.new, changes.unchanged) == (3, 1)
+    assert index.diff([red, blue]).changed == [red, blue]
+    assert len(index) == 1
+
+
+def test_write_behind_skips_unchanged_products():
+    index = FingerprintIndex()
+    written = []
+
+    async def scrape(products):
+        async with write_behind(written.extend, batch_size=10, flush_interval=0.01,
+                                fingerprints=index) as sink:
+            for product in products:
+                emit_product(product)
+        return sink.stats()
+
+    first = asyncio.run(scrape([_product(i) for i in range(3)]))
+    second = asyncio.run(scrape([_product(0), _product(1, "$5.00"), _product(2)]))
+
+    assert (first["written"], first["unchanged"]) == (3, 0)
+    assert (second["written"], second["unchanged"]) == (1, 2)
+    assert [row["price"] for row in written] == ["$10.00", "$10.00", "$10.00", "$5.00"]
+
+
+def test_failed_writes_are_not_recorded():
+    index = FingerprintIndex()
+
+    def failing(rows):
+        raise RuntimeError("database down")
+
+    async def scrape():
+        async with write_behind(failing, flush_interval=0.01, fingerprints=index) as sink:
+            emit_product(_product(1))
+        return sink.stats()
+
+    assert asyncio.run(scrape())["failed"] == 1
+    assert len(index.diff([_product(1)])) == 1
@@ -0,0 +1,134 @@
+"""Tests for recorded-fixture replay"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper.fixture_replay import (MODE_RECORD, FixtureFetcher, FixtureRouter, FixtureStore,
+                                    get_fixture_store)
+
+URL = "https://www.amazon.com/s?k=power+bank"
+HTML = "<html><body><div class='card'>Power bank</div></body></html>"
+
+
+class FakeRequest:
+    def __init__(self, resource_type, url):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class FakeResponse:
+    status = 200
+    headers = {"content-type": "text/html"}
+
+    async def text(self):
+        return "<html>live</html>"
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = FakeRequest(resource_type, url)
+        self.outcome = None
+        self.fulfilled = None
+
+    async def fulfill(self, status=None, body=None, content_type=None, response=None):
+        self.outcome = "fulfill"
+        self.fulfilled = {"status": status, "body": body, "content_type": content_type, "response": response}
+
+    async def fetch(self):
+        return FakeResponse()
+
+    async def abort(self, error_code=None):
+        self.outcome = "abort"
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+
+class FakeUpstream:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers=None):
+        self.calls.append(url)
+        return 200, "<html>fetched</html>", {"Content-Type": "text/html"}, url
+
+    def close(self):
+        pass
+
+
+def test_store_persists_index_and_matches_canonical_urls(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    path = store.add(URL, HTML, site="Amazon")
+
+    reopened = FixtureStore(str(tmp_path))
+    fixture = reopened.get(URL + "&utm_source=newsletter#results")
+
+    assert path.parent.name == "Amazon"
+    assert fixture is not None and fixture.body == HTML and fixture.status == 200
+    assert reopened.urls() == [URL] and len(reopened) == 1
+    assert reopened.get("https://www.amazon.com/s?k=cable") is None
+
+
+def test_router_serves_fixtures_and_aborts_everything_else(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    store.add(URL, HTML)
+    router = FixtureRouter(store)
+    hit = FakeRoute("document", URL)
+    miss = FakeRoute("document", "https://www.amazon.com/s?k=cable")
+    image = FakeRoute("image", "https://m.media-amazon.com/a.jpg")
+
+    async def run():
+        for route in (hit, miss, image):
+            await router._handle_route(route)
+
+    asyncio.run(run())
+
+    assert hit.outcome == "fulfill" and hit.fulfilled["body"] == HTML
+    assert miss.outcome == "abort" and image.outcome == "abort"
+    assert router.stats()["missing"] == ["https://www.amazon.com/s?k=cable"]
+
+
+def test_router_records_documents_in_record_mode(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    router = FixtureRouter(store, MODE_RECORD)
+    document = FakeRoute("document", URL)
+    image = FakeRoute("image", "https://m.media-amazon.com/a.jpg")
+
+    async def run():
+        await router._handle_route(document)
+        await router._handle_route(image)
+
+    asyncio.run(run())
+
+    assert document.outcome == "fulfill" and isinstance(document.fulfilled["response"], FakeResponse)
+    assert image.outcome == "fallback"
+    assert store.get(URL).body == "<html>live</html>"
+    assert router.stats()["recorded"] == 1
+
+
+def test_fetcher_replays_and_records_misses(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    store.add(URL, HTML)
+
+    offline = FixtureFetcher(store)
+    assert asyncio.run(offline.fetch(URL))[:2] == (200, HTML)
+    assert asyncio.run(offline.fetch("https://www.amazon.com/s?k=cable"))[0] == 404
+
+    upstream = FakeUpstream()
+    recording = FixtureFetcher(store, upstream)
+    status, body, _, _ = asyncio.run(recording.fetch("https://www.amazon.com/s?k=cable"))
+    assert (status, body) == (200, "<html>fetched</html>")
+    assert store.get("https://www.amazon.com/s?k=cable").body == "<html>fetched</html>"
+    assert recording.get(URL)[1] == HTML and len(upstream.calls) == 1
+
+
+def test_fixture_mode_is_off_without_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("SCRAPER_FIXTURES", raising=False)
+    assert get_fixture_store() is None
+
+    monkeypatch.setenv("SCRAPER_FIXTURES", str(tmp_path))
+    assert get_fixture_store().directory == tmp_path
@@ -0,0 +1,143 @@
+"""Tests for the shared backend HTTP client"""
+import asyncio
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper.connector import http_client
+from scraper.connector.http_client import AsyncHttpClient, HttpClient
+
+
+class FakeResponse:
+    def __init__(self, status, payload=None, headers=None):
+        self.status_code = status
+        self.payload = payload
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def request(self, method, url, data=None, headers=None, params=None, timeout=None):
+        self.requests.append({"method": method, "url": url, "data": data, "headers": headers})
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(http_client.time, "sleep", lambda seconds: None)
+
+
+def test_retries_5xx_and_connection_errors_then_succeeds():
+    session = FakeSession([ConnectionError("reset"), FakeResponse(503), FakeResponse(200, {"ok": True})])
+    client = HttpClient(retries=3, session=session)
+
+    assert client.post_json("https://api.example/start", {"q": 1},
+                            headers={"Idempotency-Key": "start-1"}) == {"ok": True}
+
+    stats = client.metrics.stats()
+    assert len(session.requests) == 3
+    assert stats["calls"] == 1 and stats["retries"] == 2 and stats["errors"] == 0
+    assert stats["latency_p95"] >= 0
+
+
+def test_gives_up_after_retries():
+    session = FakeSession([FakeResponse(500), FakeResponse(502)])
+    client = HttpClient(retries=1, session=session)
+
+    with pytest.raises(RuntimeError, match="HTTP 502"):
+        client.post_json("https://api.example/start", {}, headers={"Idempotency-Key": "start-1"})
+    assert client.metrics.stats()["errors"] == 1
+
+
+def test_post_without_idempotency_key_is_not_replayed():
+    """A POST that may have reached the server is not sent twice"""
+    for outcome in (ConnectionError("reset"), TimeoutError("read timed out")):
+        session = FakeSession([outcome, FakeResponse(200)])
+        with pytest.raises(type(outcome)):
+            HttpClient(retries=3, session=session).post_json("https://api.example/insert-products", {})
+        assert len(session.requests) == 1
+
+    session = FakeSession([FakeResponse(503), FakeResponse(200)])
+    with pytest.raises(RuntimeError, match="HTTP 503"):
+        HttpClient(retries=3, session=session).post_json("https://api.example/insert-products", {})
+    assert len(session.requests) == 1
+
+
+def test_post_retries_when_the_server_never_saw_it():
+    session = FakeSession([ConnectionRefusedError("refused"), FakeResponse(429), FakeResponse(200, {"ok": True})])
+    client = HttpClient(retries=3, session=session)
+
+    assert client.post_json("https://api.example/insert-products", {}) == {"ok": True}
+    assert len(session.requests) == 3
+
+
+def test_idempotent_methods_retry_any_failure():
+    session = FakeSession([TimeoutError("read timed out"), FakeResponse(502), FakeResponse(200)])
+    client = HttpClient(retries=3, session=session)
+
+    assert client.request("GET", "https://api.example/jobs").status_code == 200
+    assert len(session.requests) == 3
+
+
+def test_client_errors_are_not_retried():
+    session = FakeSession([FakeResponse(400)])
+    client = HttpClient(retries=3, session=session)
+
+    with pytest.raises(RuntimeError):
+        client.post_json("https://api.example/start", {})
+    assert len(session.requests) == 1
+
+
+def test_large_bodies_are_gzipped():
+    session = FakeSession([FakeResponse(200, {}), FakeResponse(200, {})])
+    client = HttpClient(gzip_min_bytes=100, session=session)
+    products = [{"title": "Product %d" % i, "price": "$1"} for i in range(50)]
+
+    client.post_json("https://api.example/insert-products", {"products": products})
+    client.post_json("https://api.example/complete", {"jobId": "j"})
+
+    big, small = session.requests
+    assert big["headers"]["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(big["data"])) == {"products": products}
+    assert "Content-Encoding" not in small["headers"]
+    assert client.metrics.stats()["bytes_saved"] > 0
+
+
+def test_backoff_is_jittered_and_capped():
+    client = HttpClient(backoff=1.0, max_backoff=4.0, session=FakeSession([]))
+    delays = [client._delay(attempt) for attempt in range(6) for _ in range(20)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+    assert client._delay(0, FakeResponse(429, headers={"Retry-After": "2"})) == 2.0
+
+
+def test_async_client_shares_pool_and_metrics():
+    session = FakeSession([FakeResponse(200, {"n": i}) for i in range(4)])
+    client = AsyncHttpClient(HttpClient(session=session), max_concurrency=2)
+
+    async def main():
+        return await asyncio.gather(*(client.post_json("https://api.example/x", {"i": i}) for i in range(4)))
+
+    results = asyncio.run(main())
+    assert sorted(r["n"] for r in results) == [0, 1, 2, 3]
+    assert client.metrics.stats()["calls"] == 4
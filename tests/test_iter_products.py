@@ -0,0 +1,198 @@
+"""Tests for the streaming iter_products API"""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper.base_scraper import BaseScraper
+from scraper.streaming import emit_product, iterate_sync, product_sink, stream_products
+
+
+class StreamingScraper(BaseScraper):
+    """Emits one product per 'page', like _merge_unique does"""
+
+    def __init__(self, count=4, delay=0.02):
+        super().__init__("Fake")
+        self.count = count
+        self.delay = delay
+        self.emitted = 0
+        self.cancelled = False
+
+    def _is_search_page(self, url):
+        return True
+
+    async def scrape_from_url(self, url, max_results=10):
+        products = []
+        try:
+            for i in range(min(self.count, max_results)):
+                await asyncio.sleep(self.delay)
+                product = {"title": f"  Item {i}  ", "price": "$1", "url": f"https://shop.example/p/{i}"}
+                products.append(product)
+                emit_product(product)
+                self.emitted += 1
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return products
+
+    async def _scrape_search_results(self, page, max_results, base_url):
+        return []
+
+
+def test_products_arrive_before_the_scrape_finishes():
+    scraper = StreamingScraper()
+
+    async def run():
+        seen = []
+        async for product in scraper.iter_products("https://shop.example/s?q=x", 10):
+            seen.append((product["title"], scraper.emitted))
+        return seen
+
+    seen = asyncio.run(run())
+
+    assert [title for title, _ in seen] == ["Item 0", "Item 1", "Item 2", "Item 3"]
+    # The first product was consumed while the other three were still to come
+    assert seen[0][1] < 4
+
+
+def test_breaking_early_cancels_the_scrape():
+    scraper = StreamingScraper(count=50, delay=0.01)
+
+    async def run():
+        async for product in scraper.iter_products("https://shop.example/s?q=x", 50, normalize=False):
+            if product["title"].strip() == "Item 1":
+                break
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    assert scraper.cancelled and scraper.emitted < 50
+
+
+def test_unstreamed_return_values_and_outer_sink_are_kept():
+    outer = []
+
+    async def scrape():
+        emit_product({"title": "streamed"})
+        return [{"title": "returned only"}]
+
+    async def run():
+        with product_sink(outer.append):
+            return [p async for p in stream_products(scrape())]
+
+    assert asyncio.run(run()) == [{"title": "streamed"}, {"title": "returned only"}]
+    assert outer == [{"title": "streamed"}]
+
+
+def test_slow_consumer_pauses_the_producer():
+    from scraper.streaming import wait_for_sink
+    produced = []
+
+    async def scrape():
+        for i in range(10):
+            emit_product({"i": i})
+            produced.append(i)
+            await wait_for_sink()
+        return []
+
+    async def run():
+        stream = stream_products(scrape(), max_buffered=2)
+        first = await stream.__anext__()
+        await asyncio.sleep(0.05)
+        backlog = len(produced)
+        rest = [p async for p in stream]
+        return first, backlog, rest
+
+    first, backlog, rest = asyncio.run(run())
+
+    assert first == {"i": 0}
+    assert backlog <= 3
+    assert [p["i"] for p in rest] == list(range(1, 10))
+
+
+def test_iterate_sync_streams_and_stops_early():
+    cleaned = threading.Event()
+    cancelled = threading.Event()
+
+    async def numbers():
+        try:
+            for i in range(1000):
+                await asyncio.sleep(0.001)
+                yield {"i": i}
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def cleanup():
+        cleaned.set()
+
+    taken = []
+    for product in iterate_sync(numbers, cleanup=cleanup):
+        taken.append(product["i"])
+        if len(taken) == 3:
+            break
+
+    assert taken == [0, 1, 2]
+    assert cancelled.is_set() and cleaned.is_set()
+
+
+def test_iterate_sync_on_a_shared_loop_leaves_it_running():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def numbers():
+        for i in range(50):
+            await asyncio.sleep(0.001)
+            yield {"i": i}
+
+    try:
+        taken = []
+        for product in iterate_sync(numbers, loop=loop):
+            taken.append(product["i"])
+            if len(taken) == 3:
+                break
+        assert taken == [0, 1, 2]
+        assert [p["i"] for p in iterate_sync(numbers, loop=loop)][-1] == 49
+        assert loop.is_running()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+def test_iterate_sync_reraises_stream_errors():
+    async def failing():
+        yield {"i": 0}
+        raise ValueError("boom")
+
+    stream = iterate_sync(failing)
+    assert next(stream) == {"i": 0}
+    with pytest.raises(ValueError):
+        next(stream)
+
+
+def test_generic_products_are_normalized():
+    """Generic products leave currency None; the default normalize path must accept that"""
+    from scraper.sites.generic_scraper import GenericScraper
+
+    class ListingScraper(GenericScraper):
+        http_tier_ok = False
+
+        async def scrape_from_url(self, url, max_results=10):
+            return self._build_products([{"title": " Mug ", "price": "$5", "url": "/p/1"}], url)
+
+    async def run():
+        return [p async for p in ListingScraper().iter_products("https://shop.example/s?q=mug", 10)]
+
+    (product,) = asyncio.run(run())
+
+    assert product["title"] == "Mug"
+    assert product["currency"] == ""
+    assert product["url"] == "https://shop.example/p/1"
@@ -0,0 +1,165 @@
+"""Tests for the local asyncio job server"""
+import asyncio
+import json
+import sys
+import urllib.request
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import job_server
+
+
+def _request(port, method, path, body=None, headers=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(f"http://127.0.0.1:{port}/api/scraper{path}", data=data, method=method,
+                                 headers=dict({"Content-Type": "application/json"}, **(headers or {})))
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+async def _with_server(tmp_path, scenario, runner=None, workers=2):
+    store = job_server.JobStore(str(tmp_path / "jobs.db"))
+    server = job_server.JobServer(store, workers=workers, runner=runner or job_server._run_scrape)
+    await server.start("127.0.0.1", 0)
+    try:
+        return await scenario(server.port, store)
+    finally:
+        await server.close()
+        store.close()
+
+
+def test_start_insert_complete_protocol(tmp_path):
+    async def scenario(port, store):
+        call = lambda *a: asyncio.to_thread(_request, port, *a)
+        status, started = await call("POST", "/start", {"query": "mug", "marketplace": "Amazon", "maxResults": 5})
+        job_id = started["jobId"]
+        assert status == 200 and job_id.startswith("job-")
+
+        _, inserted = await call("POST", "/insert-products", {"jobId": job_id, "products": [{"title": "Mug"}]})
+        assert inserted == {"ok": True, "received": 1}
+        assert (await call("POST", "/complete", {"jobId": job_id}))[1] == {"ok": True}
+
+        _, job = await call("GET", f"/status/{job_id}")
+        assert job["status"] == "completed" and job["product_count"] == 1
+        _, stored = await call("GET", f"/products/{job_id}")
+        assert stored["products"] == [{"title": "Mug"}]
+        assert (await call("POST", "/complete", {"jobId": "nope"}))[0] == 404
+
+    asyncio.run(_with_server(tmp_path, scenario))
+
+
+def test_repeated_idempotency_key_is_applied_once(tmp_path):
+    async def scenario(port, store):
+        call = lambda *a: asyncio.to_thread(_request, *((port,) + a))
+        _, started = await call("POST", "/start", {"query": "mug"}, {"Idempotency-Key": "s1"})
+        assert (await call("POST", "/start", {"query": "mug"}, {"Idempotency-Key": "s1"}))[1] == started
+        job_id = started["jobId"]
+
+        body = {"jobId": job_id, "products": [{"title": "Mug"}]}
+        first, second = await asyncio.gather(call("POST", "/insert-products", body, {"Idempotency-Key": "i1"}),
+                                             call("POST", "/insert-products", body, {"Idempotency-Key": "i1"}))
+        assert first == second == (200, {"ok": True, "received": 1})
+        await call("POST", "/insert-products", body, {"Idempotency-Key": "i2"})
+
+        assert store.get_job(job_id)["product_count"] == 2
+        assert store.counts() == {"started": 1}
+
+    asyncio.run(_with_server(tmp_path, scenario))
+
+
+def test_submitted_jobs_run_concurrently_on_worker_pool(tmp_path):
+    running = {"now": 0, "peak": 0}
+
+    async def runner(job):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.05)
+        running["now"] -= 1
+        if "fail" in job["url"]:
+            raise RuntimeError("blocked")
+        return [{"title": job["url"]}]
+
+    async def scenario(port, store):
+        call = lambda *a: asyncio.to_thread(_request, port, *a)
+        ids = []
+        for i in range(6):
+            status, body = await call("POST", "/submit", {"query": f"mug {i}", "marketplace": "eBay"})
+            assert status == 202
+            ids.append(body["jobId"])
+        _, failing = await call("POST", "/submit", {"url": "https://shop.example/fail"})
+        for _ in range(100):
+            _, counts = await call("GET", "/status")
+            if counts["jobs"].get("completed", 0) + counts["jobs"].get("failed", 0) == 7:
+                break
+            await asyncio.sleep(0.05)
+
+        assert counts["jobs"] == {"completed": 6, "failed": 1}
+        _, job = await call("GET", f"/status/{ids[0]}")
+        assert job["url"] == "https://www.ebay.com/sch/i.html?_nkw=mug+0"
+        assert store.get_products(ids[0]) == [{"title": job["url"]}]
+        assert "blocked" in store.get_job(failing["jobId"])["error"]
+        assert (await call("POST", "/submit", {"query": "mug", "marketplace": "Unknown"}))[0] == 400
+
+    asyncio.run(_with_server(tmp_path, scenario, runner=runner, workers=3))
+    assert running["peak"] == 3
+
+
+def test_running_jobs_are_requeued_after_restart(tmp_path):
+    store = job_server.JobStore(str(tmp_path / "jobs.db"))
+    job_id = store.create_job(job_server.STATUS_QUEUED, url="https://shop.example/s", max_results=3)
+    assert store.claim_next()["id"] == job_id
+    assert store.claim_next() is None
+    assert store.requeue_running() == 1
+    assert store.get_job(job_id)["status"] == "queued"
+    store.close()
+
+
+def test_metrics_endpoint_returns_prometheus_text(tmp_path):
+    from scraper import metrics
+
+    async def scenario(port, store):
+        def fetch():
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+                return resp.headers["Content-Type"], resp.read().decode("utf-8")
+        return await asyncio.to_thread(fetch)
+
+    content_type, body = asyncio.run(_with_server(tmp_path, scenario))
+
+    assert content_type == metrics.PROMETHEUS_CONTENT_TYPE
+    assert "# TYPE scraper_phase_seconds histogram" in body
+
+
+async def _raw_request(port, head: bytes):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line, _, rest = response.partition(b"\r\n")
+    return int(status_line.split()[1]), json.loads(rest.partition(b"\r\n\r\n")[2])
+
+
+def test_bad_requests_get_error_responses(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_server, "MAX_BODY_BYTES", 16)
+
+    async def scenario(port, store):
+        def broken_counts():
+            raise RuntimeError("database is locked")
+        store.counts = broken_counts
+        return [
+            await _raw_request(port, b"POST /api/scraper/start HTTP/1.1\r\nContent-Length: ten\r\n\r\n"),
+            await _raw_request(port, b"POST /api/scraper/start HTTP/1.1\r\nContent-Length: 100\r\n\r\n"),
+            await asyncio.to_thread(_request, port, "GET", "/status"),
+        ]
+
+    bad_length, too_large, failed = asyncio.run(_with_server(tmp_path, scenario))
+
+    assert bad_length == (400, {"error": "invalid Content-Length"})
+    assert too_large[0] == 413
+    assert failed == (500, {"error": "internal server error"})
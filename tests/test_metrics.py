@@ -0,0 +1,94 @@
+"""Tests for per-phase scrape metrics"""
+import asyncio
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper import metrics
+
+
+@pytest.fixture
+def recording():
+    metrics.registry.reset()
+    metrics.enable(otel=False)
+    yield metrics.registry
+    metrics.disable()
+    metrics.registry.reset()
+
+
+class FakeScraper:
+    site_name = "Fake"
+
+    @metrics.timed("extract")
+    async def extract(self):
+        await asyncio.sleep(0.01)
+        return ["product"]
+
+
+def test_disabled_hooks_are_shared_noops():
+    metrics.disable()
+    metrics.registry.reset()
+
+    assert metrics.timer("navigate", "Fake") is metrics.phase("ready")
+    with metrics.phase("navigate", "Fake"):
+        pass
+    metrics.count_captcha("amazon.com", "browser")
+    assert asyncio.run(FakeScraper().extract()) == ["product"]
+
+    assert metrics.registry.snapshot() == {"phases": {}, "counters": {}}
+
+
+def test_phases_and_counters_are_recorded(recording):
+    assert asyncio.run(FakeScraper().extract()) == ["product"]
+    timer = metrics.timer("insert", "supabase")
+    elapsed = timer.stop()
+    assert timer.stop() is None
+    metrics.count_captcha("amazon.com", "http")
+    metrics.count_scrape("amazon.com", "browser", 0)
+    metrics.count_scrape("amazon.com", "browser", 12)
+
+    snapshot = recording.snapshot()
+    assert snapshot["phases"][("extract", "Fake")]["count"] == 1
+    assert snapshot["phases"][("extract", "Fake")]["sum"] >= 0.01
+    assert snapshot["phases"][("insert", "supabase")]["sum"] == elapsed
+    counters = snapshot["counters"]
+    assert counters["scraper_captcha_total"] == {(("domain", "amazon.com"), ("tier", "http")): 1}
+    assert counters["scraper_empty_results_total"] == {(("domain", "amazon.com"),): 1}
+    assert counters["scraper_products_total"][(("domain", "amazon.com"), ("tier", "browser"))] == 12
+
+
+def test_prometheus_text_format(recording):
+    recording.observe("navigate", "Amazon", 0.2)
+    recording.observe("navigate", "Amazon", 3.0)
+    recording.inc("scraper_captcha_total", domain='we"ird', tier="browser")
+
+    text = metrics.render()
+
+    assert "# TYPE scraper_phase_seconds histogram" in text
+    assert 'scraper_phase_seconds_bucket{phase="navigate",site="Amazon",le="0.25"} 1' in text
+    assert 'scraper_phase_seconds_bucket{phase="navigate",site="Amazon",le="5.0"} 2' in text
+    assert 'scraper_phase_seconds_bucket{phase="navigate",site="Amazon",le="+Inf"} 2' in text
+    assert 'scraper_phase_seconds_count{phase="navigate",site="Amazon"} 2' in text
+    assert 'scraper_captcha_total{domain="we\\"ird",tier="browser"} 1' in text
+    assert text.endswith("\n")
+
+
+def test_http_endpoint_serves_metrics(recording):
+    recording.observe("launch", "pool", 1.5)
+    server = metrics.start_http_server(0, host="127.0.0.1")
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/metrics", timeout=5) as resp:
+            body = resp.read().decode("utf-8")
+            content_type = resp.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/plain")
+    assert 'scraper_phase_seconds_count{phase="launch",site="pool"} 1' in body
@@ -24,3 +24,9 @@ def test_normalize_without_source():
     assert norm["title"] == "Cable"
     assert norm["price"] == "$2"
     assert norm["source"] == "Alibaba"
+
+
+def test_none_fields_count_as_missing():
+    norm = normalize_product({"title": "Cable", "price": None, "currency": None, "url": None, "source": None})
+    assert norm["price"] == "" and norm["currency"] == "" and norm["url"] == ""
+    assert norm["source"] == "Alibaba"
@@ -0,0 +1,87 @@
+"""Tests for batch normalization"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python-product-AIBot"))
+
+from scraper.normalize import normalize_product, prepare_for_database
+from scraper.normalize_batch import NORMALIZED_FIELDS, normalize_batch, prepare_batch
+
+RAW_PRODUCTS = [
+    {"title": "  Steel Mug ", "price": " $9.99 ", "source": "Amazon", "description": " 12 oz ",
+     "images": ["https://img.example.com/a.jpg", "ftp://nope", {"data": "abc"}], "rating": 4.5,
+     "review_count": 120, "availability": "In stock", "url": " https://www.amazon.com/dp/B01 ",
+     "currency": "USD"},
+    {"title": "Plain Cup", "price": "", "rating": 7, "review_count": 3.9, "images": "https://img.example.com/b.jpg"},
+    {"title": "Teapot", "price": "US $20", "source": "AliExpress", "rating": -1, "review_count": None,
+     "images": [], "url": ""},
+    {"title": "Kettle", "price": "15", "rating": None, "review_count": 0, "description": "",
+     "images": "not-a-url"},
+]
+
+MIXED_PRODUCTS = RAW_PRODUCTS + [
+    {"title": "Tray", "price": "5", "rating": "4.2", "review_count": "1,204"},
+    {"title": "Jar", "price": "3", "rating": "n/a", "review_count": "17"},
+    {"title": "Spoon", "price": "2", "source": None, "url": None, "currency": None, "description": None},
+]
+
+
+def test_list_input_matches_scalar_path():
+    expected = [normalize_product(p) for p in MIXED_PRODUCTS]
+
+    normalized = normalize_batch(MIXED_PRODUCTS)
+
+    assert normalized == expected
+    assert prepare_batch(normalized) == [prepare_for_database(p) for p in expected]
+
+
+def test_nan_rating_is_treated_as_missing():
+    assert normalize_product({"rating": float("nan")})["rating"] is None
+
+
+@pytest.mark.parametrize("products", [RAW_PRODUCTS, MIXED_PRODUCTS], ids=["numeric", "mixed"])
+def test_dataframe_input_matches_scalar_path(products):
+    pd = pytest.importorskip("pandas")
+    expected = [normalize_product(p) for p in products]
+
+    frame = normalize_batch(pd.DataFrame(products))
+
+    assert list(frame.columns) == list(NORMALIZED_FIELDS)
+    assert frame.to_dict("records") == expected
+    assert prepare_batch(frame) == [prepare_for_database(p) for p in expected]
+
+
+def test_dataframe_missing_columns_get_scalar_defaults():
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"title": [" A ", "B"], "price": ["1", "2"]})
+
+    normalized = normalize_batch(frame)
+
+    assert normalized.to_dict("records") == [normalize_product({"title": " A ", "price": "1"}),
+                                             normalize_product({"title": "B", "price": "2"})]
+    assert prepare_batch(normalized) == [
+        {"name": "A", "price": "1", "source": "Alibaba", "images": [], "price_min": 1.0, "price_max": 1.0},
+        {"name": "B", "price": "2", "source": "Alibaba", "images": [], "price_min": 2.0, "price_max": 2.0},
+    ]
+
+
+def test_frame_like_objects_are_converted_with_to_pandas():
+    pd = pytest.importorskip("pandas")
+
+    class Table:
+        def to_pandas(self):
+            return pd.DataFrame(RAW_PRODUCTS)
+
+    assert prepare_batch(normalize_batch(Table())) == prepare_batch(normalize_batch(RAW_PRODUCTS))
+
+
+def test_non_text_fields_fail_like_the_scalar_path():
+    pd = pytest.importorskip("pandas")
+
+    with pytest.raises(AttributeError):
+        normalize_product({"title": 12})
+    with pytest.raises(AttributeError):
+        normalize_batch(pd.DataFrame([{"title": 12, "price": "1"}]))
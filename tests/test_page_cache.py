@@ -0,0 +1,149 @@
+"""Tests for the on-disk page cache"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+import scraper.fetch_tier as fetch_tier
+from scraper.base_scraper import BaseScraper
+from scraper.fetch_tier import TierMemory, scrape_tiered
+from scraper.page_cache import PageCache
+from scraper.url_utils import canonical_url
+
+URL = "https://shop.example/s?k=cup"
+LISTING = "<html><head><title>Results</title></head><body>" + "<div class='card'>x</div>" * 200 + "</body></html>"
+
+
+class FakeFetcher:
+    def __init__(self, status, html, headers=None):
+        self.status, self.html, self.headers = status, html, headers or {}
+        self.requests = []
+
+    async def fetch(self, url, headers=None):
+        self.requests.append(headers)
+        return self.status, self.html, dict(self.headers), url
+
+
+class FakeScraper(BaseScraper):
+    http_tier_ok = True
+    max_pages = 1
+    cache_ttl = 60
+
+    def __init__(self, products):
+        super().__init__("Fake")
+        self.products = products
+        self.static_calls = 0
+        self.browser_calls = 0
+
+    def _is_search_page(self, url):
+        return "/s?" in url
+
+    def extract_from_html(self, html, base_url, max_results=10):
+        self.static_calls += 1
+        return self.products[:max_results]
+
+    async def scrape_from_url(self, url, max_results=10):
+        self.browser_calls += 1
+        return self.products[:max_results]
+
+    async def _scrape_search_results(self, page, max_results, base_url):
+        return []
+
+
+def test_canonical_url_drops_tracking_and_sorts_query():
+    assert canonical_url("HTTPS://Shop.Example:443/s/?utm_source=x&k=cup&a=1#top") == \
+        "https://shop.example/s?a=1&k=cup"
+    assert canonical_url("https://shop.example/") == "https://shop.example/"
+    assert canonical_url("https://shop.example:8080/item?spm=abc") == "https://shop.example:8080/item"
+
+
+def test_put_and_lookup_round_trip_with_canonical_key():
+    cache = PageCache()
+    products = [{"title": "Cup", "url": "https://shop.example/p/1"}]
+    cache.put(URL + "&utm_campaign=spring", "Fake", products, html=LISTING, max_results=5, etag='"v1"')
+
+    cached, entry = cache.lookup(URL, "Fake", 5)
+
+    assert cached == products
+    assert entry.html == LISTING and entry.etag == '"v1"'
+    # A different site profile is a different page
+    assert cache.lookup(URL, "Other", 5) == (None, None)
+    assert cache.stats()["hits"] == 1
+
+
+def test_entry_only_covers_smaller_requests_or_exhausted_listings():
+    cache = PageCache()
+    cache.put(URL, "Fake", [{"title": str(i)} for i in range(5)], max_results=5)
+    assert cache.lookup(URL, "Fake", 3)[0] == [{"title": "0"}, {"title": "1"}, {"title": "2"}]
+    assert cache.lookup(URL, "Fake", 10)[0] is None
+
+    cache.put(URL, "Fake", [{"title": "only"}], max_results=5)
+    assert cache.lookup(URL, "Fake", 50)[0] == [{"title": "only"}]
+
+
+def test_expired_entry_is_returned_for_revalidation_only():
+    cache = PageCache()
+    cache.put(URL, "Fake", [{"title": "Cup"}], max_results=5, ttl=-1)
+
+    cached, entry = cache.lookup(URL, "Fake", 5)
+
+    assert cached is None
+    assert entry is not None and not entry.fresh
+
+
+def test_lru_eviction_keeps_cache_under_size_cap():
+    cache = PageCache(max_bytes=1)
+    html = "<p>" + "abc" * 1000 + "</p>"
+    cache.put("https://shop.example/a", "Fake", html=html)
+    cache.put("https://shop.example/b", "Fake", html=html)
+
+    assert cache.get("https://shop.example/a", "Fake") is None
+    assert cache.stats()["evicted"] >= 1
+
+    cache = PageCache(max_bytes=10_000)
+    for name in ("a", "b", "c"):
+        cache.put(f"https://shop.example/{name}", "Fake", html=html)
+        time.sleep(0.01)
+    cache.get("https://shop.example/a", "Fake")
+    cache.max_bytes = cache.stats()["bytes"] - 1
+    cache.put("https://shop.example/a", "Fake", html=html)
+    # b was the least recently used entry
+    assert cache.get("https://shop.example/b", "Fake") is None
+    assert cache.get("https://shop.example/c", "Fake") is not None
+
+
+def test_scrape_tiered_serves_fresh_hits_without_fetching(monkeypatch):
+    monkeypatch.setattr(fetch_tier, "http_tier_available", lambda: True)
+    cache = PageCache()
+    scraper = FakeScraper([{"title": "Cup"}])
+    fetcher = FakeFetcher(200, LISTING, {"etag": '"v1"'})
+
+    first = asyncio.run(scrape_tiered(URL, 5, scraper=scraper, fetcher=fetcher, memory=TierMemory(), cache=cache))
+    second = asyncio.run(scrape_tiered(URL, 5, scraper=scraper, fetcher=fetcher, memory=TierMemory(), cache=cache))
+
+    assert first == ([{"title": "Cup"}], "http")
+    assert second == ([{"title": "Cup"}], "cache")
+    assert len(fetcher.requests) == 1 and scraper.browser_calls == 0
+    assert cache.get(URL, "Fake").etag == '"v1"'
+
+
+def test_stale_entry_is_revalidated_with_conditional_request(monkeypatch):
+    monkeypatch.setattr(fetch_tier, "http_tier_available", lambda: True)
+    cache = PageCache()
+    cache.put(URL, "Fake", [{"title": "Cached cup"}], max_results=5,
+              etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT", ttl=-1)
+    scraper = FakeScraper([{"title": "New cup"}])
+    fetcher = FakeFetcher(304, "")
+
+    products, tier = asyncio.run(scrape_tiered(URL, 5, scraper=scraper, fetcher=fetcher,
+                                               memory=TierMemory(), cache=cache))
+
+    assert (products, tier) == ([{"title": "Cached cup"}], "cache")
+    assert fetcher.requests == [{"If-None-Match": '"v1"',
+                                 "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}]
+    assert scraper.browser_calls == 0
+    assert cache.get(URL, "Fake").fresh and cache.stats()["revalidated"] == 1
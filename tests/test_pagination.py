@@ -0,0 +1,100 @@
+"""Tests for multi-page listing crawls"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper.sites.amazon_scraper import AmazonScraper
+from scraper.sites.ebay_scraper import eBayScraper
+
+BASE = "https://www.amazon.com/s?k=mug"
+
+
+def _cards(page_number, count=3):
+    return [{"title": f"Mug {page_number}-{i}", "url": f"https://www.amazon.com/dp/{page_number}{i}"} for i in range(count)]
+
+
+class FakePage:
+    def __init__(self, log):
+        self.log = log
+        self.url = None
+        self.closed = False
+
+    async def evaluate(self, script, arg=None):
+        # Amazon shows a next link on pages 1 and 2 only
+        number = int(self.url.rsplit("page=", 1)[1]) if "page=" in self.url else 1
+        return f"/s?k=mug&page={number + 1}" if number < 3 else None
+
+    async def close(self):
+        self.closed = True
+
+
+class PagedScraper(AmazonScraper):
+    politeness_delay = (0, 0)
+    results_per_page = 3
+
+    def __init__(self, pages):
+        super().__init__()
+        self.pages = pages
+        self.log = []
+
+    async def _new_page(self, context):
+        return FakePage(self.log)
+
+    async def _navigate(self, page, url):
+        self.log.append(("open", url))
+        page.url = url
+
+    async def _is_blocked(self, page):
+        return False
+
+    async def _scrape_listing_page(self, page, max_results, url):
+        number = int(url.rsplit("page=", 1)[1]) if "page=" in url else 1
+        await asyncio.sleep(0.01)
+        self.log.append(("extract", url))
+        return self.pages.get(number, [])[:max_results]
+
+
+def _crawl(scraper, max_results):
+    first = FakePage(scraper.log)
+    first.url = BASE
+    return asyncio.run(scraper._scrape_listing_pages(object(), first, BASE, max_results))
+
+
+def test_prefetches_next_page_and_dedupes():
+    # Page 2 repeats one product from page 1
+    scraper = PagedScraper({1: _cards(1), 2: _cards(1)[2:] + _cards(2, 2), 3: _cards(3)})
+
+    products = _crawl(scraper, 7)
+
+    urls = [p["url"] for p in products]
+    assert len(urls) == len(set(urls)) == 7
+    # Page 2 was opened before page 1 was extracted
+    assert scraper.log.index(("open", BASE + "&page=2")) < scraper.log.index(("extract", BASE))
+
+
+def test_stops_once_max_results_reached():
+    scraper = PagedScraper({1: _cards(1), 2: _cards(2), 3: _cards(3)})
+
+    products = _crawl(scraper, 3)
+
+    assert len(products) == 3
+    assert not any(entry[0] == "open" for entry in scraper.log)
+
+
+def test_stops_when_no_next_page():
+    scraper = PagedScraper({1: _cards(1), 2: _cards(2), 3: _cards(3)})
+    scraper.page_param = None
+
+    products = _crawl(scraper, 50)
+
+    assert len(products) == 9
+
+
+def test_page_param_url_replaces_existing_value():
+    scraper = eBayScraper()
+    url = scraper._page_param_url("https://www.ebay.com/sch/i.html?_nkw=mug&_pgn=2", 3)
+    assert url == "https://www.ebay.com/sch/i.html?_nkw=mug&_pgn=3"
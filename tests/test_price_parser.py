@@ -0,0 +1,73 @@
+"""Tests for price parsing"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python-product-AIBot"))
+
+from scraper.normalize import prepare_for_database
+from scraper.price_parser import ParsedPrice, find_price, parse_price, parse_prices
+from scraper.product_detector import ProductDetector
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("US$1.20-3.50 / piece", ParsedPrice(1.2, 3.5, "USD", "piece")),
+    ("1.234,56 €", ParsedPrice(1234.56, 1234.56, "EUR")),
+    ("€ 1 234,56", ParsedPrice(1234.56, 1234.56, "EUR")),
+    ("$1,299.00 - $1,499.00", ParsedPrice(1299.0, 1499.0, "USD")),
+    ("MOQ: 100 pieces  US $ 0.85 - 1.10/pcs", ParsedPrice(0.85, 1.1, "USD", "piece")),
+    ("2 000 pieces (MOQ) $3", ParsedPrice(3.0, 3.0, "USD")),
+    ("123.45 USD", ParsedPrice(123.45, 123.45, "USD")),
+    ("CN¥ 35.00", ParsedPrice(35.0, 35.0, "CNY")),
+    ("R$ 49,90", ParsedPrice(49.9, 49.9, "BRL")),
+    ("£5 per kg", ParsedPrice(5.0, 5.0, "GBP", "kg")),
+    ("from 3 to 5 EUR", ParsedPrice(3.0, 5.0, "EUR")),
+    ("15", ParsedPrice(15.0, 15.0)),
+    ("0.125", ParsedPrice(0.125, 0.125)),
+])
+def test_parse_price(text, expected):
+    assert parse_price(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", None, "Free shipping", "Save 20%", "Min. order: 2 sets",
+                                  "iPhone 15 128GB", "ships in 3 days", "3.5 out of 5 stars"])
+def test_text_without_a_price(text):
+    assert parse_price(text) is None
+
+
+def test_spaces_group_thousands_only_next_to_a_currency():
+    assert parse_price("$15 128GB") == ParsedPrice(15.0, 15.0, "USD")
+    assert parse_price("1 234 €") == ParsedPrice(1234.0, 1234.0, "EUR")
+    assert find_price("iPhone 15 128GB") is None
+
+
+@pytest.mark.parametrize("text", ["iPhone 15 128GB", "ships in 3 days", "3.5 out of 5 stars", "1299", "Model X200"])
+def test_find_price_needs_a_currency_or_label_in_free_text(text):
+    assert find_price(text) is None
+
+
+def test_batch_mode_matches_single_parses():
+    texts = ["$5.99/each", None, "$5.99/each", "12,50€", "n/a"]
+
+    assert parse_prices(texts) == [parse_price(text) for text in texts]
+    assert parse_prices(texts)[0].unit == "piece"
+
+
+def test_database_rows_carry_numeric_price_columns():
+    row = prepare_for_database({"title": "Mug", "price": "US$1.20-3.50 / piece", "source": "Alibaba"})
+
+    assert row["price"] == "US$1.20-3.50 / piece"
+    assert (row["price_min"], row["price_max"], row["price_unit"], row["currency"]) == (1.2, 3.5, "piece", "USD")
+    assert prepare_for_database({"title": "Mug", "price": "9.99 €", "currency": "EUR"})["currency"] == "EUR"
+    assert "price_min" not in prepare_for_database({"title": "Mug", "price": "Contact supplier"})
+
+
+def test_product_detector_extracts_price_text():
+    detector = ProductDetector()
+
+    assert find_price("Cost: USD 12.50 each") == "USD 12.50"
+    assert find_price("Price: 123.45") == "123.45"
+    assert detector._extract_price("Steel mug 350ml, MOQ 500 pcs, $2.10") == "$2.10"
+    assert detector._extract_price("Blue ceramic cup") is None
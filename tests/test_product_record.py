@@ -0,0 +1,68 @@
+"""Tests for the slotted product record"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python-product-AIBot"))
+
+from scraper.fingerprint import product_fingerprint
+from scraper.normalize import normalize_product, prepare_for_database
+from scraper.product_record import ProductRecord, records_from_raw
+from scraper.write_behind import to_database_row
+
+RAW_PRODUCTS = [
+    {"title": "  Steel Mug ", "price": " US$1.20-3.50 / piece ", "source": "Alibaba", "description": " 12 oz ",
+     "images": ["https://img.example.com/a.jpg", {"data": "abc"}], "rating": 7, "review_count": "12",
+     "availability": "In stock", "url": " https://www.alibaba.com/product/1 ", "currency": ""},
+    {"title": "Plain Cup", "price": "9,99 €", "rating": "n/a", "images": "https://img.example.com/b.jpg"},
+    {"title": "Teapot", "price": "Contact supplier", "source": "PDF", "review_count": 3.9},
+    {},
+]
+
+
+@pytest.mark.parametrize("raw", RAW_PRODUCTS)
+def test_record_matches_the_dict_pipeline(raw):
+    record = ProductRecord.from_raw(raw)
+
+    assert record.to_normalized() == normalize_product(raw)
+    assert record.to_db_row() == prepare_for_database(normalize_product(raw))
+    assert to_database_row(raw) == record.to_db_row()
+
+
+def test_aliases_and_none_fields():
+    record = ProductRecord.from_raw({"name": " Mug ", "product_url": "https://x.example/1", "price_text": "$3",
+                                     "description": None, "source": None}, default_source="PDF")
+
+    assert (record.title, record.url, record.price, record.description, record.source) == \
+        ("Mug", "https://x.example/1", "$3", "", "PDF")
+    assert ProductRecord.from_raw({"title": "Mug", "name": "Other"}).title == "Mug"
+
+
+def test_db_row_round_trips_through_aliases():
+    record = ProductRecord.from_raw(RAW_PRODUCTS[0])
+
+    assert ProductRecord.from_raw(record.to_db_row()).to_db_row() == record.to_db_row()
+
+
+def test_non_text_field_is_rejected():
+    with pytest.raises(TypeError, match="'price' must be text"):
+        ProductRecord.from_raw({"title": "Mug", "price": 9.99})
+
+
+def test_conversions_share_the_images_list():
+    record = ProductRecord.from_raw(RAW_PRODUCTS[0])
+
+    assert record.to_db_row()["images"] is record.images
+    assert record.to_api() == {"title": "Steel Mug", "price": "US$1.20-3.50 / piece", "currency": "",
+                               "description": "12 oz", "images": record.images,
+                               "url": "https://www.alibaba.com/product/1", "source": "Alibaba"}
+    assert not hasattr(record, "__dict__")
+
+
+def test_records_and_fingerprints_agree_with_normalized_dicts():
+    records = records_from_raw(RAW_PRODUCTS, default_source="Alibaba")
+
+    assert records == [ProductRecord(**normalize_product(raw)) for raw in RAW_PRODUCTS]
+    assert product_fingerprint(RAW_PRODUCTS[0]) == product_fingerprint(normalize_product(RAW_PRODUCTS[0]))
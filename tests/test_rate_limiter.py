@@ -0,0 +1,119 @@
+"""Tests for the adaptive per-domain rate limiter"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper import metrics
+from scraper.rate_limiter import (REASON_CAPTCHA, REASON_EMPTY, UNLIMITED, DomainLimiter, RateLimiter,
+                                  limiter_for)
+
+
+def test_token_bucket_paces_requests_after_the_burst():
+    limiter = DomainLimiter("shop.example", rate=20, burst=2)
+
+    async def run():
+        started = time.perf_counter()
+        for _ in range(4):
+            await limiter.wait_turn()
+        return time.perf_counter() - started
+
+    # Two tokens are free, the other two take 1/20 s each
+    assert 0.08 <= asyncio.run(run()) < 0.5
+
+
+def test_successes_grow_and_blocks_shrink_rate_and_concurrency():
+    limiter = DomainLimiter("shop.example", rate=1, max_rate=2, concurrency=2, max_concurrency=4, cooldown=0.2)
+    for _ in range(20):
+        limiter.record_success()
+    grown = limiter.state()
+
+    limiter.record_backoff(REASON_CAPTCHA)
+    blocked = limiter.state()
+
+    assert grown["rate"] == 2 and 3 < grown["concurrency"] <= 4
+    assert blocked["rate"] == 1 and blocked["concurrency"] == grown["concurrency"] / 2
+    assert 0 < blocked["cooldown"] <= 0.2
+
+
+def test_consecutive_blocks_double_the_cooldown_and_empty_pages_do_not_pause():
+    limiter = DomainLimiter("shop.example", cooldown=1, max_cooldown=3)
+    limiter.record_backoff(REASON_EMPTY)
+    assert limiter.state()["cooldown"] == 0
+
+    limiter.record_backoff(REASON_CAPTCHA)
+    limiter.record_backoff(REASON_CAPTCHA)
+    limiter.record_backoff(REASON_CAPTCHA)
+    assert 2.5 < limiter.state()["cooldown"] <= 3
+
+    assert limiter.record_status(429) and not limiter.record_status(200)
+
+
+def test_cooldown_delays_the_next_request():
+    limiter = DomainLimiter("shop.example", rate=100, cooldown=0.1)
+    limiter.record_backoff(REASON_CAPTCHA)
+
+    async def run():
+        started = time.perf_counter()
+        await limiter.wait_turn()
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_slots_follow_the_adaptive_concurrency_limit():
+    limiter = DomainLimiter("shop.example", concurrency=2)
+    peak = {"now": 0, "max": 0}
+
+    async def scrape():
+        async with limiter.slot():
+            peak["now"] += 1
+            peak["max"] = max(peak["max"], peak["now"])
+            await asyncio.sleep(0.01)
+            peak["now"] -= 1
+
+    async def run():
+        await asyncio.gather(*(scrape() for _ in range(6)))
+        limiter.record_backoff(REASON_CAPTCHA)
+        peak["max"] = 0
+        await asyncio.gather(*(scrape() for _ in range(4)))
+
+    asyncio.run(run())
+
+    assert peak["max"] == 1 and limiter.state()["in_flight"] == 0
+
+
+def test_cancelled_waiter_releases_its_place():
+    limiter = DomainLimiter("shop.example", concurrency=1)
+
+    async def run():
+        async with limiter.slot():
+            waiter = asyncio.ensure_future(limiter._acquire_slot())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        async with limiter.slot():
+            return limiter.state()["in_flight"]
+
+    assert asyncio.run(asyncio.wait_for(run(), 1)) == 1
+
+
+def test_state_is_exported_as_gauges():
+    registry = RateLimiter(rate=3)
+    registry.for_url("https://www.amazon.com/s?k=cup")
+    metrics.registry.register_collector(registry.samples)
+
+    assert 'scraper_domain_rate{domain="amazon.com"} 3' in metrics.render()
+    assert "# TYPE scraper_domain_concurrency gauge" in metrics.render()
+
+
+def test_limiting_can_be_switched_off(monkeypatch):
+    monkeypatch.setenv("SCRAPER_RATE_LIMIT", "0")
+    assert limiter_for("https://www.amazon.com/s?k=cup") is UNLIMITED
+
+    monkeypatch.setenv("SCRAPER_RATE_LIMIT", "1")
+    assert limiter_for("https://www.amazon.com/s?k=cup").domain == "amazon.com"
@@ -0,0 +1,71 @@
+"""Tests for the BaseScraper page-readiness engine"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper.base_scraper import BaseScraper
+
+
+class DummyScraper(BaseScraper):
+    card_selectors = [".card", ".fallback"]
+    readiness_poll_interval = 0
+    politeness_delay = (0, 0)
+
+    def __init__(self):
+        super().__init__("Dummy")
+
+    async def _scrape_search_results(self, page, max_results, base_url):
+        return []
+
+
+class FakePage:
+    """Returns a scripted sequence of per-selector card counts"""
+
+    def __init__(self, counts):
+        self._counts = list(counts)
+        self.polls = 0
+        self.scrolls = 0
+
+    async def evaluate(self, script, arg=None):
+        if arg is None:
+            self.scrolls += 1
+            return None
+        self.polls += 1
+        return self._counts[min(self.polls, len(self._counts)) - 1]
+
+
+def test_returns_once_max_results_present():
+    """Readiness ends as soon as enough cards exist"""
+    page = FakePage([[0, 0], [3, 0], [12, 0]])
+    selector, count = asyncio.run(DummyScraper()._wait_for_cards(page, max_results=10))
+    assert (selector, count) == (".card", 12)
+    assert page.polls == 3
+    assert page.scrolls == 0
+
+
+def test_returns_when_count_stops_changing():
+    """A stable count below max_results triggers lazy-load scrolls, then returns"""
+    page = FakePage([[0, 4]])
+    scraper = DummyScraper()
+    selector, count = asyncio.run(scraper._wait_for_cards(page, max_results=10))
+    assert (selector, count) == (".fallback", 4)
+    assert page.scrolls == scraper.readiness_max_scrolls
+
+
+def test_gives_up_at_timeout_without_cards():
+    """An empty page is abandoned once the readiness budget is spent"""
+    page = FakePage([[0, 0]])
+    scraper = DummyScraper()
+    scraper.readiness_timeout = 0.01
+    selector, count = asyncio.run(scraper._wait_for_cards(page, max_results=10))
+    assert (selector, count) == (None, 0)
+
+
+def test_politeness_delay_from_env(monkeypatch):
+    """SCRAPER_POLITENESS_DELAY overrides the per-site politeness budget"""
+    monkeypatch.setenv("SCRAPER_POLITENESS_DELAY", "0,0.2")
+    assert DummyScraper().politeness_delay == (0.0, 0.2)
@@ -0,0 +1,111 @@
+"""Tests for the scraper registry"""
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper import registry as registry_module
+from scraper.registry import ScraperRegistry, ScraperSpec, get_registry
+from scraper.scraper_factory import create_scraper
+from scraper.site_detector import detect_site_from_url
+from scraper.sites import BUILTIN_SCRAPERS
+
+
+def test_factory_returns_shared_instances():
+    amazon = create_scraper(url="https://www.amazon.com/s?k=laptop")
+
+    assert create_scraper(site_name="amazon") is amazon
+    assert create_scraper(url="https://www.walmart.com/search?q=cup").site_name == "Generic"
+    assert create_scraper(site_name="Nowhere").site_name == "Generic"
+
+
+@pytest.mark.parametrize("entry", BUILTIN_SCRAPERS, ids=lambda entry: entry["name"])
+def test_builtin_manifest_matches_scraper_classes(entry):
+    from scraper.base_scraper import BaseScraper
+
+    cls = ScraperSpec.from_manifest(entry).load()
+    declared = set(entry["capabilities"])
+
+    assert cls.resource_profile.name == entry["resource_profile"]
+    assert ("http" in declared) == cls.http_tier_ok
+    assert ("pagination" in declared) == bool(cls.page_param or cls.next_page_selector)
+    assert ("json_payload" in declared) == bool(cls.state_globals)
+    assert ("detail" in declared) == (cls._scrape_product_page is not BaseScraper._scrape_product_page)
+    assert cls.declared_capabilities() == declared
+    assert cls().site_name == entry["name"]
+
+
+def test_loaded_spec_takes_capabilities_from_its_class(caplog):
+    spec = ScraperSpec("Drifted", ".sites.amazon_scraper:AmazonScraper",
+                       capabilities=["json_payload"])
+
+    with caplog.at_level("WARNING", logger=registry_module.__name__):
+        spec.load()
+
+    assert spec.capabilities == {"http", "pagination", "detail"}
+    assert "Drifted" in caplog.text
+
+
+def test_site_modules_are_imported_on_first_use_only():
+    script = textwrap.dedent("""
+        import sys
+        sys.path.insert(0, %r)
+        from scraper.scraper_factory import create_scraper
+        from scraper.registry import get_registry
+        assert get_registry().with_capability("json_payload") == ["AliExpress", "Alibaba"]
+        create_scraper(url="https://www.ebay.com/sch/i.html?_nkw=cup")
+        loaded = sorted(m for m in sys.modules if m.startswith("scraper.sites."))
+        print(",".join(loaded))
+    """ % str(ROOT))
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+    assert out.stdout.strip() == "scraper.sites.ebay_scraper"
+
+
+def test_registering_a_site_teaches_detection_its_domains():
+    registry = ScraperRegistry()
+    registry.register(ScraperSpec("Target", ".sites.generic_scraper:GenericScraper",
+                                  domains=["target.ca"], capabilities=["http"]))
+
+    assert detect_site_from_url("https://www.target.ca/s?searchTerm=cup") == "Target"
+    assert registry.with_capability("http") == ["Target"]
+    assert registry.for_url("https://www.target.ca/s") is registry.get("target")
+    with pytest.raises(ValueError):
+        registry.register(ScraperSpec("Target", "elsewhere:Scraper"))
+    with pytest.raises(ValueError):
+        ScraperSpec("Broken", "no_class_here", capabilities=["teleport"])
+
+
+class FakeEntryPoint:
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    def load(self):
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+
+def test_entry_point_plugins_are_registered_without_importing_them(monkeypatch):
+    plugin = {"name": "Etsy", "target": "etsy_plugin.scraper:EtsyScraper", "domains": ["etsy.com"]}
+    monkeypatch.setattr(registry_module, "entry_points", lambda group: [
+        FakeEntryPoint("etsy", [plugin]),
+        FakeEntryPoint("broken", ImportError("missing dependency")),
+    ])
+    registry = ScraperRegistry()
+
+    assert registry.load_entry_points() == 1
+    spec = registry.spec("Etsy")
+    assert spec.target == "etsy_plugin.scraper:EtsyScraper" and not spec.loaded
+    assert "etsy_plugin" not in sys.modules
+
+
+def test_process_registry_contains_the_builtin_sites():
+    assert {"Amazon", "eBay", "Alibaba", "AliExpress", "Generic"} <= set(get_registry().site_names())
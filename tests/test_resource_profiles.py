@@ -0,0 +1,79 @@
+"""Tests for request-interception resource profiles"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper.resource_profiles import ResourceProfile
+
+
+class FakeRequest:
+    def __init__(self, resource_type, url):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = FakeRequest(resource_type, url)
+        self.outcome = None
+
+    async def abort(self, error_code=None):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+class FakePage:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+def test_blocks_heavy_types_and_trackers():
+    """Images, fonts and tracker hosts are blocked; documents and scripts are not"""
+    profile = ResourceProfile("Test")
+    assert profile.should_block("image", "https://cdn.example.com/a.jpg")
+    assert profile.should_block("font", "https://cdn.example.com/a.woff2")
+    assert profile.should_block("script", "https://stats.g.doubleclick.net/x.js")
+    assert not profile.should_block("document", "https://www.example.com/")
+    assert not profile.should_block("script", "https://www.example.com/app.js")
+    assert not profile.should_block("script", "https://notdoubleclick.net/app.js")
+
+
+def test_route_handler_counts_savings():
+    """Aborted requests update the blocked and bytes-saved counters"""
+    profile = ResourceProfile("Test")
+    page = FakePage()
+
+    async def run():
+        assert await profile.attach(page)
+        routes = [FakeRoute("image", "https://cdn.example.com/a.jpg"),
+                  FakeRoute("document", "https://www.example.com/")]
+        for route in routes:
+            await page.handler(route)
+        return routes
+
+    routes = asyncio.run(run())
+    assert [r.outcome for r in routes] == ["abort", "continue"]
+    stats = profile.stats()
+    assert stats["requests_seen"] == 2
+    assert stats["requests_blocked"] == 1
+    assert stats["bytes_saved"] > 0
+    assert stats["time_saved"] > 0
+
+
+def test_profile_can_be_switched_off(monkeypatch):
+    """Disabled profiles, or the global switch, leave routing untouched"""
+    page = FakePage()
+    assert not asyncio.run(ResourceProfile("Off", enabled=False).attach(page))
+
+    monkeypatch.setenv("SCRAPER_BLOCK_RESOURCES", "0")
+    assert not asyncio.run(ResourceProfile("On").attach(page))
+    assert page.handler is None
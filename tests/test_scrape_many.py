@@ -0,0 +1,113 @@
+"""Tests for concurrent multi-URL scraping"""
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+import scraper.fetch_tier as fetch_tier
+import scraper.rate_limiter as rate_limiter
+import scraper.url_scraper_async as url_scraper_async
+from scraper.sites.ebay_scraper import eBayScraper
+
+
+class FakeScraper:
+    site_name = "Fake"
+    active = {}
+    peak = {}
+
+    async def scrape_from_url(self, url, max_results=10):
+        domain = url.split("/")[2]
+        FakeScraper.active[domain] = FakeScraper.active.get(domain, 0) + 1
+        FakeScraper.peak[domain] = max(FakeScraper.peak.get(domain, 0), FakeScraper.active[domain])
+        await asyncio.sleep(0.01)
+        FakeScraper.active[domain] -= 1
+        if "fail" in url:
+            raise RuntimeError("boom")
+        return [{"title": url, "url": url}][:max_results]
+
+
+def test_scrape_many_limits_per_domain(monkeypatch):
+    """No domain ever runs more than per_domain scrapes at once"""
+    FakeScraper.active, FakeScraper.peak = {}, {}
+    monkeypatch.setattr(url_scraper_async, "create_scraper", lambda url=None, site_name=None: FakeScraper())
+
+    urls = [f"https://a.example/{i}" for i in range(6)] + [f"https://b.example/{i}" for i in range(6)]
+    results = asyncio.run(url_scraper_async.scrape_many(urls, max_results=1, concurrency=4, per_domain=2))
+
+    assert [r["url"] for r in results] == urls
+    assert FakeScraper.peak == {"a.example": 2, "b.example": 2}
+    assert all(r["error"] is None and len(r["products"]) == 1 for r in results)
+    assert all(r["elapsed"] > 0 for r in results)
+
+
+def test_scrape_many_reports_errors(monkeypatch):
+    """A failing URL is reported without aborting the batch"""
+    monkeypatch.setattr(url_scraper_async, "create_scraper", lambda url=None, site_name=None: FakeScraper())
+
+    results = asyncio.run(url_scraper_async.scrape_many(
+        ["https://a.example/ok", "https://a.example/fail"], per_domain=1
+    ))
+
+    assert results[0]["error"] is None
+    assert results[1]["products"] == []
+    assert "boom" in results[1]["error"]
+
+
+class EnrichingScraper(eBayScraper):
+    http_tier_ok = False
+    politeness_delay = (0, 0)
+
+    async def scrape_from_url(self, url, max_results=10):
+        return [{"title": f"Item {i}", "price": "$1", "url": f"https://www.ebay.com/itm/{url[-1]}{i}",
+                 "images": [], "description": None} for i in range(max_results)]
+
+    @asynccontextmanager
+    async def _browser_context(self):
+        yield object()
+
+    async def _new_page(self, context):
+        return FakePage()
+
+    async def _navigate(self, page, url):
+        pass
+
+    async def _is_blocked(self, page):
+        return False
+
+    async def _wait_for_product_page(self, page):
+        pass
+
+    async def _scrape_product_page(self, page, url):
+        return {"description": f"About {url}"}
+
+
+class FakePage:
+    async def close(self):
+        pass
+
+
+def test_enrichment_reuses_the_listing_scrape_rate_limit_slot(monkeypatch):
+    """Enrichment inside a scrape does not wait for a second slot on the same domain"""
+    monkeypatch.setenv("SCRAPER_RATE_LIMIT", "1")
+    limiters = rate_limiter.RateLimiter(rate=100, burst=100)
+    limiters.for_domain("ebay.com").record_backoff(rate_limiter.REASON_EMPTY)
+    monkeypatch.setattr(rate_limiter, "_limiter", limiters)
+    scraper = EnrichingScraper()
+    monkeypatch.setattr(url_scraper_async, "create_scraper", lambda url=None, site_name=None: scraper)
+    enrich_products = fetch_tier.enrich_products
+    monkeypatch.setattr(fetch_tier, "enrich_products",
+                        lambda products, scraper: enrich_products(products, scraper, deadline=2))
+
+    urls = ["https://www.ebay.com/sch/i.html?_nkw=cup&n=1", "https://www.ebay.com/sch/i.html?_nkw=mug&n=2"]
+    started = time.perf_counter()
+    results = asyncio.run(url_scraper_async.scrape_many(urls, max_results=2, enrich=True))
+
+    assert time.perf_counter() - started < 1
+    assert all(r["error"] is None for r in results)
+    assert all(p["description"].startswith("About ") for r in results for p in r["products"])
+    assert limiters.for_domain("ebay.com").state()["in_flight"] == 0
@@ -0,0 +1,180 @@
+"""Tests for the long-lived scraper worker"""
+import asyncio
+import queue
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "python-product-AIBot"))
+sys.path.insert(0, str(ROOT))
+
+import scraper_worker
+from scraper.streaming import emit_product
+
+
+async def fake_run(job):
+    if job["url"].endswith("/slow"):
+        await asyncio.sleep(30)
+    if job["url"].endswith("/fail"):
+        raise ValueError("bad page")
+    streamed = {"title": "streamed"}
+    emit_product(streamed)
+    await asyncio.sleep(0.01)
+    return [streamed, {"title": "returned only"}]
+
+
+def test_serve_runs_jobs_and_reports_errors_and_cancellation():
+    jobs, events = queue.Queue(), queue.Queue()
+
+    async def main():
+        server = asyncio.ensure_future(scraper_worker._serve(jobs, events, run_job=fake_run))
+        jobs.put({"type": "scrape", "id": 1, "url": "https://a.example/ok"})
+        jobs.put({"type": "scrape", "id": 2, "url": "https://a.example/fail"})
+        jobs.put({"type": "scrape", "id": 3, "url": "https://a.example/slow"})
+        await asyncio.sleep(0.3)
+        jobs.put({"type": "cancel", "id": 3})
+        await asyncio.sleep(0.1)
+        jobs.put({"type": "stop"})
+        await server
+
+    asyncio.run(main())
+    collected = []
+    while not events.empty():
+        collected.append(events.get())
+
+    by_job = {}
+    for kind, job_id, payload in collected:
+        by_job.setdefault(job_id, []).append((kind, payload))
+    assert [k for k, _ in by_job[1]] == ["product", "product", "done"]
+    assert by_job[1][0][1] == {"title": "streamed"}
+    assert by_job[1][1][1] == {"title": "returned only"}
+    assert by_job[1][-1][1] == 2
+    assert by_job[2] == [("error", "ValueError: bad page")]
+    assert by_job[3] == [("cancelled", None)]
+
+
+def test_job_handle_routes_events():
+    worker = scraper_worker.ScraperWorker()
+    sent = []
+    worker._send = sent.append
+    job = scraper_worker.ScrapeJob(worker, 7)
+    worker._jobs[7] = job
+
+    worker._dispatch_event("product", 7, {"title": "A"})
+    worker._dispatch_event("product", 7, {"title": "B"})
+    worker._dispatch_event("update", 7, (0, {"title": "A", "description": "enriched"}))
+    worker._dispatch_event("done", 7, 2)
+
+    assert list(job.iter_products(timeout=1)) == [{"title": "A"}, {"title": "B"}]
+    assert job.result(timeout=1) == [{"title": "A", "description": "enriched"}, {"title": "B"}]
+    assert 7 not in worker._jobs
+    job.cancel()
+    assert sent == []
+
+
+def test_job_batches_queued_products_and_surfaces_errors_after_them():
+    worker = scraper_worker.ScraperWorker()
+    worker._send = lambda message: None
+    job = scraper_worker.ScrapeJob(worker, 9)
+    worker._jobs[9] = job
+
+    for i in range(5):
+        worker._dispatch_event("product", 9, {"title": str(i)})
+    worker._dispatch_event("error", 9, "blocked")
+
+    batches = job.iter_batches(max_size=3, timeout=1)
+    assert [p["title"] for p in next(batches)] == ["0", "1", "2"]
+    assert [p["title"] for p in next(batches)] == ["3", "4"]
+    try:
+        next(batches)
+    except RuntimeError as e:
+        assert str(e) == "blocked"
+    else:
+        raise AssertionError("expected RuntimeError")
+
+
+def test_job_timeout_cancels():
+    worker = scraper_worker.ScraperWorker()
+    sent = []
+    worker._send = sent.append
+    job = scraper_worker.ScrapeJob(worker, 8)
+
+    try:
+        job.result(timeout=0.01)
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("expected TimeoutError")
+    assert sent == [{"type": "cancel", "id": 8}]
+
+
+def test_serve_resends_products_enriched_after_streaming():
+    jobs, events = queue.Queue(), queue.Queue()
+
+    async def enriching_run(job):
+        product = {"title": "A"}
+        emit_product(product)
+        await asyncio.sleep(0)
+        product["description"] = "from the detail page"
+        return [product]
+
+    async def main():
+        server = asyncio.ensure_future(scraper_worker._serve(jobs, events, run_job=enriching_run))
+        jobs.put({"type": "scrape", "id": 1, "url": "https://a.example/ok", "enrich": True})
+        await asyncio.sleep(0.2)
+        jobs.put({"type": "stop"})
+        await server
+
+    asyncio.run(main())
+    collected = [events.get() for _ in range(events.qsize())]
+
+    assert [kind for kind, _, _ in collected] == ["ready", "product", "update", "done"]
+    assert collected[2][2] == (0, {"title": "A", "description": "from the detail page"})
+    assert collected[3][2] == 1
+
+
+class FakeProcess:
+    def __init__(self, *args, **kwargs):
+        self.started = self.terminated = self.joined = False
+
+    def start(self):
+        self.started = True
+
+    def terminate(self):
+        self.terminated = True
+
+    def join(self, timeout=None):
+        self.joined = True
+
+    def is_alive(self):
+        return self.started and not self.terminated
+
+
+class FakeContext:
+    def __init__(self, first_event):
+        self.first_event = first_event
+        self.process = None
+
+    def Queue(self):
+        q = queue.Queue()
+        q.put(self.first_event)
+        return q
+
+    def Process(self, *args, **kwargs):
+        self.process = FakeProcess()
+        return self.process
+
+
+def test_start_terminates_a_worker_that_does_not_report_ready():
+    worker = scraper_worker.ScraperWorker(start_timeout=0.1)
+    worker._ctx = FakeContext(("error", None, "boom"))
+
+    try:
+        worker.start()
+    except scraper_worker.WorkerUnavailable:
+        pass
+    else:
+        raise AssertionError("expected WorkerUnavailable")
+    assert worker._ctx.process.terminated and worker._ctx.process.joined
+    assert not worker.alive
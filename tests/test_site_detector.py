@@ -2,11 +2,15 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add project root to path
 ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
 sys.path.insert(0, str(ROOT))
 
-from scraper.site_detector import detect_site_from_url, get_all_supported_sites, is_supported_site
+from scraper import site_detector
+from scraper.site_detector import (DOMAIN_MAPPING, classify_urls, detect_site_from_url, get_all_supported_sites,
+                                   is_supported_site, register_domain, registrable_domain)
 
 
 def test_detect_amazon():
@@ -51,3 +55,48 @@ def test_is_supported_site():
     assert is_supported_site("https://www.amazon.com") is True
     assert is_supported_site("https://www.unknown.com") is False
 
+
+
+def test_subdomains_match_only_at_label_boundaries():
+    """Lookalike hosts are not mistaken for known sites"""
+    assert detect_site_from_url("https://smile.amazon.co.uk/s?k=cup") == "Amazon"
+    assert detect_site_from_url("https://WWW.EBAY.COM:443/sch/i.html") == "eBay"
+    assert detect_site_from_url("https://notamazon.com/s?k=cup") is None
+    assert detect_site_from_url("https://amazon.com.example.org/") is None
+    assert detect_site_from_url("not a url") is None
+
+
+def test_classify_urls_streams_results_in_order():
+    """Batch classification yields (url, site) pairs lazily"""
+    urls = iter(["https://www.aliexpress.us/item/1.html", "", "https://shop.example/x"])
+    assert list(classify_urls(urls)) == [
+        ("https://www.aliexpress.us/item/1.html", "AliExpress"),
+        ("", None),
+        ("https://shop.example/x", None),
+    ]
+
+
+def test_registrable_domain_respects_public_suffixes():
+    """Public suffixes like co.uk never count as a site's domain"""
+    assert registrable_domain("www.amazon.co.uk") == "amazon.co.uk"
+    assert registrable_domain("m.ebay.com") == "ebay.com"
+    assert registrable_domain("co.uk") is None
+    with pytest.raises(ValueError):
+        register_domain("com.au", "Nobody")
+
+
+def test_register_domain_updates_the_index():
+    """Domains added at runtime are detected, replacing memoized misses"""
+    assert detect_site_from_url("https://www.walmart.ca/search?q=cup") is None
+    register_domain("walmart.ca", "Walmart")
+    assert detect_site_from_url("https://www.walmart.ca/search?q=cup") == "Walmart"
+    assert DOMAIN_MAPPING["walmart.ca"] == "Walmart"
+
+
+def test_register_domain_extends_the_index_in_place():
+    """Registering a domain inserts into the existing trie instead of rebuilding it"""
+    index = site_detector._index
+    register_domain("Shop.Walmart.com", "Walmart Shop")
+    assert site_detector._index is index
+    assert detect_site_from_url("https://shop.walmart.com/ip/1") == "Walmart Shop"
+    assert detect_site_from_url("https://www.amazon.co.uk/s?k=cup") == "Amazon"
@@ -0,0 +1,215 @@
+"""Tests for chunked Supabase upserts"""
+import base64
+import sys
+import threading
+from pathlib import Path
+from urllib.parse import quote
+
+import pytest
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper import storage
+from scraper.storage import SupabaseStore, UpsertResult
+
+
+class FakeResponse:
+    def __init__(self, status=201, payload=None):
+        self.status_code = status
+        self.payload = payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self.payload
+
+
+class FakeClient:
+    """Records calls; product_urls in `existing` are reported as already stored"""
+
+    def __init__(self, existing=(), fail_on=None, lookup_status=200):
+        self.existing = set(existing)
+        self.fail_on = fail_on
+        self.lookup_status = lookup_status
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def request(self, method, url, json_body=None, timeout=10, headers=None, params=None):
+        with self._lock:
+            self.calls.append({"method": method, "url": url, "body": json_body,
+                               "headers": headers, "params": params})
+        if method == "GET":
+            if self.lookup_status != 200:
+                return FakeResponse(self.lookup_status)
+            wanted = params["product_url"]
+            return FakeResponse(200, [{"product_url": u} for u in self.existing if f'"{u}"' in wanted])
+        if self.fail_on and any(row.get("product_url") == self.fail_on for row in json_body):
+            return FakeResponse(500)
+        return FakeResponse(201)
+
+    def posts(self):
+        return [c for c in self.calls if c["method"] == "POST"]
+
+
+def _row(i, **extra):
+    row = {"name": f"Item {i}", "product_url": f"https://example.com/p/{i}"}
+    row.update(extra)
+    return row
+
+
+def test_upsert_splits_rows_into_chunks():
+    client = FakeClient()
+    store = SupabaseStore(url="https://db.example", key="k", chunk_size=2, concurrency=3,
+                          update_existing=True, client=client)
+
+    result = store.upsert([_row(i) for i in range(5)])
+
+    posts = client.posts()
+    assert sorted(len(c["body"]) for c in posts) == [1, 2, 2]
+    assert result.inserted == 5 and result.updated == 0 and result.chunks == 3
+    assert len(result) == 5
+    for call in posts:
+        assert call["url"] == "https://db.example/rest/v1/products"
+        assert call["params"]["on_conflict"] == "product_url"
+        assert call["params"]["columns"] == "name,product_url"
+        assert call["headers"]["Prefer"] == "resolution=merge-duplicates,return=minimal"
+        assert call["headers"]["apikey"] == "k"
+
+
+def test_upsert_counts_updates_and_dedupes_by_url():
+    client = FakeClient(existing={"https://example.com/p/1"})
+    store = SupabaseStore(url="https://db.example", key="k", chunk_size=10, update_existing=True, client=client)
+
+    result = store.upsert([_row(1), _row(2), _row(1, name="Item 1 (new)")])
+
+    (post,) = client.posts()
+    assert [r["name"] for r in post["body"]] == ["Item 1 (new)", "Item 2"]
+    assert (result.inserted, result.updated) == (1, 1)
+    assert result.stats()["rows"] == 2
+
+
+def test_rows_with_different_keys_or_no_url_go_in_separate_chunks():
+    client = FakeClient()
+    store = SupabaseStore(url="https://db.example", key="k", chunk_size=10, concurrency=1, client=client)
+
+    store.upsert([_row(1), _row(2, rating=4.5), {"name": "No URL"}])
+
+    posts = client.posts()
+    assert len(posts) == 3
+    plain = [c for c in posts if c["params"] is None]
+    assert len(plain) == 1
+    assert plain[0]["headers"]["Prefer"] == "return=minimal"
+    assert plain[0]["body"] == [{"name": "No URL"}]
+
+
+def test_existence_lookup_is_split_to_keep_urls_short():
+    client = FakeClient(existing={f"https://www.amazon.com/Long-Product-Name/dp/B0{i:08d}" for i in (3, 240)})
+    store = SupabaseStore(url="https://db.example", key="k", chunk_size=250, update_existing=True, client=client)
+    rows = [{"name": f"Item {i}", "product_url": f"https://www.amazon.com/Long-Product-Name/dp/B0{i:08d}"}
+            for i in range(250)]
+
+    result = store.upsert(rows)
+
+    lookups = [c for c in client.calls if c["method"] == "GET"]
+    assert len(lookups) > 1
+    assert all(len(quote(c["params"]["product_url"], safe="")) <= storage.MAX_LOOKUP_CHARS for c in lookups)
+    assert (result.inserted, result.updated) == (248, 2)
+
+
+def test_failed_existence_lookup_does_not_block_the_write():
+    client = FakeClient(lookup_status=414)
+    store = SupabaseStore(url="https://db.example", key="k", client=client)
+
+    result = store.upsert([_row(1), _row(2)])
+
+    (post,) = client.posts()
+    assert len(post["body"]) == 2
+    assert result.inserted == 2
+
+
+def test_only_a_service_role_key_updates_existing_rows():
+    anon = "x." + base64.urlsafe_b64encode(b'{"role":"anon"}').decode().rstrip("=") + ".y"
+    service = "x." + base64.urlsafe_b64encode(b'{"role":"service_role"}').decode().rstrip("=") + ".y"
+    assert SupabaseStore(key=anon).update_existing is False
+    assert SupabaseStore(key=service).update_existing is True
+    assert SupabaseStore(key=storage.SUPABASE_KEY).update_existing is False
+
+    client = FakeClient(existing={"https://example.com/p/1"})
+    store = SupabaseStore(url="https://db.example", key=anon, client=client)
+    result = store.upsert([_row(1), _row(2)])
+
+    (post,) = client.posts()
+    assert post["headers"]["Prefer"] == "resolution=ignore-duplicates,return=minimal"
+    assert (result.inserted, result.updated) == (1, 0)
+
+
+def test_count_updates_disabled_skips_lookup():
+    client = FakeClient()
+    store = SupabaseStore(url="https://db.example", key="k", count_updates=False, client=client)
+
+    result = store.upsert([_row(1)])
+
+    assert [c["method"] for c in client.calls] == ["POST"]
+    assert result.inserted == 1
+
+
+def test_failed_chunk_raises_after_other_chunks_are_written():
+    client = FakeClient(fail_on="https://example.com/p/0")
+    store = SupabaseStore(url="https://db.example", key="k", chunk_size=1, concurrency=2, client=client)
+
+    with pytest.raises(RuntimeError):
+        store.upsert([_row(i) for i in range(3)])
+
+    assert len(client.posts()) == 3
+
+
+def test_empty_input_makes_no_requests():
+    client = FakeClient()
+    store = SupabaseStore(url="https://db.example", key="k", client=client)
+
+    result = store.upsert([])
+
+    assert isinstance(result, UpsertResult)
+    assert len(result) == 0 and client.calls == []
+
+
+def test_select_by_price_filters_and_sorts_in_the_database():
+    class QueryClient:
+        def request(self, method, url, json_body=None, timeout=10, headers=None, params=None):
+            self.call = (method, url, params)
+            return FakeResponse(200, [{"name": "Mug", "price_min": 2.5}])
+
+    client = QueryClient()
+    store = SupabaseStore(url="https://db.example", key="k", client=client)
+
+    assert store.select_by_price(1, 5, currency="USD", descending=True, limit=10) == [{"name": "Mug", "price_min": 2.5}]
+    method, url, params = client.call
+    assert (method, url) == ("GET", "https://db.example/rest/v1/products")
+    assert params == {"select": "*", "order": "price_min.desc", "limit": "10",
+                      "price_min": "lte.5", "price_max": "gte.1", "currency": "eq.USD"}
+    store.select_by_price()
+    assert client.call[2]["price_min"] == "not.is.null" and "price_max" not in client.call[2]
+
+
+def test_link_less_cards_are_inserted_as_separate_rows():
+    """Cards without a link are not keyed on the listing URL, so none overwrites another"""
+    from scraper.sites.ebay_scraper import eBayScraper
+    from scraper.write_behind import to_database_row
+
+    listing = "https://www.ebay.com/sch/i.html?_nkw=mug"
+    products = eBayScraper()._build_products([{"title": "Red mug", "price": "$5"},
+                                              {"title": "Blue mug", "price": "$6"}], listing)
+    client = FakeClient()
+    store = SupabaseStore(url="https://db.example", key="k", client=client)
+
+    result = store.upsert(to_database_row(p) for p in products)
+
+    (post,) = client.posts()
+    assert post["params"] is None
+    assert [row["name"] for row in post["body"]] == ["Red mug", "Blue mug"]
+    assert all("product_url" not in row for row in post["body"])
+    assert result.inserted == 2
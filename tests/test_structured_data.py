@@ -0,0 +1,96 @@
+"""Tests for embedded JSON payload extraction"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper import structured_data
+from scraper.sites.aliexpress_scraper import AliExpressScraper
+from scraper.sites.generic_scraper import GenericScraper
+
+RUN_PARAMS = {
+    "mods": {
+        "searchRefineFilters": {"content": [{"title": "Color", "url": "/c"}]},
+        "itemList": {"content": [
+            {"productId": "1005001", "title": {"displayTitle": "USB Cable"},
+             "prices": {"salePrice": {"formattedPrice": "US $1.99", "currencyCode": "USD"}},
+             "image": {"imgUrl": "//ae01.example/cable.jpg"},
+             "evaluation": {"starRating": 4.7}},
+            {"productId": "1005002", "title": {"displayTitle": "Phone Case"},
+             "prices": {"salePrice": {"formattedPrice": "US $3.49"}},
+             "image": {"imgUrl": "//ae01.example/case.jpg"}},
+        ]},
+    }
+}
+
+ALIEXPRESS_HTML = (
+    "<html><head><script>window.runParams = {};</script>"
+    "<script>window.runParams = " + json.dumps(RUN_PARAMS) + ";</script></head><body></body></html>"
+)
+
+JSONLD_HTML = """<html><head><script type="application/ld+json">
+{"@context": "https://schema.org", "@type": "ItemList", "itemListElement": [
+  {"@type": "ListItem", "position": 1, "url": "/p/mug",
+   "item": {"@type": "Product", "name": "Mug", "image": "/img/mug.jpg",
+            "offers": {"@type": "Offer", "price": "12.50", "priceCurrency": "EUR",
+                       "availability": "https://schema.org/InStock"},
+            "aggregateRating": {"ratingValue": 4.5, "reviewCount": 31}}}
+]}
+</script></head><body></body></html>"""
+
+
+def test_aliexpress_run_params_from_html():
+    products = AliExpressScraper().extract_from_html(ALIEXPRESS_HTML, "https://www.aliexpress.com/wholesale?SearchText=usb")
+
+    assert [p["title"] for p in products] == ["USB Cable", "Phone Case"]
+    assert products[0]["price"] == "US $1.99"
+    assert products[0]["url"] == "https://www.aliexpress.com/item/1005001.html"
+    assert products[0]["images"] == ["https://ae01.example/cable.jpg"]
+    assert products[0]["rating"] == 4.7
+
+
+def test_jsonld_item_list_from_html():
+    products = GenericScraper().extract_from_html(JSONLD_HTML, "https://shop.example/mugs")
+
+    assert len(products) == 1
+    mug = products[0]
+    assert mug["title"] == "Mug" and mug["price"] == "12.50" and mug["currency"] == "EUR"
+    assert mug["url"] == "https://shop.example/p/mug"
+    assert mug["images"] == ["https://shop.example/img/mug.jpg"]
+    assert mug["review_count"] == 31 and mug["availability"] == "InStock"
+
+
+def test_init_data_js_literal():
+    text = "window._init_data_ = { data: " + json.dumps(RUN_PARAMS) + " };"
+    objects = structured_data.find_state_objects(text, ["_init_data_"])
+    assert objects == [RUN_PARAMS]
+
+
+class PayloadPage:
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.calls = 0
+
+    async def evaluate(self, script, arg=None):
+        self.calls += 1
+        assert script == structured_data.COLLECT_PAYLOADS_JS
+        return self.payloads
+
+
+def test_live_page_payload_needs_one_round_trip():
+    page = PayloadPage({"jsonld": [], "state": [json.dumps(RUN_PARAMS)], "inline": []})
+    scraper = AliExpressScraper()
+
+    products = asyncio.run(scraper._extract_structured(page, 1, "https://www.aliexpress.com/wholesale"))
+
+    assert page.calls == 1
+    assert [p["title"] for p in products] == ["USB Cable"]
+
+
+def test_missing_payload_yields_nothing():
+    page = PayloadPage({"jsonld": ["not json"], "state": [], "inline": []})
+    assert asyncio.run(AliExpressScraper()._extract_structured(page, 5, "https://www.aliexpress.com/")) == []
@@ -41,41 +41,100 @@ except ModuleNotFoundError:
     import scraper.connector.website_api as website_api
 
 
-class DummyResponse:
-    def __init__(self, status=200, payload=None):
-        self._payload = payload or {}
-
-    def raise_for_status(self):
-        if self._payload.get("raise", False):
+class FakeClient:
+    def __init__(self, payload=None, fail_on=None):
+        self.payload = payload or {}
+        self.fail_on = fail_on
+        self.calls = []
+
+    def post_json(self, url, payload, timeout=10, headers=None):
+        self.calls.append((url, payload))
+        if self.fail_on and self.fail_on(payload):
             raise Exception("status error")
-
-    def json(self):
-        return self._payload
+        return self.payload
 
 
 def test_start_import_job(monkeypatch):
-    def fake_post(url, json):
-        assert url.endswith("/start")
-        assert json["query"] == "x"
-        return DummyResponse(payload={"jobId": "job-123"})
+    client = FakeClient(payload={"jobId": "job-123"})
+    monkeypatch.setattr(website_api, "_client", client)
 
-    monkeypatch.setattr(website_api, "requests", types.SimpleNamespace(post=fake_post))
     job = website_api.start_import_job("x", "alibaba", 3)
+
     assert job == "job-123"
+    url, payload = client.calls[0]
+    assert url.endswith("/start")
+    assert payload["query"] == "x"
 
 
 def test_insert_and_complete(monkeypatch):
-    calls = []
+    client = FakeClient()
+    monkeypatch.setattr(website_api, "_client", client)
+
+    website_api.insert_imported_products("job-1", [{"title": "a"}])
+    website_api.complete_import_job("job-1")
+
+    assert any(u.endswith("/insert-products") for u, _ in client.calls)
+    assert any(u.endswith("/complete") for u, _ in client.calls)
+
+
+def test_insert_sends_bounded_chunks(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(website_api, "_client", client)
+    products = [{"title": str(i)} for i in range(25)]
+
+    website_api.insert_imported_products("job-1", products, chunk_size=10, concurrency=3)
+
+    sizes = sorted(len(p["products"]) for _, p in client.calls)
+    assert sizes == [5, 10, 10]
+    sent = sorted((p for _, call in client.calls for p in call["products"]), key=lambda p: int(p["title"]))
+    assert sent == products
+
+
+def test_insert_raises_chunk_errors(monkeypatch):
+    client = FakeClient(fail_on=lambda payload: payload["products"][0]["title"] == "10")
+    monkeypatch.setattr(website_api, "_client", client)
+
+    if pytest is not None:
+        with pytest.raises(Exception, match="status error"):
+            website_api.insert_imported_products("job-1", [{"title": str(i)} for i in range(20)],
+                                                 chunk_size=10, concurrency=2)
+    assert len(client.calls) == 2
+
+
+class FlakyResponse:
+    def __init__(self, status):
+        self.status_code = status
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+    def json(self):
+        return {"ok": True}
+
+
+class FlakySession:
+    """Answers 503 to the first attempt of every call and 200 to the retry"""
+
+    def __init__(self):
+        self.keys = []
+
+    def request(self, method, url, data=None, headers=None, params=None, timeout=None):
+        key = headers["Idempotency-Key"]
+        self.keys.append(key)
+        return FlakyResponse(503 if self.keys.count(key) == 1 else 200)
+
 
-    def fake_post(url, json):
-        calls.append((url, json))
-        return DummyResponse()
+def test_insert_retries_a_503_under_one_idempotency_key(monkeypatch):
+    from scraper.connector import http_client
 
-    import scraper.connector.website_api as wa
-    monkeypatch.setattr(wa, "requests", types.SimpleNamespace(post=fake_post))
+    session = FlakySession()
+    monkeypatch.setattr(http_client.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(website_api, "_client", http_client.HttpClient(retries=2, session=session))
 
-    wa.insert_imported_products("job-1", [{"title": "a"}])
-    wa.complete_import_job("job-1")
+    website_api.insert_imported_products("job-1", [{"title": "a"}])
+    website_api.complete_import_job("job-1")
 
-    assert any(u.endswith("/insert-products") for u, _ in calls)
-    assert any(u.endswith("/complete") for u, _ in calls)
+    assert len(session.keys) == 4
+    assert session.keys[0] == session.keys[1] != session.keys[2] == session.keys[3]
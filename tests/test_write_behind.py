@@ -0,0 +1,127 @@
+"""Tests for the write-behind product sink"""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1] / "python-product-AIBot"
+sys.path.insert(0, str(ROOT))
+
+from scraper.streaming import emit_product, wait_for_sink
+from scraper.write_behind import WriteBehindSink, to_database_row, write_behind
+
+
+class RecordingWriter:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.batches = []
+        self.release = threading.Event()
+        if not delay:
+            self.release.set()
+
+    def __call__(self, rows):
+        self.release.wait(self.delay or None)
+        if self.fail:
+            raise RuntimeError("database down")
+        self.batches.append(rows)
+
+
+def _product(i):
+    return {"title": f"Item {i}", "price": "$1", "url": f"https://example.com/p/{i}"}
+
+
+def test_flushes_full_batches_and_remainder_on_exit():
+    writer = RecordingWriter()
+
+    async def run():
+        async with write_behind(writer, batch_size=3, flush_interval=60) as sink:
+            for i in range(7):
+                emit_product(_product(i))
+        return sink
+
+    sink = asyncio.run(run())
+
+    assert [len(b) for b in writer.batches] == [3, 3, 1]
+    assert writer.batches[0][0] == to_database_row(_product(0))
+    assert sink.stats()["written"] == 7 and sink.stats()["pending"] == 0
+
+
+def test_partial_batch_is_written_after_flush_interval():
+    writer = RecordingWriter()
+
+    async def run():
+        async with write_behind(writer, batch_size=100, flush_interval=0.05):
+            emit_product(_product(1))
+            await asyncio.sleep(0.3)
+            # Written while the block is still running
+            return len(writer.batches)
+
+    assert asyncio.run(run()) == 1
+
+
+def test_cancelled_scrape_still_flushes_collected_products():
+    writer = RecordingWriter()
+
+    async def scrape():
+        async with write_behind(writer, batch_size=100, flush_interval=60):
+            emit_product(_product(1))
+            emit_product(_product(2))
+            await asyncio.sleep(10)
+
+    async def run():
+        task = asyncio.ensure_future(scrape())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+
+    assert sum(len(b) for b in writer.batches) == 2
+
+
+def test_drain_blocks_producer_while_backlog_is_full():
+    writer = RecordingWriter(delay=5)
+
+    async def run():
+        async with write_behind(writer, batch_size=1, flush_interval=60, max_pending=2) as sink:
+            for i in range(4):
+                emit_product(_product(i))
+            waiter = asyncio.ensure_future(wait_for_sink())
+            await asyncio.sleep(0.05)
+            blocked = not waiter.done()
+            writer.release.set()
+            await asyncio.wait_for(waiter, 5)
+        return blocked, sink
+
+    blocked, sink = asyncio.run(run())
+
+    assert blocked
+    assert sink.written == 4
+
+
+def test_failed_batches_are_counted_not_raised():
+    writer = RecordingWriter(fail=True)
+
+    async def run():
+        async with write_behind(writer, batch_size=2, prepare=None) as sink:
+            for i in range(3):
+                emit_product(_product(i))
+        return sink
+
+    sink = asyncio.run(run())
+
+    assert sink.failed == 3 and sink.written == 0
+    assert sink.errors and "database down" in sink.errors[0]
+
+
+def test_sink_rejects_products_before_start():
+    sink = WriteBehindSink(RecordingWriter())
+    with pytest.raises(RuntimeError):
+        sink(_product(1))